@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the BasePage primitives
+
+Serves generated fixture pages (DOM sizes of 100 to 10,000 elements) from
+a local server, opens them in one headless browser and times each
+BasePage primitive: find_element, click_element, enter_text, get_text
+and is_element_visible, plus their negative variants (missing element,
+disabled button, hidden element). Every case is measured under each wait
+backend:
+
+  explicit   implicit wait 0: BasePage's WebDriverWait does all waiting
+  implicit   implicit wait on as well, so every lookup inside the
+             explicit wait may block in the driver (the default settings)
+
+Each case runs --runs times on a freshly loaded page with --iterations
+calls per run. The report gives the median of the run medians, the p95
+over all calls, the spread between runs and the minimum.
+
+Usage:
+  python benchmark_base_page.py                     # measure and compare with the baseline
+  python benchmark_base_page.py --save-baseline     # record this machine's baseline
+  python benchmark_base_page.py --sizes 100,1000 --runs 3 --iterations 10
+  python benchmark_base_page.py --output reports/base_page_bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent
+BASELINE_FILE = PROJECT_ROOT / "test_data" / "base_page_baseline.json"
+
+DEFAULT_SIZES = [100, 1000, 10000]
+WAIT_BACKENDS = {"explicit": 0, "implicit": 2}
+# Timeout given to negative cases; their cost is this plus the polling overshoot
+NEGATIVE_TIMEOUT = 0.5
+NEGATIVE_CASES = {"find_element_missing", "click_element_disabled", "is_element_visible_hidden"}
+# A case regresses when its median grows by more than the tolerance and this many ms
+DEFAULT_TOLERANCE = 0.25
+MIN_DELTA_MS = 1.0
+
+FIXTURE_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>BasePage fixture ({size} elements)</title></head>
+<body>
+<main id="filler">{filler}</main>
+<form id="target-form" onsubmit="return false">
+<input id="target-input" type="text">
+<button id="target-button" data-test="target" type="button"
+        onclick="document.getElementById('target-text').textContent = 'clicked'">Go</button>
+<button id="disabled-button" type="button" disabled>Disabled</button>
+</form>
+<p id="target-text">Fixture text</p>
+<p id="hidden-text" style="display: none">Hidden</p>
+</body></html>
+"""
+
+
+def fixture_page(size):
+    """HTML with `size` filler elements nested in sections of ten, then the targets"""
+    sections = []
+    for start in range(0, size, 10):
+        items = "".join(
+            f'<li class="item" data-index="{i}"><span>Item {i}</span></li>'
+            for i in range(start, min(start + 10, size))
+        )
+        sections.append(f'<section class="group"><ul>{items}</ul></section>')
+    return FIXTURE_TEMPLATE.format(size=size, filler="".join(sections))
+
+
+def start_fixture_server():
+    """Serve /fixture?size=N on a background loop; return its base URL"""
+    from utilities.http_server import HTTPServer, html_response
+
+    pages = {}
+    ready = threading.Event()
+    state = {}
+
+    def fixture(request):
+        size = int(request.query.get("size", 100))
+        if size not in pages:
+            pages[size] = fixture_page(size)
+        return html_response(pages[size])
+
+    async def serve():
+        server = HTTPServer("127.0.0.1", 0)
+        server.route("/fixture", fixture)
+        listener = await server.start()
+        state["port"] = listener.sockets[0].getsockname()[1]
+        ready.set()
+        await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    if not ready.wait(10):
+        raise RuntimeError("Fixture server did not start")
+    return f"http://127.0.0.1:{state['port']}"
+
+
+# ============================================================
+# Cases
+# ============================================================
+def cases():
+    """Case name -> function(page) performing one call of the primitive"""
+    from pages.locators import By
+
+    target_input = (By.ID, "target-input")
+    target_button = (By.ID, "target-button")
+    target_text = (By.ID, "target-text")
+
+    def expect_timeout(call):
+        from selenium.common.exceptions import TimeoutException
+        try:
+            call()
+        except TimeoutException:
+            return
+        raise AssertionError("Negative case did not time out")
+
+    return {
+        "find_element": lambda page: page.find_element(target_button),
+        "find_element_xpath": lambda page: page.find_element((By.XPATH, "//button[@data-test='target']")),
+        "click_element": lambda page: page.click_element(target_button),
+        "enter_text": lambda page: page.enter_text(target_input, "benchmark"),
+        "get_text": lambda page: page.get_text(target_text),
+        "is_element_visible": lambda page: page.is_element_visible(target_text),
+        "find_element_missing": lambda page: expect_timeout(
+            lambda: page.find_element((By.ID, "missing"), timeout=NEGATIVE_TIMEOUT)),
+        "click_element_disabled": lambda page: expect_timeout(
+            lambda: page.click_element((By.ID, "disabled-button"), timeout=NEGATIVE_TIMEOUT)),
+        "is_element_visible_hidden": lambda page: page.is_element_visible(
+            (By.ID, "hidden-text"), timeout=NEGATIVE_TIMEOUT),
+    }
+
+
+def summarize(runs):
+    """Statistics (ms) for a case from per-run lists of call times"""
+    samples = sorted(value for run in runs for value in run)
+    run_medians = [statistics.median(run) for run in runs]
+    return {
+        "median_ms": round(statistics.median(run_medians), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 3),
+        "run_spread_ms": round(max(run_medians) - min(run_medians), 3),
+        "min_ms": round(samples[0], 3),
+        "calls": len(samples),
+    }
+
+
+def case_key(case, backend, size):
+    return f"{case}|{backend}|{size}"
+
+
+def run_benchmarks(sizes, runs, iterations, selected=None):
+    """Measure every case; returns {case|backend|size: stats}"""
+    from pages.base_page import BasePage
+    from utilities.driver_factory import create_driver
+    from utilities.settings import set_cli_overrides
+
+    benchmark_cases = cases()
+    set_cli_overrides(headless=True)
+    base_url = start_fixture_server()
+    driver = create_driver()
+    results = {}
+    try:
+        for backend, implicit_wait in WAIT_BACKENDS.items():
+            driver.implicitly_wait(implicit_wait)
+            for size in sizes:
+                for name, call in benchmark_cases.items():
+                    if selected and name not in selected:
+                        continue
+                    # Negative cases wait out their timeout, so fewer calls suffice
+                    count = max(1, iterations // 5) if name in NEGATIVE_CASES else iterations
+                    timings = []
+                    for _ in range(runs):
+                        driver.get(f"{base_url}/fixture?size={size}")
+                        page = BasePage(driver)
+                        call(page)  # warm-up
+                        run = []
+                        for _ in range(count):
+                            started = time.perf_counter()
+                            call(page)
+                            run.append((time.perf_counter() - started) * 1000)
+                        timings.append(run)
+                    stats = results[case_key(name, backend, size)] = summarize(timings)
+                    print(f"{name:28} {backend:9} {size:>6}  median {stats['median_ms']:>9.2f}ms  "
+                          f"p95 {stats['p95_ms']:>9.2f}ms  spread {stats['run_spread_ms']:>7.2f}ms")
+    finally:
+        driver.quit()
+    return results
+
+
+# ============================================================
+# Baseline
+# ============================================================
+def environment():
+    """Machine and browser details stored with a baseline"""
+    from utilities.config import Config
+    return {
+        "recorded": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "browser": Config.settings().browser,
+    }
+
+
+def compare_results(baseline, current, tolerance=DEFAULT_TOLERANCE, min_delta_ms=MIN_DELTA_MS):
+    """Rows of (key, baseline ms, current ms, status) for cases in both result sets"""
+    rows = []
+    for key, stats in current.items():
+        before = baseline.get(key)
+        if before is None:
+            rows.append((key, None, stats["median_ms"], "new"))
+            continue
+        delta = stats["median_ms"] - before["median_ms"]
+        if delta > min_delta_ms and stats["median_ms"] > before["median_ms"] * (1 + tolerance):
+            status = "regressed"
+        elif -delta > min_delta_ms and stats["median_ms"] < before["median_ms"] * (1 - tolerance):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append((key, before["median_ms"], stats["median_ms"], status))
+    return rows
+
+
+def print_comparison(rows):
+    """Print a comparison table; return the number of regressions"""
+    icons = {"ok": "✅", "improved": "🚀", "new": "🆕", "regressed": "❌"}
+    print(f"\n{'Case':52} {'Baseline':>10} {'Current':>10}  Status")
+    print("-" * 84)
+    for key, before, after, status in rows:
+        before_text = f"{before:.2f}ms" if before is not None else "-"
+        print(f"{key:52} {before_text:>10} {after:>8.2f}ms  {icons[status]} {status}")
+    return sum(1 for row in rows if row[3] == "regressed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BasePage primitive micro-benchmarks")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated DOM sizes (filler elements)")
+    parser.add_argument("--runs", type=int, default=5, help="Page loads per case")
+    parser.add_argument("--iterations", type=int, default=20, help="Calls per run")
+    parser.add_argument("--case", action="append", help="Only run this case (repeatable)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative median increase (default 0.25)")
+    parser.add_argument("--output", type=Path, help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print("⏱️  BASEPAGE MICRO-BENCHMARKS")
+    print("=" * 84)
+    results = run_benchmarks(sizes, args.runs, args.iterations, args.case)
+    document = {
+        "environment": environment(),
+        "settings": {"sizes": sizes, "runs": args.runs, "iterations": args.iterations,
+                     "wait_backends": WAIT_BACKENDS, "negative_timeout": NEGATIVE_TIMEOUT},
+        "results": results,
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"📝 Results written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"📝 Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"ℹ️  No baseline at {args.baseline}; record one with --save-baseline")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    print(f"Baseline recorded {baseline['environment']['recorded']} on {baseline['environment']['platform']}")
+    regressions = print_comparison(compare_results(baseline["results"], results, args.tolerance))
+    if regressions:
+        print(f"❌ {regressions} case(s) slower than the baseline")
+        return 1
+    print("✅ No latency regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Dashboard response-time benchmark
+
+Starts the dashboard app in-process on a free port, sends sequential
+keep-alive requests to each path and prints latency percentiles, body
+size and throughput. Paths that answer 404 on this version of the
+dashboard are skipped, so the same command compares old and new code.
+
+Usage:
+  python benchmark_dashboard.py                        # default paths
+  python benchmark_dashboard.py --requests 2000        # more samples
+  python benchmark_dashboard.py / /api/status          # chosen paths
+  python benchmark_dashboard.py --revalidate           # send If-None-Match
+"""
+
+import argparse
+import asyncio
+import http.client
+import statistics
+import sys
+import threading
+import time
+
+DEFAULT_PATHS = ["/", "/api/dashboard", "/api/status", "/api/reports"]
+
+
+def start_dashboard():
+    """Run the dashboard server on a background loop; return its port"""
+    from dashboard import create_app
+
+    ready = threading.Event()
+    state = {}
+
+    async def serve():
+        server, app = create_app(port=0)
+        app.progress.bind(asyncio.get_running_loop())
+        listener = await server.start()
+        state["port"] = listener.sockets[0].getsockname()[1]
+        ready.set()
+        await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    if not ready.wait(10):
+        raise RuntimeError("Dashboard did not start")
+    return state["port"]
+
+
+def measure(port, path, requests, revalidate=False):
+    """Return latency stats for `requests` sequential GETs of path"""
+    connection = http.client.HTTPConnection("localhost", port)
+    headers = {"Accept-Encoding": "gzip"}
+
+    connection.request("GET", path, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    if response.status == 404:
+        return None
+    if revalidate and response.getheader("ETag"):
+        headers["If-None-Match"] = response.getheader("ETag")
+
+    samples = []
+    statuses = set()
+    for _ in range(requests):
+        start = time.perf_counter()
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        samples.append((time.perf_counter() - start) * 1000)
+        statuses.add(response.status)
+    connection.close()
+
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+        "bytes": len(body),
+        "per_second": len(samples) / (sum(samples) / 1000),
+        "statuses": sorted(statuses),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard response-time benchmark")
+    parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS, help="Paths to request")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per path")
+    parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match from the first response")
+    args = parser.parse_args()
+
+    port = start_dashboard()
+    print("⏱️  DASHBOARD RESPONSE TIMES")
+    print("=" * 72)
+    print(f"{'Path':22} {'Median':>9} {'p95':>9} {'Bytes':>9} {'Req/s':>9}  Status")
+    print("-" * 72)
+    for path in args.paths:
+        stats = measure(port, path, args.requests, args.revalidate)
+        if stats is None:
+            print(f"{path:22} {'-':>9} {'-':>9} {'-':>9} {'-':>9}  not served")
+            continue
+        print(f"{path:22} {stats['median_ms']:>7.2f}ms {stats['p95_ms']:>7.2f}ms "
+              f"{stats['bytes']:>9} {stats['per_second']:>9.0f}  {stats['statuses']}")
+    print("-" * 72)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
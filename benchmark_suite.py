@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+End-to-end suite throughput benchmark for browser strategies
+
+Runs a fixed workload (the login and demo tests) against a local stand-in
+of SauceDemo, once per strategy and worker count, each in a fresh pytest
+process:
+
+  fresh    a new browser for every test (the driver fixture's default)
+  pooled   browsers reused between tests (driver_pool_size=1 per process)
+  tabs     one pooled browser per process, a new tab for every test
+
+For each combination it records tests/minute, CPU-seconds of pytest and
+every browser process it started, peak RSS of that process tree, and
+the flake rate: the share of tests whose outcome differed between the
+--repeats runs of the same combination.
+
+Usage:
+  python benchmark_suite.py                                  # all strategies, 0 and 2 workers
+  python benchmark_suite.py --strategies fresh,pooled --workers 0,2,4 --repeats 3
+  python benchmark_suite.py --output reports/benchmarks/suite.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: no CPU accounting for child processes
+    resource = None
+
+PROJECT_ROOT = Path(__file__).parent
+WORKLOAD = ["tests/test_login.py", "tests/test_demo.py"]
+OUTPUT_DIR = PROJECT_ROOT / "reports" / "benchmarks"
+
+# Strategy -> settings given to the pytest process as QA_<KEY> variables
+STRATEGIES = {
+    "fresh": {"driver_pool_size": "0", "driver_tabs": "false"},
+    "pooled": {"driver_pool_size": "1", "driver_tabs": "false"},
+    "tabs": {"driver_pool_size": "1", "driver_tabs": "true"},
+}
+SAMPLE_INTERVAL = 0.2
+
+
+# ============================================================
+# Process tree sampling
+# ============================================================
+def process_tree(pid):
+    """pid and all its descendants (Linux /proc)"""
+    pids = [pid]
+    for current in pids:
+        try:
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue  # exited while being read
+    return pids
+
+
+def rss_bytes(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+class PeakRSS:
+    """Samples the summed RSS of a process tree until stopped"""
+
+    def __init__(self, pid, interval=SAMPLE_INTERVAL):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, sum(rss_bytes(pid) for pid in process_tree(self.pid)))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if os.path.isdir("/proc"):
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+
+# ============================================================
+# Runs
+# ============================================================
+def child_usage():
+    """CPU seconds and largest RSS (bytes) of reaped child processes"""
+    if resource is None:
+        return {"cpu": 0.0, "maxrss": 0}
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {"cpu": usage.ru_utime + usage.ru_stime, "maxrss": usage.ru_maxrss * 1024}
+
+
+def run_workload(strategy, workers, base_url, report_path):
+    """Run the workload once in a new pytest process; returns measurements"""
+    env = os.environ.copy()
+    env.update({f"QA_{key.upper()}": value for key, value in STRATEGIES[strategy].items()})
+    env.update({
+        "QA_BASE_URL": base_url.rstrip("/"),
+        "QA_HEADLESS": "true",
+        # Benchmark runs stay out of the results history and artifact store
+        "QA_RESULTS_DB": "",
+        "QA_ARTIFACT_STORE": "",
+    })
+    env.pop("QA_RUN_ID", None)
+    command = [sys.executable, "-m", "pytest", *WORKLOAD, "-q", "-p", "no:cacheprovider",
+               "-o", "addopts=", f"--compact-report={report_path}"]
+    if workers:
+        command += ["-n", str(workers)]
+
+    report_path = Path(report_path)
+    output_path = report_path.with_suffix(".log")
+    before = child_usage()
+    started = time.perf_counter()
+    with open(output_path, "wb") as output:
+        process = subprocess.Popen(command, cwd=PROJECT_ROOT, env=env,
+                                   stdout=output, stderr=subprocess.STDOUT)
+        with PeakRSS(process.pid) as rss:
+            process.wait()
+    elapsed = time.perf_counter() - started
+    after = child_usage()
+
+    if not report_path.with_suffix(".jsonl").exists():
+        tail = output_path.read_text(encoding="utf-8", errors="replace")[-2000:]
+        raise RuntimeError(f"pytest did not run the workload (exit {process.returncode}):\n{tail}")
+
+    from utilities.compact_report import iter_report
+    outcomes = {
+        record["nodeid"]: record["outcome"]
+        for record in iter_report(report_path.with_suffix(".jsonl"))
+        if record["type"] == "test"
+    }
+    return {
+        "exit_code": process.returncode,
+        "elapsed": elapsed,
+        # Browsers are reaped by their driver process, and drivers by pytest,
+        # so their CPU time reaches us through RUSAGE_CHILDREN
+        "cpu_seconds": after["cpu"] - before["cpu"],
+        "peak_rss_mb": (rss.peak or after["maxrss"]) / (1024 * 1024),
+        "outcomes": outcomes,
+    }
+
+
+def flake_rate(runs):
+    """Share of tests whose outcome was not the same in every run"""
+    nodeids = set().union(*(run["outcomes"] for run in runs))
+    if not nodeids:
+        return 0.0
+    flaky = [n for n in nodeids if len({run["outcomes"].get(n, "missing") for run in runs}) > 1]
+    return len(flaky) / len(nodeids)
+
+
+def summarize(strategy, workers, runs):
+    """One comparison row from the repeated runs of a combination"""
+    tests = [len(run["outcomes"]) for run in runs]
+    failures = [sum(o in ("failed", "error") for o in run["outcomes"].values()) for run in runs]
+    return {
+        "strategy": strategy,
+        "workers": workers,
+        "repeats": len(runs),
+        "tests": max(tests),
+        "tests_per_minute": round(statistics.median(
+            60 * count / run["elapsed"] for count, run in zip(tests, runs)), 1),
+        "elapsed_s": round(statistics.median(run["elapsed"] for run in runs), 2),
+        "cpu_seconds": round(statistics.median(run["cpu_seconds"] for run in runs), 2),
+        "peak_rss_mb": round(max(run["peak_rss_mb"] for run in runs), 1),
+        "failures": round(statistics.mean(failures), 1),
+        "flake_rate": round(flake_rate(runs), 3),
+    }
+
+
+def format_table(rows):
+    """Lines of the comparison table"""
+    lines = [f"{'Strategy':10} {'Workers':>7} {'Tests':>6} {'Tests/min':>10} {'Wall s':>8} "
+             f"{'CPU s':>8} {'Peak RSS':>10} {'Failed':>7} {'Flaky':>7}",
+             "-" * 84]
+    for row in rows:
+        lines.append(
+            f"{row['strategy']:10} {row['workers']:>7} {row['tests']:>6} {row['tests_per_minute']:>10} "
+            f"{row['elapsed_s']:>8} {row['cpu_seconds']:>8} {row['peak_rss_mb']:>8}MB "
+            f"{row['failures']:>7} {row['flake_rate']:>7.1%}"
+        )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite throughput benchmark for browser strategies")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES),
+                        help=f"Comma-separated strategies ({', '.join(STRATEGIES)})")
+    parser.add_argument("--workers", default="0,2", help="Comma-separated xdist worker counts (0: no xdist)")
+    parser.add_argument("--repeats", type=int, default=2, help="Runs per combination (for the flake rate)")
+    parser.add_argument("--output", type=Path, help="JSON output (default: reports/benchmarks/suite_<time>.json)")
+    args = parser.parse_args()
+
+    strategies = args.strategies.split(",")
+    unknown = set(strategies) - set(STRATEGIES)
+    if unknown:
+        parser.error(f"Unknown strategies: {sorted(unknown)}")
+    worker_counts = [int(count) for count in args.workers.split(",")]
+
+    from utilities.load_runner import StandInServer
+    server = StandInServer(slow_delay=0.5)
+    base_url = server.start()
+    print("⏱️  SUITE THROUGHPUT BENCHMARK")
+    print(f"Workload: {' '.join(WORKLOAD)} against the stand-in app on {base_url}")
+
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as scratch:
+            for strategy in strategies:
+                for workers in worker_counts:
+                    runs = []
+                    for repeat in range(args.repeats):
+                        report = Path(scratch) / f"{strategy}_{workers}_{repeat}.html"
+                        try:
+                            runs.append(run_workload(strategy, workers, base_url, report))
+                        except RuntimeError as e:
+                            print(f"  ❌ {strategy} x{workers}: {e}")
+                            break
+                        print(f"  {strategy} x{workers} run {repeat + 1}: {len(runs[-1]['outcomes'])} tests "
+                              f"in {runs[-1]['elapsed']:.1f}s (exit {runs[-1]['exit_code']})")
+                    else:
+                        rows.append(summarize(strategy, workers, runs))
+    finally:
+        server.stop()
+
+    print()
+    for line in format_table(rows):
+        print(line)
+
+    output = args.output or OUTPUT_DIR / f"suite_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "recorded": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "workload": WORKLOAD,
+        "results": rows,
+    }, indent=2) + "\n", encoding="utf-8")
+    print(f"\n📝 Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for conftest, test modules and utilities
+
+Runs `python -X importtime -c "import <module>"` for every module listed
+in test_data/import_budget.json, takes the median cumulative import time
+over several runs and compares it with the module's budget. A module may
+also list forbidden packages (e.g. selenium) that must not be imported.
+
+Usage:
+  python check_import_time.py              # check budgets, exit 1 on regression
+  python check_import_time.py --runs 9     # more runs for a stabler median
+  python check_import_time.py --update     # rewrite budgets from this machine
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent
+BUDGET_FILE = PROJECT_ROOT / "test_data" / "import_budget.json"
+
+# Headroom applied by --update so normal machine noise does not fail the check
+UPDATE_HEADROOM = 1.5
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into {module: cumulative_us}"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        cumulative_us = cumulative_us.strip()
+        if not cumulative_us.isdigit():
+            continue  # header line
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def measure_module(module, runs=5):
+    """Return (median cumulative ms, imported module names) for a fresh import"""
+    samples = []
+    imported = set()
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(PROJECT_ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, cwd=PROJECT_ROOT, env=env
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+        times = parse_importtime(result.stderr)
+        if module not in times:
+            raise RuntimeError(f"No import timing recorded for {module}")
+        samples.append(times[module] / 1000)
+        imported.update(times)
+
+    return statistics.median(samples), imported
+
+
+def forbidden_imports(imported, forbidden):
+    """Return imported modules that belong to a forbidden package"""
+    return sorted(
+        name for name in imported
+        if any(name == pkg or name.startswith(pkg + ".") for pkg in forbidden)
+    )
+
+
+def load_budgets():
+    """Load the budget file"""
+    with open(BUDGET_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_budgets(runs=None, update=False):
+    """Measure every budgeted module and print a report; return the exit code"""
+    budgets = load_budgets()
+    runs = runs or budgets.get("runs", 5)
+    failures = 0
+
+    print("⏱️  IMPORT TIME BUDGET")
+    print("=" * 72)
+    print(f"{'Module':32} {'Median':>10} {'Budget':>10}  Status")
+    print("-" * 72)
+
+    for module, spec in budgets["modules"].items():
+        median_ms, imported = measure_module(module, runs)
+        banned = forbidden_imports(imported, spec.get("forbid", []))
+
+        if update:
+            spec["budget_ms"] = round(median_ms * UPDATE_HEADROOM, 1)
+
+        over_budget = median_ms > spec["budget_ms"]
+        status = "✅ ok"
+        if over_budget:
+            status = "❌ over budget"
+        if banned:
+            status = f"❌ imports {', '.join(banned[:3])}"
+        if over_budget or banned:
+            failures += 1
+
+        print(f"{module:32} {median_ms:>8.1f}ms {spec['budget_ms']:>8.1f}ms  {status}")
+
+    print("-" * 72)
+
+    if update:
+        BUDGET_FILE.write_text(json.dumps(budgets, indent=2) + "\n", encoding="utf-8")
+        print(f"📝 Budgets updated in {BUDGET_FILE}")
+        return 0
+
+    if failures:
+        print(f"❌ {failures} module(s) exceeded their import budget")
+        return 1
+    print("✅ All modules within import budget")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget check")
+    parser.add_argument("--runs", type=int, default=None, help="Imports per module (median is used)")
+    parser.add_argument("--update", action="store_true", help="Rewrite budgets from current timings")
+    args = parser.parse_args()
+    return check_budgets(runs=args.runs, update=args.update)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,15 +4,15 @@ HCLTech QA Automation Dashboard
 Professional web interface for test management
 """
 
-import http.server
-import socketserver
+import asyncio
+import hashlib
 import os
 import sys
-import json
-import subprocess
-import threading
+from functools import lru_cache
+from html import escape
 from pathlib import Path
 from datetime import datetime
+from string import Template
 import socket
 import time
 
@@ -20,17 +20,40 @@ import time
 # Configuration
 # ============================================
 PROJECT_ROOT = Path(__file__).parent
+STATIC_DIR = PROJECT_ROOT / "static"
+TEMPLATES_DIR = PROJECT_ROOT / "templates"
 PORT = 8080
 HOST = "localhost"
 DASHBOARD_TITLE = "HCLTech QA Automation Dashboard"
+TEST_COUNT_TTL = 10.0
 
 # Add project root to Python path
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from utilities.assets import IMMUTABLE, StaticAssets
+from utilities.http_server import (
+    CachedContent, HTTPError, HTTPServer, StreamResponse, file_response, json_response
+)
+from utilities.job_queue import JobScheduler, QueueFullError
+from utilities.progress import ProgressBroker
+
 try:
     from utilities.config import Config
+    from utilities.events import event_file_run_id, find_event_files, iter_events, summarize_events
+    from utilities.test_index import get_test_index
+    from utilities.runner import WarmRunner, build_args, timestamped_report
+    from utilities.report_index import ReportIndex
+    from utilities.results_store import ResultsStore, default_db_path
+    from utilities.artifact_store import ArtifactStore, default_store_dir
 except ImportError:
+    find_event_files = None
+    get_test_index = None
+    WarmRunner = None
+    ReportIndex = None
+    ResultsStore = None
+    ArtifactStore = None
+
     class Config:
         BASE_DIR = PROJECT_ROOT
         REPORTS_DIR = BASE_DIR / "reports"
@@ -39,97 +62,95 @@ except ImportError:
         BROWSER = "chrome"
 
 # ============================================
-# Dashboard Handler
+# Dashboard Application
 # ============================================
-class DashboardHandler(http.server.SimpleHTTPRequestHandler):
-    """Handler for the dashboard requests"""
-    
-    def do_GET(self):
-        """Handle GET requests"""
-        try:
-            if self.path == '/':
-                self.send_dashboard()
-            elif self.path == '/api/status':
-                self.send_json(self.get_status())
-            elif self.path == '/api/reports':
-                self.send_json(self.get_reports())
-            elif self.path == '/api/test-info':
-                self.send_json(self.get_test_info())
-            elif self.path == '/api/run/demo':
-                self.run_tests('demo')
-            elif self.path == '/api/run/login':
-                self.run_tests('login')
-            elif self.path == '/api/run/all':
-                self.run_tests('all')
-            elif self.path.startswith('/reports/'):
-                self.serve_file('reports/' + self.path[8:])
-            elif self.path.startswith('/static/'):
-                self.serve_file(self.path[1:])
-            else:
-                self.send_error(404, "Not Found")
-        except Exception as e:
-            self.send_error(500, f"Server Error: {str(e)}")
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.json': 'application/json',
+    '.jsonl': 'application/x-ndjson',
+    '.log': 'text/plain; charset=utf-8',
+}
+
+class DashboardApp:
+    """Routes and state for the dashboard requests"""
     
-    def do_POST(self):
-        """Handle POST requests"""
-        if self.path == '/api/generate-report':
-            self.generate_report()
-        else:
-            self.send_error(404, "Not Found")
+    def __init__(self, server):
+        self.server = server
+        self.start_time = time.time()
+        self.runner = WarmRunner() if WarmRunner else None
+        self.latest_run = None
+        self.report_index = ReportIndex() if ReportIndex else None
+        self.progress = ProgressBroker()
+        self.jobs = self.create_scheduler()
+        self._results = None
+        self._artifacts = None
+        self._report_task = None
+        self._test_count = (0.0, None)
+        
+        # Built once: the shell only references hashed assets and static
+        # content, so browsers revalidate it with an ETag and cache the rest
+        self.assets = StaticAssets(STATIC_DIR, ('dashboard.css', 'dashboard.js'), CONTENT_TYPES)
+        self.shell = CachedContent(self.render_shell(), CONTENT_TYPES['.html'])
+        
+        # Plain methods run in the thread pool; coroutines on the event loop
+        server.route('/', self.send_dashboard)
+        server.route('/api/dashboard', lambda request: json_response(self.get_dashboard_data()))
+        server.route('/api/status', lambda request: json_response(self.get_status()))
+        server.route('/api/reports', self.api_reports)
+        server.route('/api/test-info', lambda request: json_response(self.get_test_info()))
+        server.route('/api/events', lambda request: json_response(self.get_events_summary()))
+        server.route('/api/runs/latest', lambda request: json_response(self.get_latest_run()))
+        server.route('/api/tasks', self.get_tasks)
+        server.route('/api/runs/progress', lambda request: json_response({"runs": self.progress.snapshot()}))
+        server.route('/api/runs/stream', self.stream_progress)
+        server.route('/api/jobs', lambda request: json_response(self.get_jobs()))
+        server.route('/api/results/runs', self.api_results)
+        server.route('/api/results/history', self.api_results)
+        server.route('/api/results/slowest', self.api_results)
+        server.route('/api/results/failure-rates', self.api_results)
+        server.route('/api/results/diff', self.api_results)
+        server.route('/api/results/page-metrics', self.api_results)
+        server.route('/api/results/phases', self.api_results)
+        server.route('/api/artifacts', self.api_artifacts)
+        server.route_prefix('/artifacts/', self.serve_artifact)
+        server.route_prefix('/api/jobs/', self.job_action, methods=('GET', 'POST', 'DELETE'))
+        for test_type in ('demo', 'login', 'all'):
+            server.route(f'/api/run/{test_type}', self.run_tests, methods=('GET', 'POST'))
+        server.route('/api/generate-report', self.generate_report, methods=('POST',))
+        server.route_prefix('/reports/', self.serve_file)
+        server.route_prefix('/static/', self.serve_file)
+        server.route_prefix(self.assets.prefix, self.serve_asset)
     
     # ============================================
     # API Endpoints
     # ============================================
-    def send_dashboard(self):
-        """Send main dashboard HTML"""
-        status = self.get_status()
-        reports = self.get_reports()
-        test_info = self.get_test_info()
-        
-        html = self.generate_html(status, reports, test_info)
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html; charset=utf-8')
-        self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
-    
-    def send_json(self, data):
-        """Send JSON response"""
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data, default=str).encode('utf-8'))
-    
-    def serve_file(self, filepath):
-        """Serve static files"""
-        try:
-            filepath = PROJECT_ROOT / filepath
-            if not filepath.exists():
-                self.send_error(404, "File not found")
-                return
-            
-            self.send_response(200)
-            
-            # Set content type
-            if filepath.suffix == '.html':
-                self.send_header('Content-type', 'text/html')
-            elif filepath.suffix == '.css':
-                self.send_header('Content-type', 'text/css')
-            elif filepath.suffix == '.js':
-                self.send_header('Content-type', 'application/javascript')
-            elif filepath.suffix == '.png':
-                self.send_header('Content-type', 'image/png')
-            elif filepath.suffix == '.jpg' or filepath.suffix == '.jpeg':
-                self.send_header('Content-type', 'image/jpeg')
-            else:
-                self.send_header('Content-type', 'application/octet-stream')
-            
-            self.end_headers()
-            
-            with open(filepath, 'rb') as f:
-                self.wfile.write(f.read())
-        except Exception as e:
-            self.send_error(500, f"File error: {str(e)}")
+    async def send_dashboard(self, request):
+        """Send the cached dashboard shell"""
+        return self.shell.response(request)
+    
+    async def serve_asset(self, request):
+        """Send a content-hashed CSS/JS asset (cached for a year)"""
+        return self.assets.response(request)
+    
+    def serve_file(self, request):
+        """Serve report and static files"""
+        filepath = (PROJECT_ROOT / request.path.lstrip('/')).resolve()
+        
+        # Only files below the directory named by the route prefix
+        allowed_root = (PROJECT_ROOT / request.path.lstrip('/').split('/', 1)[0]).resolve()
+        if allowed_root not in filepath.parents:
+            raise HTTPError(404, "File not found")
+        if not filepath.is_file():
+            raise HTTPError(404, "File not found")
+        
+        # Streamed with ETag/Range support and a cached gzip copy for text
+        content_type = CONTENT_TYPES.get(filepath.suffix.lower(), 'application/octet-stream')
+        return file_response(request, filepath, content_type)
     
     # ============================================
     # Data Methods
@@ -142,27 +163,158 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
             "project": "HCLTech QA Automation",
             "version": "1.0.0",
             "uptime": self.get_uptime(),
-            "test_cases": 17,
+            "test_cases": self.get_test_count(),
             "requirements": 10,
             "dashboard_url": f"http://{HOST}:{PORT}"
         }
     
-    def get_reports(self):
-        """Get list of reports"""
+    def get_dashboard_data(self):
+        """Data behind the dashboard shell: status values and the reports fragment"""
+        status = self.get_status()
+        reports = self.get_reports()
+        listing = tuple(
+            (report['path'], report['name'], report['created'], report['size_kb'])
+            for report in reports['reports']
+        )
+        return {
+            "status": {
+                "version": status['version'],
+                "test_cases": f"{status['test_cases']}+",
+                "requirements": f"{status['requirements']}/10",
+                "uptime": f"{int(status['uptime'])}s",
+                "dashboard_url": status['dashboard_url'],
+            },
+            "reports": {
+                "total": reports['total'],
+                "version": hashlib.sha1(repr(listing).encode()).hexdigest()[:12],
+                "html": render_reports_html(listing),
+            },
+        }
+    
+    def get_test_count(self):
+        """Count test cases from the static test index (no test imports)"""
+        if get_test_index is None:
+            return 17
+        # Re-checked at most every TEST_COUNT_TTL seconds, not per refresh
+        expires, count = self._test_count
+        if time.monotonic() < expires:
+            return count
+        try:
+            count = get_test_index().summary()["cases"]
+        except Exception:
+            count = 17
+        self._test_count = (time.monotonic() + TEST_COUNT_TTL, count)
+        return count
+    
+    def api_reports(self, request):
+        """Paginated report listing: /api/reports?offset=0&limit=10&kind=...&q=..."""
+        try:
+            offset = max(int(request.query.get('offset', 0)), 0)
+            limit = min(max(int(request.query.get('limit', 10)), 1), 500)
+        except ValueError:
+            raise HTTPError(400, "offset and limit must be integers")
+        return json_response(self.get_reports(
+            offset, limit, kind=request.query.get('kind'), search=request.query.get('q')
+        ))
+    
+    def get_reports(self, offset=0, limit=10, kind=None, search=None):
+        """Get a page of reports, newest first"""
+        if self.report_index is not None:
+            return self.report_index.query(offset, limit, kind=kind, search=search)
+        
+        # Fallback without project modules: list the directory directly
         reports_dir = Config.REPORTS_DIR
         reports = []
         
         if reports_dir.exists():
             for file in sorted(reports_dir.glob("*.html"), key=lambda x: x.stat().st_mtime, reverse=True):
+                stat = file.stat()
                 reports.append({
                     "name": file.name,
                     "path": f"/reports/{file.name}",
-                    "size": file.stat().st_size,
-                    "created": datetime.fromtimestamp(file.stat().st_mtime).strftime("%Y-%m-%d %H:%M"),
-                    "size_kb": round(file.stat().st_size / 1024, 1)
+                    "size": stat.st_size,
+                    "created": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M"),
+                    "size_kb": round(stat.st_size / 1024, 1)
                 })
         
-        return {"reports": reports[:10]}  # Return only 10 latest
+        return {"reports": reports[offset:offset + limit], "total": len(reports), "offset": offset, "limit": limit}
+    
+    @property
+    def results(self):
+        """Results history database, opened on first use"""
+        if self._results is None and ResultsStore is not None and default_db_path():
+            self._results = ResultsStore()
+        return self._results
+    
+    def api_results(self, request):
+        """Results history queries backed by the SQLite store"""
+        store = self.results
+        if store is None:
+            raise HTTPError(404, "Results store disabled")
+        
+        query = request.query
+        try:
+            runs = int(query.get('runs', 20))
+            limit = min(int(query.get('limit', 20)), 500)
+        except ValueError:
+            raise HTTPError(400, "runs and limit must be integers")
+        
+        endpoint = request.path.rsplit('/', 1)[-1]
+        if endpoint == 'runs':
+            return json_response({"runs": store.recent_runs(limit)})
+        if endpoint == 'history':
+            if 'nodeid' not in query:
+                raise HTTPError(400, "nodeid is required")
+            return json_response({"nodeid": query['nodeid'], "results": store.test_history(query['nodeid'], limit)})
+        if endpoint == 'slowest':
+            return json_response({"runs": runs, "tests": store.slowest_tests(runs, limit)})
+        if endpoint == 'failure-rates':
+            return json_response({"runs": runs, "tests": store.failure_rates(runs, limit)})
+        if endpoint == 'page-metrics':
+            if {'page', 'action', 'metric'} <= query.keys():
+                return json_response({"history": store.page_metric_history(
+                    query['page'], query['action'], query['metric'], limit)})
+            return json_response({"runs": runs, "metrics": store.page_metrics(runs, query.get('page'))})
+        if endpoint == 'phases':
+            return json_response({"runs": runs, "nodeid": query.get('nodeid'),
+                                  "phases": store.phase_breakdown(runs, query.get('nodeid'))})
+        return json_response(store.diff_runs(query.get('base'), query.get('head')))
+    
+    @property
+    def artifacts(self):
+        """Artifact store, opened on first use"""
+        if self._artifacts is None and ArtifactStore is not None and default_store_dir():
+            self._artifacts = ArtifactStore()
+        return self._artifacts
+    
+    def api_artifacts(self, request):
+        """Artifacts of a run or test: /api/artifacts?run=<uid>&nodeid=..., or the store's runs"""
+        store = self.artifacts
+        if store is None:
+            raise HTTPError(404, "Artifact store disabled")
+        run_uid = request.query.get('run')
+        if not run_uid:
+            return json_response({"runs": store.runs()[:50], "stats": store.stats()})
+        
+        artifacts = store.lookup(run_uid, request.query.get('nodeid'))
+        for artifact in artifacts:
+            artifact['url'] = f"/artifacts/{artifact['hash']}/{artifact['name']}"
+        return json_response({"run": run_uid, "artifacts": artifacts})
+    
+    def serve_artifact(self, request):
+        """Serve /artifacts/<hash>/<name> from a loose object or a pack"""
+        store = self.artifacts
+        digest, _, name = request.path[len('/artifacts/'):].partition('/')
+        location = store.locate(digest) if store and len(digest) == 64 else None
+        if location is None:
+            raise HTTPError(404, "Artifact not found")
+        
+        # Content never changes for a hash, so browsers may cache it for good
+        content_type = CONTENT_TYPES.get(Path(name).suffix.lower(), 'application/octet-stream')
+        kind, path = location
+        if kind == 'loose':
+            return file_response(request, path, content_type, cache_control=IMMUTABLE)
+        return CachedContent(store.read(digest), content_type, cache_control=IMMUTABLE).response(request)
     
     def get_test_info(self):
         """Get test application information"""
@@ -186,65 +338,188 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
             ]
         }
     
+    def get_events_summary(self):
+        """Get per-operation page event statistics for the latest run"""
+        files = find_event_files() if find_event_files else []
+        if not files:
+            return {"run_id": None, "operations": {}}
+
+        return {
+            "run_id": event_file_run_id(files[0]),
+            "files": [f.name for f in files],
+            "operations": summarize_events(iter_events(files)),
+        }
+    
     def get_uptime(self):
         """Get server uptime"""
-        return time.time() - self.server.start_time
+        return time.time() - self.start_time
+    
+    async def get_tasks(self, request):
+        """List background tasks and active test runs"""
+        return json_response({
+            "tasks": self.server.background_tasks,
+            "active_runs": self.runner.active_runs() if self.runner else [],
+        })
     
     # ============================================
     # Action Methods
     # ============================================
-    def run_tests(self, test_type):
-        """Run tests in background thread"""
-        def execute_tests():
-            try:
-                if test_type == 'demo':
-                    cmd = [sys.executable, "run_demo.py"]
-                elif test_type == 'login':
-                    cmd = [sys.executable, "-m", "pytest", "tests/test_login.py", "-v"]
-                elif test_type == 'all':
-                    cmd = [sys.executable, "run_tests.py"]
-                else:
-                    return
-                
-                result = subprocess.run(cmd, capture_output=True, text=True, cwd=PROJECT_ROOT)
-                
-                # Log execution
-                log_file = Config.LOGS_DIR / f"dashboard_{test_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-                log_file.parent.mkdir(exist_ok=True)
-                log_content = f"Command: {' '.join(cmd)}\n\nSTDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}"
-                log_file.write_text(log_content, encoding='utf-8')
-                
-            except Exception as e:
-                print(f"Test execution error: {e}")
+    def get_latest_run(self):
+        """Get the structured result of the most recent dashboard run"""
+        latest = self.latest_run
+        return {"run": latest.to_dict() if latest else None}
+    
+    async def stream_progress(self, request):
+        """Server-Sent Events feed of live run progress"""
+        return StreamResponse(self.progress.sse_stream())
+    
+    def create_scheduler(self):
+        """Queue for dashboard runs, sized from the settings"""
+        if self.runner is None:
+            return None
+        settings = Config.settings()
+        return JobScheduler(
+            self.execute_job,
+            cancel_running=lambda job: self.runner.cancel(job.id),
+            max_running=settings.dashboard_max_runs,
+            max_queued=settings.dashboard_max_queued,
+        )
+    
+    def get_jobs(self):
+        """Get queued, running and recent jobs"""
+        if self.jobs is None:
+            return {"jobs": [], "running": 0, "queued": 0}
+        return self.jobs.status()
+    
+    async def job_action(self, request):
+        """GET /api/jobs/<id>, POST /api/jobs/<id>/cancel or DELETE /api/jobs/<id>"""
+        parts = request.path[len('/api/jobs/'):].strip('/').split('/')
+        job_id = parts[0]
+        job = self.jobs.jobs.get(job_id) if self.jobs else None
+        if job is None:
+            raise HTTPError(404, f"Unknown job: {job_id}")
+        
+        cancel = (request.method == 'DELETE' and len(parts) == 1) or \
+            (request.method == 'POST' and parts[1:] == ['cancel'])
+        if cancel:
+            was_active = not job.done
+            self.jobs.cancel(job_id)
+            return json_response({
+                "success": was_active,
+                "message": f"Cancelling {job_id}" if was_active else f"{job_id} already {job.state}",
+                "job": job.to_dict()
+            })
+        if request.method == 'GET' and len(parts) == 1:
+            return json_response(dict(job.to_dict(), position=self.jobs.position(job)))
+        raise HTTPError(404, "Not Found")
+    
+    def execute_job(self, job):
+        """Scheduler callback: run the job's suite and summarize the result"""
+        result = self.execute_tests(job.kind, job.id)
+        return {
+            "exit_code": result.exit_code,
+            "counts": result.counts,
+            "duration": round(result.duration, 1),
+            "error": result.error,
+            "artifacts": result.artifacts,
+            "cancelled": result.cancelled,
+        }
+    
+    def execute_tests(self, test_type, run_id):
+        """Run a suite with the warm runner (called in a worker thread)"""
+        if test_type == 'demo':
+            report_file = timestamped_report("hcl_demo_report")
+        else:
+            report_file = timestamped_report("hcl_test_report")
         
-        # Start in background thread
-        thread = threading.Thread(target=execute_tests, daemon=True)
-        thread.start()
+        # Forked from the warm runner: no interpreter or import start-up
+        log_file = Config.LOGS_DIR / f"dashboard_{test_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        log_file.parent.mkdir(exist_ok=True)
+        args = build_args(test_type, html_report=report_file)
+        log_file.write_text(f"Command: pytest {' '.join(args)}\n\n", encoding='utf-8')
         
-        self.send_json({
+        # Every collector event goes to the live progress feed as it happens
+        self.progress.start_run(run_id, label=test_type)
+        result = None
+        try:
+            result = self.runner.run(
+                args, output_file=log_file, run_id=run_id,
+                on_event=lambda event: self.progress.publish_threadsafe(run_id, event)
+            )
+        finally:
+            self.progress.publish_threadsafe(run_id, {
+                "event": "run_finished",
+                "exit_code": result.exit_code if result else None,
+            })
+        self.latest_run = result
+        return result
+    
+    async def run_tests(self, request):
+        """Queue a test run; identical pending requests share one job"""
+        test_type = request.path.rsplit('/', 1)[-1]
+        if self.jobs is None:
+            return json_response({
+                "success": False,
+                "message": "Test runner unavailable (project modules failed to import)",
+                "timestamp": datetime.now().isoformat()
+            })
+        
+        try:
+            priority = int(request.query.get('priority', 0))
+        except ValueError:
+            raise HTTPError(400, "priority must be an integer")
+        
+        try:
+            job, coalesced = self.jobs.submit(test_type, priority=priority)
+        except QueueFullError as e:
+            return json_response({
+                "success": False,
+                "message": f"Run queue is full ({e})",
+                "timestamp": datetime.now().isoformat()
+            }, status=429)
+        
+        if coalesced:
+            message = f"{test_type} tests already queued"
+        elif job.state == 'running':
+            message = f"Started {test_type} tests"
+        else:
+            message = f"Queued {test_type} tests (position {self.jobs.position(job)})"
+        
+        return json_response({
             "success": True,
-            "message": f"Started {test_type} tests",
+            "message": message,
+            "run_id": job.id,
+            "job": job.to_dict(),
+            "coalesced": coalesced,
             "timestamp": datetime.now().isoformat()
         })
     
-    def generate_report(self):
-        """Generate a new report"""
+    async def _run_generate_report(self):
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "generate_report.py",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=PROJECT_ROOT
+        )
+        _, stderr = await process.communicate()
+        return process.returncode, stderr.decode('utf-8', errors='replace')
+    
+    async def generate_report(self, request):
+        """Generate a new report without blocking other requests"""
+        # Concurrent requests share one generation instead of starting another
+        if self._report_task is None or self._report_task.done():
+            self._report_task = self.server.spawn(self._run_generate_report(), name="generate-report")
+        
         try:
-            result = subprocess.run(
-                [sys.executable, "generate_report.py"],
-                capture_output=True,
-                text=True,
-                cwd=PROJECT_ROOT
-            )
-            
-            self.send_json({
-                "success": result.returncode == 0,
-                "message": "Report generated" if result.returncode == 0 else result.stderr,
+            returncode, stderr = await asyncio.shield(self._report_task)
+            return json_response({
+                "success": returncode == 0,
+                "message": "Report generated" if returncode == 0 else stderr,
                 "timestamp": datetime.now().isoformat()
             })
             
         except Exception as e:
-            self.send_json({
+            return json_response({
                 "success": False,
                 "message": str(e),
                 "timestamp": datetime.now().isoformat()
@@ -253,578 +528,21 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
     # ============================================
     # HTML Generation
     # ============================================
-    def generate_html(self, status, reports, test_info):
-        """Generate dashboard HTML"""
-        return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{DASHBOARD_TITLE}</title>
-    <style>
-        :root {{
-            --primary: #0066cc;
-            --primary-dark: #0052a3;
-            --success: #28a745;
-            --warning: #ffc107;
-            --danger: #dc3545;
-            --light: #f8f9fa;
-            --dark: #343a40;
-            --gray: #6c757d;
-        }}
-        
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            color: #333;
-            padding: 20px;
-        }}
-        
-        .dashboard {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }}
-        
-        .header {{
-            background: linear-gradient(135deg, var(--primary) 0%, var(--primary-dark) 100%);
-            color: white;
-            padding: 40px;
-            text-align: center;
-        }}
-        
-        .header h1 {{
-            font-size: 2.5em;
-            margin-bottom: 10px;
-            font-weight: 700;
-        }}
-        
-        .header p {{
-            opacity: 0.9;
-            font-size: 1.1em;
-        }}
-        
-        .status-badge {{
-            display: inline-block;
-            background: var(--success);
-            color: white;
-            padding: 5px 15px;
-            border-radius: 20px;
-            font-size: 0.9em;
-            margin-top: 15px;
-        }}
-        
-        .main-content {{
-            padding: 40px;
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 30px;
-        }}
-        
-        .card {{
-            background: var(--light);
-            border-radius: 10px;
-            padding: 25px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-            transition: transform 0.3s ease;
-        }}
-        
-        .card:hover {{
-            transform: translateY(-5px);
-        }}
-        
-        .card h2 {{
-            color: var(--primary);
-            margin-bottom: 20px;
-            padding-bottom: 10px;
-            border-bottom: 2px solid #eee;
-            font-size: 1.4em;
-        }}
-        
-        .metric {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 12px 0;
-            border-bottom: 1px solid #e9ecef;
-        }}
-        
-        .metric:last-child {{
-            border-bottom: none;
-        }}
-        
-        .metric .label {{
-            color: var(--gray);
-        }}
-        
-        .metric .value {{
-            font-weight: 600;
-            color: var(--primary);
-        }}
-        
-        .btn {{
-            display: inline-flex;
-            align-items: center;
-            justify-content: center;
-            background: var(--primary);
-            color: white;
-            border: none;
-            padding: 12px 24px;
-            border-radius: 8px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            text-decoration: none;
-            gap: 8px;
-            margin: 5px;
-        }}
-        
-        .btn:hover {{
-            background: var(--primary-dark);
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(0,102,204,0.3);
-        }}
-        
-        .btn-success {{
-            background: var(--success);
-        }}
-        
-        .btn-success:hover {{
-            background: #1e7e34;
-        }}
-        
-        .btn-warning {{
-            background: var(--warning);
-            color: #333;
-        }}
-        
-        .btn-warning:hover {{
-            background: #e0a800;
-        }}
-        
-        .btn-group {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 10px;
-            margin: 15px 0;
-        }}
-        
-        .test-users {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(180px, 1fr));
-            gap: 10px;
-            margin: 15px 0;
-        }}
-        
-        .user-card {{
-            background: white;
-            padding: 12px;
-            border-radius: 8px;
-            border: 1px solid #dee2e6;
-            text-align: center;
-        }}
-        
-        .user-card .username {{
-            font-weight: 600;
-            color: var(--primary);
-        }}
-        
-        .user-card .desc {{
-            font-size: 0.85em;
-            color: var(--gray);
-            margin-top: 5px;
-        }}
-        
-        .reports-list {{
-            max-height: 300px;
-            overflow-y: auto;
-            margin: 15px 0;
-        }}
-        
-        .report-item {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 12px;
-            background: white;
-            border-radius: 8px;
-            margin: 8px 0;
-            border: 1px solid #e9ecef;
-        }}
-        
-        .report-item a {{
-            color: var(--primary);
-            text-decoration: none;
-            font-weight: 500;
-        }}
-        
-        .report-item a:hover {{
-            text-decoration: underline;
-        }}
-        
-        .report-info {{
-            font-size: 0.85em;
-            color: var(--gray);
-        }}
-        
-        .empty-state {{
-            text-align: center;
-            padding: 40px;
-            color: var(--gray);
-        }}
-        
-        .empty-state i {{
-            font-size: 3em;
-            margin-bottom: 15px;
-            opacity: 0.3;
-        }}
-        
-        .notification {{
-            position: fixed;
-            top: 20px;
-            right: 20px;
-            padding: 15px 25px;
-            border-radius: 8px;
-            color: white;
-            font-weight: 500;
-            z-index: 1000;
-            animation: slideIn 0.3s ease;
-            display: none;
-        }}
-        
-        .notification.success {{
-            background: var(--success);
-        }}
-        
-        .notification.error {{
-            background: var(--danger);
-        }}
-        
-        @keyframes slideIn {{
-            from {{ transform: translateX(100%); opacity: 0; }}
-            to {{ transform: translateX(0); opacity: 1; }}
-        }}
-        
-        .footer {{
-            text-align: center;
-            padding: 30px;
-            color: var(--gray);
-            border-top: 1px solid #e9ecef;
-            margin-top: 40px;
-        }}
-        
-        @media (max-width: 768px) {{
-            .main-content {{
-                grid-template-columns: 1fr;
-                padding: 20px;
-            }}
-            
-            .header {{
-                padding: 30px 20px;
-            }}
-            
-            .btn {{
-                width: 100%;
-            }}
-            
-            .btn-group {{
-                flex-direction: column;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="dashboard">
-        <!-- Header -->
-        <div class="header">
-            <h1>{DASHBOARD_TITLE}</h1>
-            <p>Real-time test management and monitoring interface</p>
-            <div class="status-badge">● System Running</div>
-        </div>
-        
-        <!-- Main Content -->
-        <div class="main-content">
-            <!-- System Status Card -->
-            <div class="card">
-                <h2>📊 System Status</h2>
-                <div class="metric">
-                    <span class="label">Framework Version</span>
-                    <span class="value">{status['version']}</span>
-                </div>
-                <div class="metric">
-                    <span class="label">Test Cases</span>
-                    <span class="value">{status['test_cases']}+</span>
-                </div>
-                <div class="metric">
-                    <span class="label">Requirements Met</span>
-                    <span class="value">{status['requirements']}/10</span>
-                </div>
-                <div class="metric">
-                    <span class="label">Uptime</span>
-                    <span class="value">{int(status['uptime'])}s</span>
-                </div>
-                <div class="metric">
-                    <span class="label">Dashboard URL</span>
-                    <span class="value">{status['dashboard_url']}</span>
-                </div>
-            </div>
-            
-            <!-- Test Actions Card -->
-            <div class="card">
-                <h2>🚀 Test Actions</h2>
-                <div class="btn-group">
-                    <button class="btn" onclick="runTest('demo')">
-                        🧪 Run Demo Tests
-                    </button>
-                    <button class="btn" onclick="runTest('login')">
-                        🔐 Run Login Tests
-                    </button>
-                    <button class="btn btn-success" onclick="runTest('all')">
-                        🚀 Run All Tests
-                    </button>
-                    <button class="btn btn-warning" onclick="generateReport()">
-                        📄 Generate Report
-                    </button>
-                </div>
-                
-                <h2 style="margin-top: 25px;">🌐 Quick Links</h2>
-                <div class="btn-group">
-                    <a class="btn" href="{test_info['url']}" target="_blank">
-                        🔗 Test Application
-                    </a>
-                    <a class="btn" href="/reports/" target="_blank">
-                        📁 Reports Folder
-                    </a>
-                </div>
-            </div>
-            
-            <!-- Test Application Card -->
-            <div class="card">
-                <h2>🔧 Test Environment</h2>
-                <div class="metric">
-                    <span class="label">Application</span>
-                    <span class="value">{test_info['name']}</span>
-                </div>
-                <div class="metric">
-                    <span class="label">URL</span>
-                    <span class="value">{test_info['url']}</span>
-                </div>
-                <div class="metric">
-                    <span class="label">Password</span>
-                    <span class="value">{test_info['password']}</span>
-                </div>
-                
-                <h3 style="margin-top: 20px; margin-bottom: 15px;">Test Users</h3>
-                <div class="test-users">
-                    {self.generate_users_html(test_info['users'])}
-                </div>
-            </div>
-            
-            <!-- Reports Card -->
-            <div class="card">
-                <h2>📋 Latest Reports</h2>
-                <div class="btn-group">
-                    <button class="btn" onclick="refreshReports()">
-                        🔄 Refresh
-                    </button>
-                    <button class="btn" onclick="clearReports()">
-                        🗑️ Clear All
-                    </button>
-                </div>
-                
-                <div id="reports-container" class="reports-list">
-                    {self.generate_reports_html(reports['reports'])}
-                </div>
-            </div>
-        </div>
-        
-        <!-- Requirements Card -->
-        <div class="card" style="margin: 0 40px 40px 40px;">
-            <h2>✅ HCLTech Requirements</h2>
-            <div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(250px, 1fr)); gap: 10px; margin-top: 15px;">
-                <div style="background: #e8f5e9; padding: 12px; border-radius: 6px; display: flex; align-items: center; gap: 8px;">
-                    <span style="color: #28a745;">✓</span> Login Automation
-                </div>
-                <div style="background: #e8f5e9; padding: 12px; border-radius: 6px; display: flex; align-items: center; gap: 8px;">
-                    <span style="color: #28a745;">✓</span> Error Validation
-                </div>
-                <div style="background: #e8f5e9; padding: 12px; border-radius: 6px; display: flex; align-items: center; gap: 8px;">
-                    <span style="color: #28a745;">✓</span> Password Reset
-                </div>
-                <div style="background: #e8f5e9; padding: 12px; border-radius: 6px; display: flex; align-items: center; gap: 8px;">
-                    <span style="color: #28a745;">✓</span> Pytest Structure
-                </div>
-                <div style="background: #e8f5e9; padding: 12px; border-radius: 6px; display: flex; align-items: center; gap: 8px;">
-                    <span style="color: #28a745;">✓</span> Reusable Utilities
-                </div>
-                <div style="background: #e8f5e9; padding: 12px; border-radius: 6px; display: flex; align-items: center; gap: 8px;">
-                    <span style="color: #28a745;">✓</span> HTML Reports
-                </div>
-                <div style="background: #e8f5e9; padding: 12px; border-radius: 6px; display: flex; align-items: center; gap: 8px;">
-                    <span style="color: #28a745;">✓</span> Dynamic Elements
-                </div>
-                <div style="background: #e8f5e9; padding: 12px; border-radius: 6px; display: flex; align-items: center; gap: 8px;">
-                    <span style="color: #28a745;">✓</span> Data-Driven Tests
-                </div>
-                <div style="background: #e8f5e9; padding: 12px; border-radius: 6px; display: flex; align-items: center; gap: 8px;">
-                    <span style="color: #28a745;">✓</span> Browser Sync
-                </div>
-                <div style="background: #e8f5e9; padding: 12px; border-radius: 6px; display: flex; align-items: center; gap: 8px;">
-                    <span style="color: #28a745;">✓</span> QA Best Practices
-                </div>
-            </div>
-        </div>
-        
-        <!-- Footer -->
-        <div class="footer">
-            <p>{DASHBOARD_TITLE} • Version {status['version']}</p>
-            <p>Accessible at: <strong>{status['dashboard_url']}</strong></p>
-            <p style="margin-top: 10px; font-size: 0.9em; opacity: 0.7;">
-                🚀 Demonstrating HCLTech QA Automation Engineer Readiness
-            </p>
-        </div>
-    </div>
-    
-    <!-- Notification -->
-    <div id="notification" class="notification"></div>
-    
-    <script>
-        // Global state
-        let isLoading = false;
-        
-        // Run tests function
-        async function runTest(testType) {{
-            if (isLoading) return;
-            
-            showNotification(`Starting ${{testType}} tests...`, 'info');
-            isLoading = true;
-            
-            try {{
-                const response = await fetch(`/api/run/${{testType}}`);
-                const data = await response.json();
-                
-                showNotification(`✅ ${{data.message}}`, 'success');
-                
-                // Auto-refresh reports after test execution
-                setTimeout(refreshReports, 2000);
-                
-            }} catch (error) {{
-                showNotification(`❌ Error: ${{error.message}}`, 'error');
-            }} finally {{
-                isLoading = false;
-            }}
-        }}
-        
-        // Generate report function
-        async function generateReport() {{
-            showNotification('Generating report...', 'info');
-            
-            try {{
-                const response = await fetch('/api/generate-report', {{ method: 'POST' }});
-                const data = await response.json();
-                
-                if (data.success) {{
-                    showNotification('✅ Report generated successfully!', 'success');
-                    setTimeout(refreshReports, 1000);
-                }} else {{
-                    showNotification(`❌ ${{data.message}}`, 'error');
-                }}
-                
-            }} catch (error) {{
-                showNotification(`❌ Error: ${{error.message}}`, 'error');
-            }}
-        }}
-        
-        // Refresh reports list
-        async function refreshReports() {{
-            try {{
-                const response = await fetch('/api/reports');
-                const data = await response.json();
-                
-                const container = document.getElementById('reports-container');
-                container.innerHTML = generateReportsHTML(data.reports);
-                
-            }} catch (error) {{
-                console.error('Refresh error:', error);
-            }}
-        }}
-        
-        // Clear all reports
-        async function clearReports() {{
-            if (!confirm('Are you sure you want to clear all reports?')) return;
-            
-            showNotification('Clearing reports...', 'info');
-            
-            // This would need a backend endpoint to clear reports
-            setTimeout(() => {{
-                showNotification('✅ Reports cleared (demo)', 'success');
-                refreshReports();
-            }}, 1000);
-        }}
-        
-        // Show notification
-        function showNotification(message, type) {{
-            const notification = document.getElementById('notification');
-            notification.textContent = message;
-            notification.className = `notification ${{type}}`;
-            notification.style.display = 'block';
-            
-            setTimeout(() => {{
-                notification.style.display = 'none';
-            }}, 3000);
-        }}
-        
-        // Generate HTML for reports
-        function generateReportsHTML(reports) {{
-            if (!reports || reports.length === 0) {{
-                return `
-                    <div class="empty-state">
-                        <div>📄</div>
-                        <p>No reports generated yet.</p>
-                        <p style="font-size: 0.9em; margin-top: 10px;">Run tests to generate reports</p>
-                    </div>
-                `;
-            }}
-            
-            return reports.map(report => `
-                <div class="report-item">
-                    <div>
-                        <a href="${{report.path}}" target="_blank">${{report.name}}</a>
-                        <div class="report-info">${{report.created}} • ${{report.size_kb}} KB</div>
-                    </div>
-                    <div>
-                        <button class="btn" style="padding: 5px 10px; font-size: 0.85em;" 
-                                onclick="window.open('${{report.path}}', '_blank')">
-                            Open
-                        </button>
-                    </div>
-                </div>
-            `).join('');
-        }}
-        
-        // Initialize on load
-        document.addEventListener('DOMContentLoaded', function() {{
-            // Auto-refresh reports every 30 seconds
-            setInterval(refreshReports, 30000);
-            
-            // Show welcome message
-            setTimeout(() => {{
-                showNotification('🚀 Dashboard loaded successfully!', 'success');
-            }}, 1000);
-        }});
-    </script>
-</body>
-</html>'''
+    def render_shell(self):
+        """Render the page shell; data is filled in from /api/dashboard"""
+        template = Template((TEMPLATES_DIR / "dashboard.html").read_text(encoding='utf-8'))
+        test_info = self.get_test_info()
+        return template.substitute(
+            title=escape(DASHBOARD_TITLE),
+            css_url=self.assets.url('dashboard.css'),
+            js_url=self.assets.url('dashboard.js'),
+            version="1.0.0",
+            dashboard_url=escape(f"http://{HOST}:{PORT}"),
+            app_name=escape(test_info['name']),
+            app_url=escape(test_info['url']),
+            password=escape(test_info['password']),
+            users_html=self.generate_users_html(test_info['users']),
+        )
     
     def generate_users_html(self, users):
         """Generate HTML for users list"""
@@ -832,50 +550,74 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
         for user in users:
             html.append(f'''
                 <div class="user-card">
-                    <div class="username">{user['username']}</div>
-                    <div class="desc">{user['description']}</div>
+                    <div class="username">{escape(user['username'])}</div>
+                    <div class="desc">{escape(user['description'])}</div>
                 </div>
             ''')
         return ''.join(html)
+
+
+@lru_cache(maxsize=32)
+def render_reports_html(reports):
+    """
+    Generate HTML for a reports page
     
-    def generate_reports_html(self, reports):
-        """Generate HTML for reports list"""
-        if not reports:
-            return '''
+    reports is a tuple of (path, name, created, size_kb) tuples, so an
+    unchanged listing is rendered once and then served from the cache.
+    """
+    if not reports:
+        return '''
                 <div class="empty-state">
                     <div>📄</div>
                     <p>No reports generated yet.</p>
                     <p style="font-size: 0.9em; margin-top: 10px;">Run tests to generate reports</p>
                 </div>
             '''
-        
-        html = []
-        for report in reports:
-            html.append(f'''
+    
+    html = []
+    for path, name, created, size_kb in reports:
+        path = escape(path)
+        html.append(f'''
                 <div class="report-item">
                     <div>
-                        <a href="{report['path']}" target="_blank">{report['name']}</a>
-                        <div class="report-info">{report['created']} • {report['size_kb']} KB</div>
+                        <a href="{path}" target="_blank">{escape(name)}</a>
+                        <div class="report-info">{created} • {size_kb} KB</div>
                     </div>
                     <div>
                         <button class="btn" style="padding: 5px 10px; font-size: 0.85em;" 
-                                onclick="window.open('{report['path']}', '_blank')">
+                                onclick="window.open('{path}', '_blank')">
                             Open
                         </button>
                     </div>
                 </div>
             ''')
-        return ''.join(html)
+    return ''.join(html)
 
 # ============================================
 # Server Setup
 # ============================================
-class DashboardServer(socketserver.TCPServer):
-    """Custom server with start time tracking"""
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.start_time = time.time()
-        self.allow_reuse_address = True
+def create_app(host=None, port=None):
+    """Create the HTTP server with the dashboard routes registered"""
+    server = HTTPServer(host or HOST, port or PORT)
+    return server, DashboardApp(server)
+
+async def serve_dashboard():
+    """Serve the dashboard until cancelled"""
+    server, app = create_app()
+    app.progress.bind(asyncio.get_running_loop())
+    
+    # Pre-import pytest and the page objects once for every run
+    if app.runner:
+        await asyncio.to_thread(app.runner.start)
+    
+    await server.start()
+    print_banner()
+    try:
+        await server.serve_forever()
+    finally:
+        if app.runner:
+            app.runner.cancel_all()
+        await server.close()
 
 def check_port_available(port):
     """Check if port is available"""
@@ -928,11 +670,7 @@ def run_dashboard():
     
     # Start server
     try:
-        with DashboardServer((HOST, PORT), DashboardHandler) as httpd:
-            print_banner()
-            
-            # Serve forever
-            httpd.serve_forever()
+        asyncio.run(serve_dashboard())
             
     except KeyboardInterrupt:
         print(f"\n\n{'='*60}")
@@ -1,39 +1,100 @@
 #!/usr/bin/env python3
 """
 Script to discover and list all tests
+
+Uses the static AST index (utilities/test_index.py) by default, which
+lists tests without importing them. Pass --collect to fall back to a full
+pytest collection.
 """
 
 import os
 import sys
+import time
+import argparse
 
 # Add project root to Python path
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-import pytest
-
-print("🔍 DISCOVERING TESTS")
-print("="*60)
-
-# Run pytest in collection mode
-args = [
-    "tests/",
-    "--collect-only",
-    "-q"  # Quiet mode
-]
-
-print(f"Running: pytest {' '.join(args)}")
-print()
-
-try:
-    # Collect tests
-    exit_code = pytest.main(args)
-    
-    if exit_code == 0:
-        print("\n✅ Tests discovered successfully")
-    else:
-        print(f"\n❌ Test discovery failed with code: {exit_code}")
-        
-except Exception as e:
-    print(f"\n💥 Error during test discovery: {e}")
\ No newline at end of file
+
+def list_from_index(marker_expression=None, keyword=None):
+    """List tests from the static index"""
+    from utilities.test_index import get_test_index
+
+    started = time.perf_counter()
+    index = get_test_index()
+    tests = index.tests(marker_expression, keyword)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    current_file = None
+    for test in tests:
+        if test["file"] != current_file:
+            current_file = test["file"]
+            print(f"\n📄 {current_file}")
+        if test["dynamic"]:
+            cases = " [cases resolved at collection]"
+        elif test["cases"] > 1:
+            cases = f" [{test['cases']} cases]"
+        else:
+            cases = ""
+        markers = f"  ({', '.join(test['markers'])})" if test["markers"] else ""
+        print(f"  • {test['nodeid'].split('::', 1)[1]}{cases}{markers}")
+
+    total_cases = sum(t["cases"] for t in tests)
+    dynamic = any(t["dynamic"] for t in tests)
+    print(f"\n✅ {len(tests)} test functions, {total_cases}{'+' if dynamic else ''} cases "
+          f"({index.stats['parsed']} files parsed, {index.stats['cached']} cached, {elapsed_ms:.1f} ms)")
+    return 0
+
+
+def list_from_pytest(marker_expression=None, keyword=None):
+    """List tests with a full pytest collection"""
+    import pytest
+
+    # Run pytest in collection mode
+    args = [
+        "tests/",
+        "--collect-only",
+        "-q"  # Quiet mode
+    ]
+    if marker_expression:
+        args.extend(["-m", marker_expression])
+    if keyword:
+        args.extend(["-k", keyword])
+
+    print(f"Running: pytest {' '.join(args)}")
+    print()
+
+    try:
+        # Collect tests
+        exit_code = pytest.main(args)
+
+        if exit_code == 0:
+            print("\n✅ Tests discovered successfully")
+        else:
+            print(f"\n❌ Test discovery failed with code: {exit_code}")
+        return exit_code
+
+    except Exception as e:
+        print(f"\n💥 Error during test discovery: {e}")
+        return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover and list tests")
+    parser.add_argument("-m", dest="marker", default=None, help="Marker expression, e.g. 'smoke and not login'")
+    parser.add_argument("-k", dest="keyword", default=None, help="Only tests whose id contains this text")
+    parser.add_argument("--collect", action="store_true", help="Use full pytest collection instead of the static index")
+    args = parser.parse_args()
+
+    print("🔍 DISCOVERING TESTS")
+    print("="*60)
+
+    if args.collect:
+        return list_from_pytest(args.marker, args.keyword)
+    return list_from_index(args.marker, args.keyword)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
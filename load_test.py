@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Virtual-user load test for the login flow
+
+Runs concurrent virtual users against an application (default: the
+base_url setting) and prints per-step throughput and p50/p95/p99
+latency. Users are protocol-level HTTP clients unless --browser-users
+makes some of them headless browsers driving LoginPage.
+
+Usage:
+  python load_test.py --stand-in                           # local stand-in app
+  python load_test.py --users 20 --ramp-up 30 --duration 120 --base-url https://staging
+  python load_test.py --stages 10:30,50:60,0:10 --think-time 1-3
+  python load_test.py --users 10 --browser-users 2 --json reports/load.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from utilities.config import Config
+from utilities.load_runner import (
+    BrowserUser, LoadRunner, ProtocolUser, StandInServer,
+    default_credentials, is_browser_user, parse_stages,
+)
+from utilities.settings import set_cli_overrides
+
+
+def parse_think_time(text):
+    """Parse "1-3" (uniform between 1 and 3 seconds) or "2" into a range"""
+    low, _, high = text.partition("-")
+    return float(low), float(high or low)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Virtual-user load test for the login flow")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="Seconds to start all users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to hold all users after ramp-up")
+    parser.add_argument("--stages", help="Target:seconds list, e.g. 10:30,50:60,0:10 (overrides the three above)")
+    parser.add_argument("--browser-users", type=int, default=0, help="How many users drive a headless browser")
+    parser.add_argument("--think-time", type=parse_think_time, default=(0.5, 1.5),
+                        help="Seconds between iterations, e.g. 1-3 (default 0.5-1.5)")
+    parser.add_argument("--base-url", help="Application under load (default: base_url setting)")
+    parser.add_argument("--submit-path", default="/login", help="Path protocol users post the login form to")
+    parser.add_argument("--stand-in", action="store_true", help="Start a local stand-in app and load it")
+    parser.add_argument("--seed", type=int, help="Seed think times for repeatable runs")
+    parser.add_argument("--json", type=Path, help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    stages = parse_stages(args.stages) if args.stages else [
+        (args.users, args.ramp_up), (args.users, args.duration)
+    ]
+    peak = max(target for target, _ in stages)
+    if args.browser_users > peak:
+        parser.error(f"--browser-users ({args.browser_users}) exceeds the peak user count ({peak})")
+
+    stand_in = None
+    base_url = args.base_url
+    if args.stand_in:
+        stand_in = StandInServer()
+        base_url = stand_in.start()
+        print(f"Stand-in app on {base_url}")
+    if base_url:
+        set_cli_overrides(base_url=base_url.rstrip("/"))
+    base_url = Config.BASE_URL
+    set_cli_overrides(headless=True)
+
+    credentials = default_credentials()
+    runner = LoadRunner(
+        lambda index: (BrowserUser(index, credentials)
+                       if is_browser_user(index, peak, args.browser_users)
+                       else ProtocolUser(index, credentials, base_url, submit_path=args.submit_path)),
+        stages, think_time=args.think_time, seed=args.seed,
+    )
+    print(f"Loading {base_url} with up to {peak} users "
+          f"({args.browser_users} browser) for {runner.duration:.0f}s")
+
+    try:
+        report = runner.run()
+    except KeyboardInterrupt:
+        runner.stop()
+        return 130
+    finally:
+        if stand_in is not None:
+            stand_in.stop()
+
+    summary = report.to_dict()
+    print(f"\n{summary['iterations']} iterations in {summary['elapsed']}s "
+          f"({summary['iterations_per_s']}/s), users: {summary['users']}")
+    for line in report.format_table():
+        print(line)
+    for step, errors in summary["errors"].items():
+        print(f"Errors in {step}: {errors}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(summary, indent=2))
+        print(f"Report written to {args.json}")
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,88 +1,150 @@
+import time
+from datetime import datetime
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from utilities.config import Config
+from utilities.events import record_event
 from utilities.logger import get_logger
+from utilities.page_metrics import PageMetrics, record_sample
+from utilities.phase_timing import timed
 
 class BasePage:
     """Base class for all page objects with common utilities"""
-    
+
     def __init__(self, driver):
         self.driver = driver
         self.logger = get_logger(self.__class__.__name__)
-        self.wait = WebDriverWait(driver, 20)  # Explicit wait
-    
-    def find_element(self, locator, timeout=20):
+        self.page_name = self.__class__.__name__
+        self.settings = Config.settings()
+        self.wait = WebDriverWait(driver, self.settings.explicit_wait)  # Explicit wait
+        # Timings are only read from the browser when page_metrics is on
+        self.metrics = PageMetrics(driver) if self.settings.page_metrics else None
+
+    def _wait(self, timeout=None, default=None):
+        """Build an explicit wait, falling back to the configured timeout"""
+        if timeout is None:
+            timeout = default if default is not None else self.settings.explicit_wait
+        return WebDriverWait(self.driver, timeout)
+
+    def navigate(self, url):
+        """Open a URL and record its page timings"""
+        with timed("navigation"):
+            self.driver.get(url)
+        self.logger.log_info("Navigated to: %s", url)
+        self.capture_performance("navigate")
+
+    def capture_performance(self, action):
+        """Record page timings after a navigation or key interaction (see utilities/page_metrics.py)"""
+        if self.metrics is None:
+            return None
+        try:
+            sample = self.metrics.sample(self.page_name, action)
+        except Exception as e:
+            self.logger.log_error("Could not read page metrics after %s: %s", action, e)
+            return None
+        record_sample(sample)
+        self.logger.log_debug("Page metrics after %s: %s", action, sample["metrics"])
+        return sample
+
+    def find_element(self, locator, timeout=None):
         """Find element with explicit wait"""
+        started = time.perf_counter()
         try:
-            self.logger.log_debug(f"Finding element: {locator}")
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(locator)
-            )
+            self.logger.log_debug("Finding element: %s", locator)
+            with timed("explicit_waits"):
+                element = self._wait(timeout).until(
+                    EC.presence_of_element_located(locator)
+                )
         except TimeoutException:
-            self.logger.log_error(f"Element not found: {locator}")
+            self.logger.log_error("Element not found: %s", locator)
+            record_event("find", locator, started, "timeout", self.page_name)
             raise
-    
-    def find_elements(self, locator, timeout=20):
+        record_event("find", locator, started, "ok", self.page_name)
+        return element
+
+    def find_elements(self, locator, timeout=None):
         """Find multiple elements with explicit wait"""
+        started = time.perf_counter()
         try:
-            self.logger.log_debug(f"Finding elements: {locator}")
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_all_elements_located(locator)
-            )
+            self.logger.log_debug("Finding elements: %s", locator)
+            with timed("explicit_waits"):
+                elements = self._wait(timeout).until(
+                    EC.presence_of_all_elements_located(locator)
+                )
         except TimeoutException:
-            self.logger.log_error(f"Elements not found: {locator}")
+            self.logger.log_error("Elements not found: %s", locator)
+            record_event("find_all", locator, started, "timeout", self.page_name)
             raise
-    
-    def click_element(self, locator, timeout=20):
+        record_event("find_all", locator, started, "ok", self.page_name, count=len(elements))
+        return elements
+
+    def click_element(self, locator, timeout=None):
         """Click on element with explicit wait"""
+        started = time.perf_counter()
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(locator)
-            )
-            element.click()
-            self.logger.log_debug(f"Clicked element: {locator}")
+            with timed("explicit_waits"):
+                element = self._wait(timeout).until(
+                    EC.element_to_be_clickable(locator)
+                )
+            with timed("interactions"):
+                element.click()
+            self.logger.log_debug("Clicked element: %s", locator)
         except TimeoutException:
-            self.logger.log_error(f"Element not clickable: {locator}")
+            self.logger.log_error("Element not clickable: %s", locator)
+            record_event("click", locator, started, "timeout", self.page_name)
             raise
-    
-    def enter_text(self, locator, text, timeout=20):
+        record_event("click", locator, started, "ok", self.page_name)
+
+    def enter_text(self, locator, text, timeout=None):
         """Enter text in element with explicit wait"""
+        started = time.perf_counter()
         try:
             element = self.find_element(locator, timeout)
-            element.clear()
-            element.send_keys(text)
-            self.logger.log_debug(f"Entered text '{text}' in element: {locator}")
+            with timed("interactions"):
+                element.clear()
+                element.send_keys(text)
+            # Entered text may be a password, so only its length is logged
+            self.logger.log_debug("Entered %d characters in element: %s", len(text), locator)
         except Exception as e:
-            self.logger.log_error(f"Failed to enter text: {e}")
+            self.logger.log_error("Failed to enter text: %s", e)
+            record_event("type", locator, started, "error", self.page_name, error=type(e).__name__)
             raise
-    
-    def get_text(self, locator, timeout=20):
+        record_event("type", locator, started, "ok", self.page_name, chars=len(text))
+
+    def get_text(self, locator, timeout=None):
         """Get text from element"""
         try:
             element = self.find_element(locator, timeout)
-            text = element.text
-            self.logger.log_debug(f"Got text '{text}' from element: {locator}")
+            with timed("interactions"):
+                text = element.text
+            self.logger.log_debug("Got %d characters of text from element: %s", len(text), locator)
             return text
         except Exception as e:
-            self.logger.log_error(f"Failed to get text: {e}")
+            self.logger.log_error("Failed to get text: %s", e)
             raise
-    
-    def is_element_visible(self, locator, timeout=10):
+
+    def is_element_visible(self, locator, timeout=None):
         """Check if element is visible"""
+        started = time.perf_counter()
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(locator)
-            )
-            return True
+            with timed("explicit_waits"):
+                self._wait(timeout, self.settings.visibility_wait).until(
+                    EC.visibility_of_element_located(locator)
+                )
         except TimeoutException:
+            record_event("wait_visible", locator, started, "not_visible", self.page_name)
             return False
-    
+        record_event("wait_visible", locator, started, "ok", self.page_name)
+        return True
+
     def take_screenshot(self, name=""):
         """Take screenshot and save to reports directory"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         screenshot_name = f"screenshot_{name}_{timestamp}.png"
         screenshot_path = Config.REPORTS_DIR / screenshot_name
-        
-        self.driver.save_screenshot(str(screenshot_path))
-        self.logger.log_info(f"Screenshot saved: {screenshot_name}")
-        return screenshot_path
\ No newline at end of file
+
+        with timed("artifact_capture"):
+            self.driver.save_screenshot(str(screenshot_path))
+        self.logger.log_info("Screenshot saved: %s", screenshot_name)
+        return screenshot_path
@@ -0,0 +1,18 @@
+class By:
+    """
+    Locator strategies, equal to selenium.webdriver.common.by.By
+
+    Selenium's By lives under selenium.webdriver, whose package __init__
+    imports every browser backend. Test modules and page locators use this
+    copy so that importing them (e.g. during --collect-only) stays cheap.
+    WebDriver accepts these plain strings as the "by" argument.
+    """
+
+    ID = "id"
+    XPATH = "xpath"
+    LINK_TEXT = "link text"
+    PARTIAL_LINK_TEXT = "partial link text"
+    NAME = "name"
+    TAG_NAME = "tag name"
+    CLASS_NAME = "class name"
+    CSS_SELECTOR = "css selector"
@@ -1,4 +1,4 @@
-from selenium.webdriver.common.by import By
+from pages.locators import By
 from pages.base_page import BasePage
 from utilities.config import Config
 
@@ -16,8 +16,7 @@ class LoginPage(BasePage):
     
     def __init__(self, driver):
         super().__init__(driver)
-        self.driver.get(Config.LOGIN_URL)
-        self.logger.log_info(f"Navigated to: {Config.LOGIN_URL}")
+        self.navigate(Config.LOGIN_URL)
         self.logger.log_test_start()
     
     def login(self, username, password):
@@ -27,6 +26,7 @@ class LoginPage(BasePage):
         self.enter_text(self.USERNAME_INPUT, username)
         self.enter_text(self.PASSWORD_INPUT, password)
         self.click_element(self.LOGIN_BUTTON)
+        self.capture_performance("login")
         
         self.logger.log_info("Login button clicked")
     
@@ -1,4 +1,3 @@
-from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
 from utilities.config import Config
 
@@ -11,15 +10,14 @@ class PasswordResetPage(BasePage):
     def __init__(self, driver):
         super().__init__(driver)
         # Navigate to a demo reset page or handle differently
-        self.driver.get("https://demo.testfire.net/login.jsp")
+        self.navigate("https://demo.testfire.net/login.jsp")
         self.logger.log_test_start()
     
     def navigate_to_reset_page(self):
         """Navigate to a demo password reset page"""
         # For demo purposes, we'll use a different site
         reset_url = "https://demo.testfire.net/login.jsp"
-        self.driver.get(reset_url)
-        self.logger.log_info(f"Navigated to demo reset page: {reset_url}")
+        self.navigate(reset_url)
     
     # Rest of the methods remain similar but will need adjustment
     # based on the actual website you're testing
\ No newline at end of file
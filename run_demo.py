@@ -5,8 +5,6 @@ Complete Demo Test Runner for HCLTech QA Automation Project
 
 import os
 import sys
-import subprocess
-from datetime import datetime
 
 # Add current directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -15,6 +13,7 @@ if current_dir not in sys.path:
 
 # Import after path setup
 from utilities.config import Config
+from utilities.runner import build_args, run_pytest, timestamped_report
 
 def print_banner():
     """Print execution banner"""
@@ -35,38 +34,36 @@ def run_demo_tests():
     print(f"📊 Reports Directory: {Config.REPORTS_DIR}")
     print("="*60)
     
-    # Create timestamp for report
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    report_file = Config.REPORTS_DIR / f"hcl_demo_report_{timestamp}.html"
+    # Create timestamped report
+    report_file = timestamped_report("hcl_demo_report")
     
     # Run demo tests
-    cmd = [
-        sys.executable,
-        "-m", "pytest",
-        "tests/test_demo.py",
-        "-v",
-        "--tb=short",
-        f"--html={report_file}",
-        "--self-contained-html",
-        "--capture=no"  # Show print statements in console
-    ]
+    args = build_args(
+        "demo",
+        html_report=report_file,
+        extra=["--capture=no"]  # Show print statements in console
+    )
     
-    print(f"\n📋 Test Command: {' '.join(cmd)}")
+    print(f"\n📋 Test Command: pytest {' '.join(map(str, args))}")
     print("\n" + "="*60)
     print("🏃 TEST EXECUTION STARTED")
     print("="*60)
     
-    result = subprocess.run(cmd)
+    result = run_pytest(args)
     
     print("\n" + "="*60)
     print("📊 TEST EXECUTION COMPLETED")
     print("="*60)
     
     # Print results
-    if result.returncode == 0:
+    if result.exit_code == 0:
         print("✅ ALL TESTS PASSED!")
     else:
-        print(f"⚠️  Some tests failed (Exit code: {result.returncode})")
+        print(f"⚠️  Some tests failed (Exit code: {result.exit_code})")
+    
+    for test in result.tests:
+        icon = "✅" if test.outcome == "passed" else "❌" if test.outcome in ("failed", "error") else "⏭️ "
+        print(f"   {icon} {test.nodeid.split('::')[-1]:45} {test.duration:6.2f}s")
     
     print(f"\n📈 Detailed HTML Report:")
     print(f"   file:///{report_file}")
@@ -78,7 +75,7 @@ def run_demo_tests():
         print(f"   file:///{default_report}")
     
     print("\n" + "="*60)
-    return result.returncode
+    return result.exit_code
 
 if __name__ == "__main__":
     print_banner()
@@ -23,6 +23,8 @@ if PROJECT_ROOT not in sys.path:
 try:
     from utilities.config import Config
     from utilities.logger import get_logger
+    from utilities.settings import set_cli_overrides
+    from utilities.runner import build_args, describe_suite, run_pytest
     print("✅ Successfully imported project modules")
 except ImportError as e:
     print(f"❌ Import Error: {e}")
@@ -69,9 +71,11 @@ def display_configuration():
         "Test Environment": "SauceDemo (Public Demo Site)",
         "Browser": Config.BROWSER,
         "Headless Mode": "Yes" if Config.HEADLESS else "No",
+        "Settings Profile": Config.settings().profile or "default",
         "Base URL": Config.BASE_URL,
         "Implicit Wait": f"{Config.IMPLICIT_WAIT} seconds",
         "Reports Directory": str(Config.REPORTS_DIR),
+        "Report Format": Config.settings().report_format,
         "Test Cases": "12+ (Login, Password Reset, Validation)"
     }
     
@@ -80,7 +84,7 @@ def display_configuration():
     
     print("-" * 50)
 
-def run_tests(test_type="all", parallel=False, headless=False, browser=None):
+def run_tests(test_type="all", parallel=False, headless=False, browser=None, profile=None):
     """
     Execute test cases with comprehensive reporting
     
@@ -89,81 +93,70 @@ def run_tests(test_type="all", parallel=False, headless=False, browser=None):
         parallel: Run tests in parallel
         headless: Run browser in headless mode
         browser: Browser to use (chrome, firefox)
+        profile: Settings profile from test_data/profiles
     """
     
     # Setup environment
     setup_environment()
     
     # Set environment variables
-    env_vars = os.environ.copy()
+    env_vars = {}
     if browser:
         env_vars["BROWSER"] = browser
     if headless:
         env_vars["HEADLESS"] = "True"
-    
-    # Add project root to Python path
-    env_vars["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env_vars.get("PYTHONPATH", "")
+    if profile:
+        env_vars["QA_PROFILE"] = profile
     
     # Create timestamp for unique report
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_file = Config.REPORTS_DIR / f"hcl_test_report_{timestamp}.html"
+    
+    # Build pytest arguments
+    args = build_args(
+        test_type,
+        parallel=parallel,
+        headless=headless,
+        browser=browser,
+        profile=profile,
+        html_report=report_file,
+        log_file=Config.LOGS_DIR / f"execution_{timestamp}.log",
+        extra=["--capture=no"]  # Show print statements
+    )
     
-    # Build pytest command
-    cmd = [
-        sys.executable,
-        "-m", "pytest",
-        "-v",  # Verbose output
-        "--tb=short",  # Short traceback
-        f"--html={Config.REPORTS_DIR}/hcl_test_report_{timestamp}.html",
-        "--self-contained-html",
-        f"--log-file={Config.LOGS_DIR}/execution_{timestamp}.log",
-        "--log-file-level=INFO",
-        "--capture=no"  # Show print statements
-    ]
-    
-    # Add parallel execution if requested
     if parallel:
-        cmd.extend(["-n", "auto"])
         print("   🔄 Running tests in parallel mode")
     
-    # Determine test path based on test_type
-    if test_type == "login":
-        cmd.append("tests/test_login.py")
-        test_description = "Login Functionality Tests"
-    elif test_type == "reset":
-        cmd.append("tests/test_password_reset.py")
-        test_description = "Password Reset Tests"
-    elif test_type == "demo":
-        cmd.append("tests/test_demo.py")
-        test_description = "Demo Tests (SauceDemo Website)"
-    elif test_type == "smoke":
-        cmd.extend(["-m", "smoke"])
-        test_description = "Smoke Tests"
-    else:
-        cmd.append("tests/")
-        test_description = "All Tests (Complete Test Suite)"
-    
-    print(f"\n🚀 EXECUTING: {test_description}")
+    print(f"\n🚀 EXECUTING: {describe_suite(test_type)}")
     print("-" * 50)
     
     try:
-        # Execute tests
-        result = subprocess.run(cmd, env=env_vars)
+        # Execute tests in this interpreter (no second Python start-up)
+        result = run_pytest(args, env=env_vars)
         
         # Display results
         print("\n" + "="*60)
         print("📊 TEST EXECUTION RESULTS")
         print("="*60)
         
-        if result.returncode == 0:
+        if result.exit_code == 0:
             print("✅ SUCCESS: All tests passed!")
         else:
-            print(f"⚠️  COMPLETED: Some tests failed (Exit code: {result.returncode})")
+            print(f"⚠️  COMPLETED: Some tests failed (Exit code: {result.exit_code})")
+        
+        counts = ", ".join(f"{count} {outcome}" for outcome, count in sorted(result.counts.items()))
+        print(f"   {len(result.tests)} tests in {result.duration:.1f}s ({counts or 'none run'})")
+        for test in result.failures():
+            print(f"   ❌ {test.nodeid} ({test.outcome})")
+        if result.error:
+            print(f"   💥 {result.error}")
         
         # Show report location
-        report_file = Config.REPORTS_DIR / f"hcl_test_report_{timestamp}.html"
         print(f"\n📈 Detailed Report: file:///{report_file}")
+        if Config.settings().report_format == "compact":
+            print(f"   Data: {report_file.with_suffix('.jsonl')} (open through the dashboard: /reports/{report_file.name})")
         
-        return result.returncode
+        return result.exit_code
         
     except KeyboardInterrupt:
         print("\n⏹️  Test execution interrupted by user")
@@ -185,6 +178,8 @@ Examples:
   %(prog)s --parallel             # Run tests in parallel
   %(prog)s --headless             # Run in headless mode
   %(prog)s --browser firefox      # Run with Firefox
+  %(prog)s --profile ci-fast      # Headless, eager loading, blocked trackers
+  %(prog)s --report-format compact  # JSONL results + shared viewer, no inlined assets
   %(prog)s --help                 # Show this help message
 
 Test Types:
@@ -222,6 +217,19 @@ Test Types:
         help="Browser to use for tests (default: chrome)"
     )
     
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="Settings profile from test_data/profiles (e.g. ci-fast, local-debug, perf)"
+    )
+    
+    parser.add_argument(
+        "--report-format",
+        choices=["html", "compact"],
+        default=None,
+        help="html: self-contained pytest-html; compact: JSONL results plus a shared viewer"
+    )
+    
     parser.add_argument(
         "--list-tests",
         action="store_true",
@@ -236,6 +244,14 @@ Test Types:
     
     args = parser.parse_args()
     
+    # Apply the CLI layer so the configuration shown matches the run
+    set_cli_overrides(
+        profile=args.profile,
+        browser=args.browser,
+        headless=True if args.headless else None,
+        report_format=args.report_format
+    )
+    
     # Print banner
     print_hcltech_banner()
     
@@ -253,38 +269,35 @@ Test Types:
         print("\n📋 AVAILABLE TEST CASES")
         print("-" * 40)
         
-        test_suites = {
-            "Login Tests (7)": [
-                "test_valid_login",
-                "test_invalid_login_attempts (data-driven)",
-                "test_login_page_elements_visibility",
-                "test_password_masking",
-                "test_forgot_password_link",
-                "test_empty_credentials_validation",
-                "test_max_login_attempts"
-            ],
-            "Password Reset Tests (5)": [
-                "test_password_reset_page_elements",
-                "test_password_reset_requests (data-driven)",
-                "test_empty_email_validation",
-                "test_back_to_login_navigation",
-                "test_invalid_email_format"
-            ],
-            "Demo Tests (5)": [
-                "test_navigate_to_login_page",
-                "test_login_form_elements",
-                "test_valid_login_demo",
-                "test_invalid_login_demo",
-                "test_empty_login"
-            ]
+        # Static index: lists tests without importing selenium or pytest plugins
+        from utilities.test_index import get_test_index
+        index = get_test_index()
+        
+        suite_names = {
+            "tests/test_login.py": "Login Tests",
+            "tests/test_password_reset.py": "Password Reset Tests",
+            "tests/test_demo.py": "Demo Tests",
+            "tests/test_framework.py": "Framework Tests",
         }
         
+        test_suites = {}
+        for test in index.tests():
+            suite = suite_names.get(test["file"], test["file"])
+            test_suites.setdefault(suite, []).append(test)
+        
         for suite_name, tests in test_suites.items():
-            print(f"\n{suite_name}:")
+            print(f"\n{suite_name} ({len(tests)}):")
             for test in tests:
-                print(f"  • {test}")
+                label = test["name"]
+                if test["dynamic"]:
+                    label += " (data-driven)"
+                elif test["cases"] > 1:
+                    label += f" ({test['cases']} cases)"
+                print(f"  • {label}")
         
-        print(f"\n📊 Total: 17+ test cases")
+        summary = index.summary()
+        dynamic = "+" if summary["dynamic"] else ""
+        print(f"\n📊 Total: {summary['functions']} tests, {summary['cases']}{dynamic} test cases")
         return 0
     
     # Show execution parameters
@@ -295,7 +308,8 @@ Test Types:
         "Test Type": args.test_type,
         "Parallel Execution": "Yes" if args.parallel else "No",
         "Headless Mode": "Yes" if args.headless else "No",
-        "Browser": args.browser if args.browser else "chrome (default)"
+        "Browser": Config.BROWSER,
+        "Profile": args.profile or "default"
     }
     
     for key, value in params.items():
@@ -308,7 +322,8 @@ Test Types:
         test_type=args.test_type,
         parallel=args.parallel,
         headless=args.headless,
-        browser=args.browser
+        browser=args.browser,
+        profile=args.profile
     )
     
     # Final message
@@ -0,0 +1,142 @@
+// Global state
+let isLoading = false;
+
+// Run tests function
+async function runTest(testType) {
+    if (isLoading) return;
+    
+    showNotification(`Starting ${testType} tests...`, 'info');
+    isLoading = true;
+    
+    try {
+        const response = await fetch(`/api/run/${testType}`);
+        const data = await response.json();
+        
+        showNotification(`✅ ${data.message}`, 'success');
+        
+        // Auto-refresh reports after test execution
+        setTimeout(refreshReports, 2000);
+        
+    } catch (error) {
+        showNotification(`❌ Error: ${error.message}`, 'error');
+    } finally {
+        isLoading = false;
+    }
+}
+
+// Generate report function
+async function generateReport() {
+    showNotification('Generating report...', 'info');
+    
+    try {
+        const response = await fetch('/api/generate-report', { method: 'POST' });
+        const data = await response.json();
+        
+        if (data.success) {
+            showNotification('✅ Report generated successfully!', 'success');
+            setTimeout(refreshReports, 1000);
+        } else {
+            showNotification(`❌ ${data.message}`, 'error');
+        }
+        
+    } catch (error) {
+        showNotification(`❌ Error: ${error.message}`, 'error');
+    }
+}
+
+// Refresh status and reports from /api/dashboard (data only; the page
+// shell and this script are cached by the browser)
+let reportsVersion = null;
+
+async function refreshReports() {
+    try {
+        const response = await fetch('/api/dashboard');
+        const data = await response.json();
+        
+        for (const [key, value] of Object.entries(data.status)) {
+            const element = document.getElementById(`status-${key}`);
+            if (element) element.textContent = value;
+        }
+        
+        // The server renders the fragment once per change of the report list
+        if (data.reports.version !== reportsVersion) {
+            reportsVersion = data.reports.version;
+            document.getElementById('reports-container').innerHTML = data.reports.html;
+        }
+        
+    } catch (error) {
+        console.error('Refresh error:', error);
+    }
+}
+
+// Clear all reports
+async function clearReports() {
+    if (!confirm('Are you sure you want to clear all reports?')) return;
+    
+    showNotification('Clearing reports...', 'info');
+    
+    // This would need a backend endpoint to clear reports
+    setTimeout(() => {
+        showNotification('✅ Reports cleared (demo)', 'success');
+        refreshReports();
+    }, 1000);
+}
+
+// Show notification
+function showNotification(message, type) {
+    const notification = document.getElementById('notification');
+    notification.textContent = message;
+    notification.className = `notification ${type}`;
+    notification.style.display = 'block';
+    
+    setTimeout(() => {
+        notification.style.display = 'none';
+    }, 3000);
+}
+
+// Live progress from /api/runs/stream (Server-Sent Events)
+function showProgress(progress) {
+    const counts = progress.counts || {};
+    const failed = (counts.failed || 0) + (counts.error || 0);
+    document.getElementById('live-run').textContent =
+        `${progress.label} (${progress.status}, ${progress.elapsed}s)`;
+    document.getElementById('live-completed').textContent =
+        `${progress.completed} / ${progress.collected}`;
+    document.getElementById('live-counts').textContent =
+        `${counts.passed || 0} / ${failed} / ${counts.skipped || 0}`;
+    const current = progress.current.length ? progress.current[progress.current.length - 1] : '-';
+    document.getElementById('live-current').textContent = current.split('::').pop();
+}
+
+function connectProgress() {
+    const source = new EventSource('/api/runs/stream');
+    source.addEventListener('snapshot', (e) => {
+        const runs = JSON.parse(e.data).runs;
+        if (runs.length) showProgress(runs[runs.length - 1]);
+    });
+    ['run_started', 'collected', 'test_start', 'test', 'run_finished'].forEach((name) => {
+        source.addEventListener(name, (e) => {
+            const progress = JSON.parse(e.data).progress;
+            showProgress(progress);
+            if (name === 'run_finished') {
+                showNotification(`🏁 ${progress.label} tests finished (exit code ${progress.exit_code})`,
+                                 progress.exit_code === 0 ? 'success' : 'error');
+                refreshReports();
+            }
+        });
+    });
+}
+
+// Initialize on load
+document.addEventListener('DOMContentLoaded', function() {
+    refreshReports();
+    connectProgress();
+    
+    // Auto-refresh reports every 30 seconds
+    setInterval(refreshReports, 30000);
+    
+    // Show welcome message
+    setTimeout(() => {
+        showNotification('🚀 Dashboard loaded successfully!', 'success');
+    }, 1000);
+});
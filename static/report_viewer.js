@@ -0,0 +1,282 @@
+// Compact report viewer (see utilities/compact_report.py)
+//
+// Loads the JSONL file named in <body data-report>, renders only the rows
+// that are on screen, and fetches screenshots and logs only when a test
+// is opened. One copy of this script serves every compact report.
+//
+// A report without a summary line is still being written (or its run
+// died): the viewer then polls for the bytes appended since the last
+// load with a Range request and adds the new tests in place.
+(function () {
+    const ROW_HEIGHT = 28;
+    const OVERSCAN = 20;
+    const MAX_LOG_CHARS = 200000;
+    const POLL_MS = 2000;
+    const OUTCOMES = ['passed', 'failed', 'error', 'skipped', 'xfailed', 'xpassed'];
+
+    const state = {
+        reportUrl: null,
+        run: {},
+        summary: null,
+        tests: [],
+        visible: [],
+        outcome: null,
+        search: '',
+        selected: null,
+        loadedBytes: 0,
+    };
+    let meta, chips, viewport, spacer, rows, detail, renderQueued = false;
+
+    function element(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    // ------------------------------------------------------------
+    // Loading
+    // ------------------------------------------------------------
+    async function fetchLines() {
+        // Only complete lines are consumed; a partly written one is read again next time
+        const headers = state.loadedBytes ? {Range: `bytes=${state.loadedBytes}-`} : {};
+        const response = await fetch(state.reportUrl, {headers, cache: 'no-store'});
+        if (response.status === 416) return [];
+        if (!response.ok) throw new Error(`${response.status} ${response.statusText}`);
+        if (state.loadedBytes && response.status !== 206) {
+            // Range ignored or file replaced: start over
+            state.tests = [];
+            state.loadedBytes = 0;
+        }
+        const bytes = new Uint8Array(await response.arrayBuffer());
+        const end = bytes.lastIndexOf(10) + 1;
+        state.loadedBytes += end;
+        return new TextDecoder().decode(bytes.subarray(0, end)).split('\n');
+    }
+
+    function ingest(lines) {
+        let added = 0;
+        for (const line of lines) {
+            if (!line) continue;
+            const record = JSON.parse(line);
+            if (record.type === 'test') {
+                state.tests.push(record);
+                added++;
+            } else if (record.type === 'run') state.run = record;
+            else if (record.type === 'summary') state.summary = record;
+        }
+        return added;
+    }
+
+    async function load() {
+        state.reportUrl = new URL(document.body.dataset.report, location.href);
+        document.body.textContent = '';
+        const status = element('p', 'rv-status', `Loading ${state.reportUrl.pathname}...`);
+        document.body.appendChild(status);
+
+        try {
+            ingest(await fetchLines());
+        } catch (error) {
+            status.textContent = `Could not load ${document.body.dataset.report}: ${error.message}. ` +
+                'Browsers block file:// requests; open the report through the dashboard (/reports/...).';
+            return;
+        }
+        status.remove();
+        buildLayout();
+        applyFilter();
+        if (!state.summary) setTimeout(poll, POLL_MS);
+    }
+
+    async function poll() {
+        try {
+            if (ingest(await fetchLines()) || state.summary) {
+                renderHeader();
+                applyFilter(true);
+            }
+        } catch (error) {
+            console.error('Report poll failed:', error);
+        }
+        if (!state.summary) setTimeout(poll, POLL_MS);
+    }
+
+    // ------------------------------------------------------------
+    // Layout
+    // ------------------------------------------------------------
+    function countOutcomes() {
+        const counts = {};
+        for (const test of state.tests) counts[test.outcome] = (counts[test.outcome] || 0) + 1;
+        return counts;
+    }
+
+    function renderHeader() {
+        const summary = state.summary;
+        meta.textContent = [
+            state.run.started ? `Started ${state.run.started.replace('T', ' ').slice(0, 19)}` : null,
+            state.run.host ? `on ${state.run.host}` : null,
+            summary ? `${summary.duration}s, exit code ${summary.exit_code}` : 'run in progress or did not finish',
+        ].filter(Boolean).join(' • ');
+
+        const counts = countOutcomes();
+        const buttons = [element('button', 'rv-chip', `all ${state.tests.length}`)];
+        buttons[0].dataset.outcome = '';
+        for (const outcome of OUTCOMES) {
+            if (!counts[outcome]) continue;
+            const chip = element('button', `rv-chip rv-${outcome}`, `${outcome} ${counts[outcome]}`);
+            chip.dataset.outcome = outcome;
+            buttons.push(chip);
+        }
+        for (const button of buttons) {
+            if (button.dataset.outcome === (state.outcome || '')) button.classList.add('rv-active');
+        }
+        chips.replaceChildren(...buttons);
+    }
+
+    function buildLayout() {
+        document.title = state.run.title || document.title;
+        const header = element('header', 'rv-header');
+        header.appendChild(element('h1', null, state.run.title || 'Test Report'));
+        meta = element('p', 'rv-meta');
+        header.appendChild(meta);
+
+        const filters = element('div', 'rv-filters');
+        chips = element('div', 'rv-filters');
+        filters.appendChild(chips);
+        chips.addEventListener('click', (event) => {
+            const chip = event.target.closest('button');
+            if (!chip) return;
+            state.outcome = chip.dataset.outcome || null;
+            renderHeader();
+            applyFilter();
+        });
+
+        const search = element('input', 'rv-search');
+        search.type = 'search';
+        search.placeholder = 'Filter by test name';
+        search.addEventListener('input', () => {
+            state.search = search.value.toLowerCase();
+            applyFilter();
+        });
+        filters.appendChild(search);
+        header.appendChild(filters);
+
+        const main = element('main', 'rv-main');
+        viewport = element('div', 'rv-viewport');
+        spacer = element('div', 'rv-spacer');
+        rows = element('div', 'rv-rows');
+        spacer.appendChild(rows);
+        viewport.appendChild(spacer);
+        viewport.addEventListener('scroll', scheduleRender, {passive: true});
+        window.addEventListener('resize', scheduleRender);
+        rows.addEventListener('click', (event) => {
+            const row = event.target.closest('.rv-row');
+            if (row) showDetail(state.visible[Number(row.dataset.index)]);
+        });
+
+        detail = element('section', 'rv-detail');
+        detail.appendChild(element('p', 'rv-hint', 'Select a test to see its details and artifacts.'));
+        main.appendChild(viewport);
+        main.appendChild(detail);
+
+        document.body.appendChild(header);
+        document.body.appendChild(main);
+        renderHeader();
+    }
+
+    // ------------------------------------------------------------
+    // Virtualized list
+    // ------------------------------------------------------------
+    function applyFilter(keepScroll) {
+        state.visible = state.tests.filter((test) =>
+            (!state.outcome || test.outcome === state.outcome) &&
+            (!state.search || test.nodeid.toLowerCase().includes(state.search)));
+        spacer.style.height = `${state.visible.length * ROW_HEIGHT}px`;
+        if (!keepScroll) viewport.scrollTop = 0;
+        render();
+    }
+
+    function scheduleRender() {
+        if (renderQueued) return;
+        renderQueued = true;
+        requestAnimationFrame(() => {
+            renderQueued = false;
+            render();
+        });
+    }
+
+    function render() {
+        // Only the rows in view (plus a margin) exist in the DOM
+        const first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+        const count = Math.ceil(viewport.clientHeight / ROW_HEIGHT) + 2 * OVERSCAN;
+        const last = Math.min(state.visible.length, first + count);
+
+        const fragment = document.createDocumentFragment();
+        for (let index = first; index < last; index++) {
+            const test = state.visible[index];
+            const row = element('div', `rv-row${test === state.selected ? ' rv-selected' : ''}`);
+            row.dataset.index = index;
+            row.appendChild(element('span', `rv-badge rv-${test.outcome}`, test.outcome));
+            row.appendChild(element('span', 'rv-nodeid', test.nodeid));
+            row.appendChild(element('span', 'rv-duration', `${test.duration.toFixed(2)}s`));
+            fragment.appendChild(row);
+        }
+        rows.style.transform = `translateY(${first * ROW_HEIGHT}px)`;
+        rows.replaceChildren(fragment);
+    }
+
+    // ------------------------------------------------------------
+    // Details and artifacts (loaded on demand)
+    // ------------------------------------------------------------
+    function showDetail(test) {
+        state.selected = test;
+        render();
+        detail.textContent = '';
+        detail.appendChild(element('h2', null, test.nodeid));
+        detail.appendChild(element('p', 'rv-meta',
+            `${test.outcome} in ${test.duration}s${test.worker ? ` on ${test.worker}` : ''}`));
+        if (test.longrepr) detail.appendChild(element('pre', 'rv-longrepr', test.longrepr));
+        for (const sample of test.metrics || []) {
+            // Page timings recorded by BasePage.capture_performance()
+            const table = element('table', 'rv-metrics');
+            table.appendChild(element('caption', null, `${sample.page} ${sample.action}`));
+            for (const [name, value] of Object.entries(sample.metrics)) {
+                const row = element('tr');
+                row.appendChild(element('th', null, name));
+                row.appendChild(element('td', null, String(value)));
+                table.appendChild(row);
+            }
+            detail.appendChild(table);
+        }
+
+        for (const artifact of test.artifacts || []) {
+            const url = new URL(artifact, state.reportUrl);
+            const name = artifact.split('/').pop();
+            const box = element('div', 'rv-artifact');
+            const link = element('a', null, name);
+            link.href = url;
+            link.target = '_blank';
+            box.appendChild(link);
+
+            if (/\.(png|jpe?g|gif)$/i.test(name)) {
+                const image = element('img');
+                image.loading = 'lazy';
+                image.alt = name;
+                image.src = url;
+                box.appendChild(image);
+            } else if (/\.(log|txt)$/i.test(name)) {
+                const button = element('button', 'rv-chip', 'Show log');
+                button.addEventListener('click', async () => {
+                    button.disabled = true;
+                    const text = await fetch(url).then((r) => r.text()).catch((e) => e.message);
+                    const log = text.length > MAX_LOG_CHARS
+                        ? `... ${text.length - MAX_LOG_CHARS} characters omitted ...\n${text.slice(-MAX_LOG_CHARS)}`
+                        : text;
+                    button.replaceWith(element('pre', 'rv-log', log));
+                });
+                box.appendChild(button);
+            }
+            detail.appendChild(box);
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', load);
+})();
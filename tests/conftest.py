@@ -1,35 +1,13 @@
 import pytest
-import sys
-import os
 from pathlib import Path
 
-# ============================================================
-# CRITICAL: Add project root to Python path
-# ============================================================
-# Get the absolute path of the project root (two levels up from conftest.py)
-PROJECT_ROOT = Path(__file__).parent.parent
-
-# Add project root to Python path
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
-
-# Now import project modules
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.service import Service
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.firefox.options import Options as FirefoxOptions
-    from webdriver_manager.chrome import ChromeDriverManager
-    from webdriver_manager.firefox import GeckoDriverManager
-    from utilities.config import Config
-    from utilities.logger import get_logger
-    
-    print(f"✅ conftest.py: Successfully imported modules from {PROJECT_ROOT}")
-except ImportError as e:
-    print(f"❌ conftest.py: Import Error - {e}")
-    print(f"📁 Project Root: {PROJECT_ROOT}")
-    print(f"📁 sys.path: {sys.path}")
-    raise
+# The project root is on sys.path via "pythonpath = ." in pytest.ini.
+# Selenium is deliberately not imported here: browser stacks are loaded by
+# utilities.driver_factory only when a test requests the driver fixture.
+from utilities.config import Config
+from utilities.logger import get_logger
+from utilities.events import get_run_id
+from utilities.settings import set_cli_overrides
 
 logger = get_logger("TestFixture")
 
@@ -56,51 +34,19 @@ def config():
 @pytest.fixture(scope="function")
 def driver(config):
     """Setup and teardown WebDriver instance for each test"""
-    browser = Config.BROWSER
-    headless = Config.HEADLESS
-    
-    logger.log_info(f"Initializing {browser} browser (Headless: {headless})")
+    from utilities.driver_factory import create_driver, get_driver_pool
+    from utilities.phase_timing import instrument_driver
     
     driver_instance = None
+    pool = get_driver_pool()
     
     try:
-        if browser.lower() == "chrome":
-            options = Options()
-            if headless:
-                options.add_argument("--headless")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--window-size=1920,1080")
-            options.add_argument("--disable-notifications")
-            options.add_argument("--disable-gpu")
-            
-            # Initialize Chrome driver
-            driver_instance = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()),
-                options=options
-            )
-        
-        elif browser.lower() == "firefox":
-            options = FirefoxOptions()
-            if headless:
-                options.add_argument("--headless")
-            
-            # Initialize Firefox driver
-            driver_instance = webdriver.Firefox(
-                service=Service(GeckoDriverManager().install()),
-                options=options
-            )
-        
-        else:
-            raise ValueError(f"Unsupported browser: {browser}")
-        
-        # Set implicit wait
-        driver_instance.implicitly_wait(Config.IMPLICIT_WAIT)
-        
-        # Maximize window
-        driver_instance.maximize_window()
-        
-        logger.log_info(f"{browser} browser initialized successfully")
+        driver_instance = pool.acquire() if pool else create_driver()
+        if Config.settings().phase_timing:
+            instrument_driver(driver_instance)
+        if Config.settings().command_trace:
+            from utilities.command_trace import trace_driver
+            trace_driver(driver_instance)
         
         yield driver_instance
         
@@ -110,7 +56,9 @@ def driver(config):
     
     finally:
         # Teardown
-        if driver_instance:
+        if driver_instance and pool:
+            pool.release(driver_instance)
+        elif driver_instance:
             logger.log_info("Closing browser")
             driver_instance.quit()
 
@@ -137,11 +85,36 @@ def log_test_name(request):
     
     logger.log_info(f"Completed test: {test_name}")
 
-# Hook for pytest-html report
+def pytest_generate_tests(metafunc):
+    """Parametrize @data_driven tests from their streamed data source"""
+    from utilities.data_reader import parametrize_data_driven
+    parametrize_data_driven(metafunc)
+
+def pytest_addoption(parser):
+    """Command-line layer of the settings (overrides profile and environment)"""
+    group = parser.getgroup("qa", "HCLTech QA settings")
+    group.addoption("--profile", default=None,
+                    help="Settings profile from test_data/profiles (e.g. ci-fast, local-debug, perf)")
+    group.addoption("--browser", default=None, choices=["chrome", "firefox"],
+                    help="Browser to run tests in")
+    group.addoption("--headless", action="store_true", default=None,
+                    help="Run the browser without a visible window")
+    group.addoption("--compact-report", default=None, metavar="PATH",
+                    help="Write a JSONL report plus a small viewer page (see utilities/compact_report.py)")
+
+# Hook for pytest-html report (optional so the suite loads without the plugin)
+@pytest.hookimpl(optionalhook=True)
 def pytest_html_report_title(report):
     """Set HTML report title"""
     report.title = "HCLTech QA Automation Test Report"
 
+def _framework_only(config):
+    """True when the session selects only the framework self-tests"""
+    if config.getoption("markexpr", "") == "framework":
+        return True
+    args = [arg.split("::")[0] for arg in config.args]
+    return bool(args) and all(Path(arg).name == "test_framework.py" for arg in args)
+
 def pytest_configure(config):
     """Configure pytest options"""
     # Add custom markers
@@ -154,18 +127,63 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "smoke: mark test as smoke test"
     )
-def pytest_configure(config):
-    """Configure pytest options"""
-    # Add custom markers
     config.addinivalue_line(
-        "markers", "login: mark test as login test"
+        "markers", "demo: mark test as demo test"
     )
-    config.addinivalue_line(
-        "markers", "password_reset: mark test as password reset test"
-    )
-    config.addinivalue_line(
-        "markers", "smoke: mark test as smoke test"
+
+    # Share one run id with xdist workers so their event files group together
+    get_run_id()
+
+    set_cli_overrides(
+        profile=config.getoption("--profile"),
+        browser=config.getoption("--browser"),
+        headless=config.getoption("--headless"),
     )
-    config.addinivalue_line(
-        "markers", "demo: mark test as demo test"  # ADD THIS LINE
-    )
\ No newline at end of file
+    Config.ensure_directories()
+
+    # Page timings and budgets; runs wherever tests run, xdist workers included
+    from utilities.page_metrics_plugin import register_page_metrics_plugin
+    register_page_metrics_plugin(config)
+
+    # Per-test time split into driver, navigation, waits, sleeps, ...
+    from utilities.phase_timing_plugin import register_phase_timing_plugin
+    register_phase_timing_plugin(config)
+
+    # Case reduction of each @combinatorial matrix in the run
+    from utilities.combinatorial import register_combinatorial_plugin
+    register_combinatorial_plugin(config)
+
+    # WebDriver command counts, latencies and a trace file (opt-in)
+    from utilities.command_trace import register_command_trace_plugin
+    register_command_trace_plugin(config)
+
+    # Record every outcome in the results history database and keep the
+    # run's screenshots, logs and reports in the artifact store. Framework
+    # self-tests build their own stores under tmp_path and stay out of both.
+    if not _framework_only(config):
+        from utilities.results_store import register_results_plugin
+        register_results_plugin(config, get_run_id())
+
+        # Deduplicated screenshots, logs and reports with a retention policy
+        from utilities.artifact_store import register_artifact_plugin
+        register_artifact_plugin(config, get_run_id())
+
+    # JSONL report with a shared viewer when --compact-report is given
+    from utilities.compact_report import register_compact_report
+    register_compact_report(config)
+
+def pytest_unconfigure(config):
+    """Quit pooled browsers (driver_pool_size > 0)"""
+    from utilities.driver_factory import close_driver_pool
+    close_driver_pool()
+
+def pytest_terminal_summary(terminalreporter):
+    """Report test data cache savings"""
+    from utilities.data_cache import data_cache
+    stats = data_cache.stats
+    if stats["parses"] or data_cache.parses_avoided:
+        terminalreporter.write_line(
+            f"Test data cache: {stats['parses']} parsed, "
+            f"{data_cache.parses_avoided} parses avoided "
+            f"({stats['hits']} memory hits, {stats['sidecar_hits']} sidecar hits)"
+        )
@@ -5,14 +5,7 @@ Demo test file that works with SauceDemo website
 
 import pytest
 import time
-import sys
-import os
-from selenium.webdriver.common.by import By  # ADD THIS IMPORT
-
-# Add project root to Python path
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+from pages.locators import By
 
 from utilities.logger import get_logger
 from utilities.config import Config
@@ -4,17 +4,50 @@ Framework validation tests for HCLTech QA Automation Project
 """
 
 import pytest
+import asyncio
+import gzip
+import itertools
+import json
+import logging
+import multiprocessing
 import os
+import subprocess
 import sys
+import threading
+import time
+import zipfile
 from pathlib import Path
-
-# Add project root to Python path
-PROJECT_ROOT = Path(__file__).parent.parent
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
+from types import SimpleNamespace
 
 from utilities.config import Config
-from utilities.logger import get_logger
+from utilities.logger import get_logger, get_log_file, get_worker_id
+from utilities import events
+from utilities.data_cache import DataCache, thaw
+from utilities.data_reader import open_data_source
+from utilities.settings import PROFILES_DIR, resolve_settings
+from utilities.http_server import FileResponse, HTTPServer, Request, Response, file_response, json_response
+from utilities.job_queue import JobScheduler, QueueFullError
+from utilities.page_metrics import PageMetrics, check_budgets
+from utilities.page_metrics_plugin import PageMetricsPlugin
+from utilities.phase_timing import PhaseTimer, breakdown, format_suite_summary
+from utilities.phase_timing_plugin import PhaseTimingPlugin
+from utilities.progress import ProgressBroker
+from utilities.report_index import ReportIndex
+from utilities.results_store import MIGRATIONS, SCHEMA_VERSION, ResultsStore, RunRecorder, SchemaVersionError
+from utilities.artifact_store import ArtifactStore, RunArtifacts
+from utilities.command_trace import CommandStats, CommandTracePlugin, CommandTracer, iter_trace, trace_driver
+from utilities.compact_report import CompactReport, iter_report, merge_reports
+from utilities.driver_factory import DriverPool
+from utilities.runner import ResultsCollector, WarmRunner, build_args, run_pytest
+from utilities.test_index import TestIndex, compile_marker_expression
+from utilities.combinatorial import (
+    COMBINATORIAL_ENV_VAR, WORKER_OUTPUT_KEY, CombinatorialPlugin, covering_array,
+    exhaustive_count, generate_cases,
+)
+
+from check_import_time import forbidden_imports, parse_importtime
+from benchmark_base_page import compare_results, fixture_page, start_fixture_server, summarize
+from benchmark_suite import flake_rate, summarize as summarize_strategy
 
 logger = get_logger("FrameworkTests")
 
@@ -56,7 +89,51 @@ class TestFrameworkValidation:
         assert hasattr(test_logger, 'log_error'), "Logger should have log_error method"
         
         print("✅ Logger functionality verified")
-    
+
+    def test_logger_registry_reuses_loggers(self):
+        """Test that loggers are cached and share one log file per worker"""
+        print("\n🗂️  Testing logger registry...")
+
+        first = get_logger("RegistryCheck")
+        second = get_logger("RegistryCheck")
+        other = get_logger("RegistryCheckOther")
+
+        assert first is second, "get_logger should return the cached instance"
+        assert len(first.logger.handlers) == 1, "Logger should have a single queue handler"
+        assert first.logger.handlers[0] is other.logger.handlers[0], \
+            "All loggers should share the same queue handler"
+
+        log_file = get_log_file()
+        assert log_file.parent == Config.LOGS_DIR, f"Log file should live in {Config.LOGS_DIR}"
+        assert get_worker_id() in log_file.name, "Log file name should include the worker id"
+
+        print(f"✅ Logger registry verified: {log_file.name}")
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+    def test_cached_loggers_follow_a_fork(self):
+        """Test that a logger cached before a fork writes to the child's own log file"""
+        print("\n🍴 Testing loggers across fork...")
+
+        cached = get_logger("ForkCheck")
+        marker = f"from child {time.time()}"
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                cached.log_info(marker)
+                from utilities.logger import shutdown_logging
+                shutdown_logging()
+                code = 0
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+
+        child_logs = list(Config.LOGS_DIR.glob(f"test_execution_*_{pid}.log"))
+        assert child_logs and marker in child_logs[0].read_text(encoding="utf-8")
+        assert marker not in get_log_file().read_text(encoding="utf-8")
+        print(f"✅ Child wrote {child_logs[0].name}")
+
     def test_project_structure(self):
         """Verify required project files and directories exist"""
         print("\n📁 Testing project structure...")
@@ -128,4 +205,1755 @@ class TestFrameworkValidation:
         assert test_file.exists(), "Should be able to write to reports directory"
         test_file.unlink()  # Clean up
         
-        print(f"✅ Report directories: {Config.REPORTS_DIR}, {Config.LOGS_DIR}")
\ No newline at end of file
+        print(f"✅ Report directories: {Config.REPORTS_DIR}, {Config.LOGS_DIR}")
+
+@pytest.mark.framework
+class TestStructuredEvents:
+    """Test the structured page event layer"""
+
+    def test_events_written_as_jsonl(self, monkeypatch, tmp_path):
+        """Test that enabled events are serialized and can be queried"""
+        print("\n🧾 Testing structured event logging...")
+
+        monkeypatch.setattr(events, "get_events_dir", lambda: tmp_path)
+        events.shutdown_events()
+        events.configure_events("DEBUG")
+        try:
+            started = time.perf_counter()
+            events.record_event("click", ("id", "login-button"), started, "ok", "LoginPage")
+            events.record_event("find", ("id", "missing"), started, "timeout", "LoginPage")
+        finally:
+            events.shutdown_events()
+            events.configure_events()
+
+        recorded = list(events.iter_events(events.find_event_files()))
+        assert [e["op"] for e in recorded] == ["click", "find"]
+        assert recorded[0]["locator"] == "id=login-button"
+        assert recorded[0]["page"] == "LoginPage"
+        assert "test_events_written_as_jsonl" in recorded[0]["test_id"]
+
+        summary = events.summarize_events(recorded)
+        assert summary["find"]["failures"] == 1, "Timeout should count as a failure"
+        print(f"✅ Events recorded: {summary}")
+
+    def test_disabled_events_skip_writer(self, monkeypatch):
+        """Test that filtered events never start the writer"""
+        print("\n🔇 Testing disabled event logging...")
+
+        events.shutdown_events()
+        events.configure_events("OFF")
+        try:
+            assert not events.events_enabled(logging.WARNING)
+            events.record_event("find", ("id", "x"), time.perf_counter(), "timeout")
+            assert events._listener is None, "No writer should be started when disabled"
+        finally:
+            events.configure_events()
+
+        print("✅ Disabled events cost only a level check")
+
+    def test_run_id_distinct_per_process(self, monkeypatch):
+        """Test that runs started in the same second get different ids"""
+        print("\n🆔 Testing run ids...")
+
+        monkeypatch.delenv("QA_RUN_ID", raising=False)
+        run_id = events.get_run_id()
+        assert run_id.endswith(f"_{os.getpid()}")
+        assert events.get_run_id() == run_id, "The id is shared through QA_RUN_ID"
+        assert events.event_file_run_id(f"events_{run_id}_gw0.jsonl") == run_id
+
+        print(f"✅ Run id: {run_id}")
+
+
+@pytest.mark.framework
+class TestDataCache:
+    """Test the shared, mtime-invalidated test data cache"""
+
+    def test_cache_hits_and_invalidation(self, tmp_path):
+        """Test that repeated loads are served from memory until the file changes"""
+        print("\n🗃️  Testing data cache memoization...")
+
+        data_file = tmp_path / "data.json"
+        data_file.write_text(json.dumps({"users": [{"name": "a"}]}))
+        cache = DataCache(sidecar_dir=tmp_path / "sidecars")
+
+        first = cache.load_json(data_file)
+        second = cache.load_json(data_file)
+        assert first is second, "Unchanged file should be served from memory"
+        assert cache.stats["parses"] == 1 and cache.parses_avoided == 1
+
+        data_file.write_text(json.dumps({"users": [{"name": "a"}, {"name": "b"}]}))
+        os.utime(data_file, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+        third = cache.load_json(data_file)
+        assert len(third["users"]) == 2, "Changed file should be re-read"
+        assert cache.stats["invalidations"] == 1
+
+        print(f"✅ Cache stats: {cache.stats}")
+
+    def test_cached_data_is_read_only(self, tmp_path):
+        """Test that callers cannot mutate shared cached data"""
+        print("\n🔒 Testing read-only cached data...")
+
+        data_file = tmp_path / "data.json"
+        data_file.write_text(json.dumps({"valid": {"username": "u"}, "items": [1, 2]}))
+        data = DataCache(use_sidecar=False).load_json(data_file)
+
+        with pytest.raises(TypeError):
+            data["valid"]["username"] = "changed"
+        assert isinstance(data["items"], tuple), "Arrays should be frozen as tuples"
+        assert thaw(data) == {"valid": {"username": "u"}, "items": [1, 2]}
+
+        print("✅ Cached data is immutable")
+
+    def test_sidecar_shared_between_processes(self, tmp_path):
+        """Test that a second cache instance loads the pre-parsed sidecar"""
+        print("\n📦 Testing pre-parsed sidecar...")
+
+        data_file = tmp_path / "data.json"
+        data_file.write_text(json.dumps({"key": "value"}))
+        sidecar_dir = tmp_path / "sidecars"
+
+        DataCache(sidecar_dir=sidecar_dir).load_json(data_file)
+        worker_cache = DataCache(sidecar_dir=sidecar_dir)
+        assert worker_cache.load_json(data_file)["key"] == "value"
+        assert worker_cache.stats == {"parses": 0, "hits": 0, "sidecar_hits": 1, "invalidations": 0}
+
+        print("✅ Sidecar reused without re-parsing")
+
+
+@pytest.mark.framework
+class TestDataSources:
+    """Test streaming data sources used by @data_driven"""
+
+    def test_csv_rows_loaded_lazily_by_offset(self, tmp_path):
+        """Test that CSV row references re-read their row from disk"""
+        print("\n📑 Testing CSV data source...")
+
+        data_file = tmp_path / "logins.csv"
+        data_file.write_text('case,username,note\nfirst,a,"multi\nline"\nsecond,b,plain\n')
+
+        refs = list(open_data_source(data_file, id_field="case").refs())
+        assert [ref.row_id for ref in refs] == ["first", "second"]
+        assert refs[0]["note"] == "multi\nline", "Quoted newlines should stay in one row"
+        assert dict(refs[1]) == {"case": "second", "username": "b", "note": "plain"}
+
+        # Each reference reads its row once, then serves keys from memory
+        data_file.unlink()
+        assert refs[0]["username"] == "a" and len(refs[1]) == 3
+
+        print("✅ CSV rows streamed and loaded by offset")
+
+    def test_jsonl_filter_and_sharding(self, tmp_path):
+        """Test row filtering and sharding on a JSONL source"""
+        print("\n🔀 Testing JSONL filtering and sharding...")
+
+        data_file = tmp_path / "rows.jsonl"
+        data_file.write_text("".join(json.dumps({"n": n}) + "\n" for n in range(10)))
+
+        def even(row):
+            return row["n"] % 2 == 0
+
+        shard_0 = [ref["n"] for ref in open_data_source(data_file, where=even, shard="0/2").refs()]
+        shard_1 = [ref["n"] for ref in open_data_source(data_file, where=even, shard=(1, 2)).refs()]
+        assert shard_0 == [0, 4, 8]
+        assert shard_1 == [2, 6]
+
+        with pytest.raises(ValueError):
+            open_data_source(data_file, shard="2/2")
+
+        print("✅ Filtered rows split across shards")
+
+    def test_excel_source_read_only(self, tmp_path):
+        """Test streaming rows from an Excel workbook"""
+        openpyxl = pytest.importorskip("openpyxl")
+        print("\n📗 Testing Excel data source...")
+
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["username", "password"])
+        sheet.append(["standard_user", "secret_sauce"])
+        sheet.append(["locked_out_user", None])
+        data_file = tmp_path / "logins.xlsx"
+        workbook.save(data_file)
+
+        source = open_data_source(data_file)
+        try:
+            rows = [dict(ref) for ref in source.refs()]
+        finally:
+            source.close()
+        assert rows == [
+            {"username": "standard_user", "password": "secret_sauce"},
+            {"username": "locked_out_user", "password": ""},
+        ]
+
+        print("✅ Excel rows streamed in read-only mode")
+
+
+@pytest.mark.framework
+class TestCombinatorialDesign:
+    """Test the pairwise/t-wise test matrix generator"""
+
+    DIMENSIONS = {
+        "username": ["standard_user", "locked_out_user", "problem_user"],
+        "password": ["secret_sauce", "wrong", ""],
+        "browser": ["chrome", "firefox"],
+        "username_case": ["lower", "upper"],
+    }
+
+    @staticmethod
+    def covered(cases, names):
+        return {tuple(case[n] for n in names) for case in cases}
+
+    @pytest.mark.parametrize("strength", [2, 3])
+    def test_covering_array_covers_all_tuples(self, strength):
+        """Test that every t-wise value combination appears in some case"""
+        print(f"\n🧮 Testing {strength}-wise coverage...")
+
+        cases = covering_array(self.DIMENSIONS, strength)
+        for names in itertools.combinations(self.DIMENSIONS, strength):
+            expected = set(itertools.product(*(self.DIMENSIONS[n] for n in names)))
+            assert self.covered(cases, names) == expected, f"Missing combinations for {names}"
+
+        assert len(cases) < exhaustive_count(self.DIMENSIONS)
+        print(f"✅ {len(cases)}/{exhaustive_count(self.DIMENSIONS)} cases cover all {strength}-tuples")
+
+    def test_exhaustive_override(self, monkeypatch):
+        """Test that QA_COMBINATORIAL=exhaustive returns the full product"""
+        print("\n🌙 Testing exhaustive override...")
+
+        monkeypatch.setenv(COMBINATORIAL_ENV_VAR, "exhaustive")
+        assert len(generate_cases(self.DIMENSIONS)) == 36
+
+        assert len(generate_cases(self.DIMENSIONS, strength=2)) < 36, "An explicit strength wins"
+
+        monkeypatch.setenv(COMBINATORIAL_ENV_VAR, "pairwise")
+        assert len(generate_cases(self.DIMENSIONS)) < 36
+
+        for strength in (0, 1):
+            with pytest.raises(ValueError, match="2 or more"):
+                generate_cases(self.DIMENSIONS, strength=strength)
+        monkeypatch.setenv(COMBINATORIAL_ENV_VAR, "1")
+        with pytest.raises(ValueError, match=COMBINATORIAL_ENV_VAR):
+            generate_cases(self.DIMENSIONS)
+
+        print("✅ Exhaustive and pairwise modes resolved; invalid strengths rejected")
+
+    def test_reduction_report_from_collected_items(self, tmp_path, monkeypatch):
+        """Test that the summary lists collected matrices, including xdist workers' ones"""
+        print("\n📉 Testing reduction report...")
+
+        (tmp_path / "test_matrix.py").write_text(
+            "from utilities.combinatorial import combinatorial\n"
+            f"@combinatorial({self.DIMENSIONS!r}, name='matrix')\n"
+            "def test_matrix(username, password, browser, username_case):\n"
+            "    pass\n"
+        )
+        monkeypatch.setenv(COMBINATORIAL_ENV_VAR, "pairwise")
+        plugin = CombinatorialPlugin()
+        run_pytest(["-q", "-p", "no:cacheprovider", "--collect-only", str(tmp_path)], plugins=[plugin])
+        (name, strength, total, generated), = plugin.reductions.values()
+        assert (name, strength, total) == ("matrix", 2, 36) and generated < total
+
+        # An xdist controller never collects; workers send their matrices
+        controller = CombinatorialPlugin()
+        worker = SimpleNamespace(workeroutput={WORKER_OUTPUT_KEY: [["matrix", 2, 36, generated]]})
+        controller.pytest_testnodedown(worker, None)
+        assert controller.reductions == plugin.reductions
+
+        print(f"✅ Reduction report: {generated}/{total} cases")
+
+
+@pytest.mark.framework
+class TestLayeredSettings:
+    """Test defaults -> profile -> environment -> CLI settings resolution"""
+
+    def test_layers_apply_in_order(self):
+        """Test that later layers override earlier ones with typed values"""
+        print("\n🧱 Testing settings layers...")
+
+        resolved = resolve_settings(
+            environ={"QA_PROFILE": "ci-fast", "BROWSER": "firefox", "QA_EXPLICIT_WAIT": "7"},
+            cli_overrides={"browser": "chrome"},
+        )
+
+        assert resolved.profile == "ci-fast"
+        assert resolved.headless is True and resolved.source_of("headless") == "profile"
+        assert resolved.explicit_wait == 7 and resolved.source_of("explicit_wait") == "env"
+        assert resolved.browser == "chrome" and resolved.source_of("browser") == "cli"
+        assert resolved.implicit_wait == 0, "Profile value should survive when not overridden"
+        assert resolved.source_of("base_url") == "default"
+
+        print(f"✅ Settings resolved: {resolved.as_dict()}")
+
+    def test_legacy_headless_env_var(self):
+        """Test that HEADLESS exported by run_tests.py takes effect"""
+        print("\n👻 Testing HEADLESS environment variable...")
+
+        assert resolve_settings(environ={"HEADLESS": "True"}, cli_overrides={}).headless is True
+        assert resolve_settings(environ={}, cli_overrides={}).headless is False
+
+        print("✅ HEADLESS environment variable honored")
+
+    def test_invalid_settings_rejected(self):
+        """Test that unknown profiles and bad values fail loudly"""
+        print("\n🚫 Testing invalid settings...")
+
+        with pytest.raises(ValueError):
+            resolve_settings(profile="does-not-exist", environ={}, cli_overrides={})
+        with pytest.raises(ValueError):
+            resolve_settings(environ={"QA_HEADLESS": "maybe"}, cli_overrides={})
+
+        print("✅ Invalid settings rejected")
+
+    def test_profiles_are_valid(self):
+        """Test that every shipped profile resolves"""
+        print("\n📚 Testing shipped profiles...")
+
+        for profile_file in sorted(PROFILES_DIR.glob("*.json")):
+            resolved = resolve_settings(profile=profile_file.stem, environ={}, cli_overrides={})
+            print(f"✅ {profile_file.stem}: headless={resolved.headless}")
+
+
+@pytest.mark.framework
+class TestStartupImports:
+    """Test that collection does not load the browser stack"""
+
+    @pytest.mark.parametrize("module", ["tests.conftest", "tests.test_login", "tests.test_demo"])
+    def test_module_import_skips_selenium(self, module):
+        """Test that importing conftest and test modules never imports selenium"""
+        print(f"\n🪶 Testing lazy imports for {module}...")
+
+        code = (
+            f"import sys, {module}; "
+            "print(sorted(m for m in sys.modules if m.split('.')[0] in ('selenium', 'webdriver_manager')))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, cwd=Config.BASE_DIR
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]", f"{module} imported: {result.stdout.strip()}"
+
+        print(f"✅ {module} imports without selenium")
+
+    def test_importtime_parser(self):
+        """Test parsing of python -X importtime output"""
+        print("\n⏱️  Testing importtime parser...")
+
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   utilities.settings\n"
+            "import time:       300 |       4500 | utilities.config\n"
+        )
+        assert parse_importtime(stderr) == {"utilities.settings": 120, "utilities.config": 4500}
+        assert forbidden_imports({"selenium.webdriver", "seleniumbase", "json"}, ["selenium"]) == ["selenium.webdriver"]
+
+        print("✅ importtime output parsed")
+
+
+@pytest.mark.framework
+class TestStaticTestIndex:
+    """Test the AST-based test index used for fast listing"""
+
+    SAMPLE = '''
+import pytest
+from utilities.data_reader import data_driven
+
+pytestmark = [pytest.mark.regression]
+
+def test_module_level():
+    pass
+
+@pytest.mark.smoke
+class TestSample:
+    @pytest.mark.parametrize("x", [1, 2, 3])
+    @pytest.mark.parametrize("y", ["a", "b"])
+    def test_matrix(self, x, y):
+        """Matrix test"""
+
+    @data_driven(source="rows.csv")
+    @pytest.mark.login
+    def test_rows(self, data_row):
+        pass
+
+    def helper(self):
+        pass
+
+class TestWithInit:
+    def __init__(self):
+        pass
+
+    def test_ignored(self):
+        pass
+'''
+
+    def build_index(self, tmp_path):
+        tests_dir = tmp_path / "tests"
+        tests_dir.mkdir(exist_ok=True)
+        (tests_dir / "test_sample.py").write_text(self.SAMPLE)
+        (tests_dir / "helpers.py").write_text("def test_not_collected(): pass\n")
+        index = TestIndex(tests_dir=tests_dir, cache_file=tmp_path / "index.json")
+        index.build()
+        return index
+
+    def test_index_extracts_tests_without_import(self, tmp_path):
+        """Test that classes, markers and parametrize sizes are extracted"""
+        print("\n🌳 Testing static test index...")
+
+        index = self.build_index(tmp_path)
+        tests = {t["name"]: t for t in index.tests()}
+
+        assert set(tests) == {"test_module_level", "test_matrix", "test_rows"}
+        assert tests["test_matrix"]["cases"] == 6 and not tests["test_matrix"]["dynamic"]
+        assert tests["test_matrix"]["markers"] == ["parametrize", "regression", "smoke"]
+        assert tests["test_rows"]["dynamic"], "Data-driven tests are sized at collection"
+        assert tests["test_matrix"]["nodeid"] == "tests/test_sample.py::TestSample::test_matrix"
+
+        print(f"✅ Indexed: {index.summary()}")
+
+    def test_marker_expressions_and_cache(self, tmp_path):
+        """Test -m style filtering and cache reuse of unchanged files"""
+        print("\n🏷️  Testing marker filtering and index cache...")
+
+        self.build_index(tmp_path)
+        index = TestIndex(tests_dir=tmp_path / "tests", cache_file=tmp_path / "index.json")
+
+        names = [t["name"] for t in index.tests("smoke and not login")]
+        assert names == ["test_matrix"]
+        assert [t["name"] for t in index.tests("login or (regression and not smoke)")] == \
+            ["test_module_level", "test_rows"]
+        assert index.stats == {"files": 1, "parsed": 0, "cached": 1}
+
+        with pytest.raises(ValueError):
+            compile_marker_expression("smoke; import os")
+
+        print("✅ Marker expressions evaluated from cached index")
+
+
+@pytest.mark.framework
+class TestProgrammaticRunner:
+    """Test the in-process and warm forked pytest runner"""
+
+    SAMPLE = '''
+import pytest
+
+def test_passes():
+    pass
+
+def test_fails():
+    assert 1 == 2
+
+@pytest.mark.skip(reason="sample")
+def test_skipped():
+    pass
+
+@pytest.fixture
+def broken():
+    raise RuntimeError("fixture failed")
+
+def test_errors(broken):
+    pass
+'''
+
+    def write_suite(self, tmp_path, name):
+        (tmp_path / f"{name}.py").write_text(self.SAMPLE)
+        return ["-q", "-p", "no:cacheprovider", str(tmp_path)]
+
+    def test_run_in_process_returns_structured_result(self, tmp_path):
+        """Test per-test outcomes and streamed events from run_pytest"""
+        print("\n🏃 Testing in-process runner...")
+
+        events = []
+        result = run_pytest(self.write_suite(tmp_path, "test_runner_inline"), on_event=events.append)
+
+        assert result.exit_code == 1 and not result.success
+        assert result.collected == 4
+        assert result.counts == {"passed": 1, "failed": 1, "skipped": 1, "error": 1}
+        failed = {t.nodeid.split("::")[-1]: t for t in result.failures()}
+        assert set(failed) == {"test_fails", "test_errors"}
+        assert "assert 1 == 2" in failed["test_fails"].longrepr
+        assert set(failed["test_errors"].phases) == {"setup", "teardown"}
+        assert [e["event"] for e in events][:3] == ["session_start", "collected", "test_start"]
+        assert events[-1]["event"] == "session_finish"
+
+        print(f"✅ Result: {result.counts} in {result.duration:.2f}s")
+
+    @pytest.mark.skipif("forkserver" not in multiprocessing.get_all_start_methods(),
+                        reason="warm runner needs fork")
+    def test_warm_runner_forks_each_run(self, tmp_path):
+        """Test that the warm runner streams events back from a forked child"""
+        print("\n🔥 Testing warm forked runner...")
+
+        runner = WarmRunner(preload=["pytest", "utilities.runner"])
+        runner.start()
+        events = []
+        output = tmp_path / "output.log"
+        result = runner.run(self.write_suite(tmp_path, "test_runner_forked"),
+                            on_event=events.append, output_file=output)
+
+        assert result.exit_code == 1
+        assert result.counts == {"passed": 1, "failed": 1, "skipped": 1, "error": 1}
+        assert events[0]["pid"] != os.getpid(), "Run should happen in a child process"
+        assert "1 failed" in output.read_text()
+        assert runner.active_runs() == []
+
+        print(f"✅ Forked run: {result.counts}")
+
+    def test_runs_spawned_without_forkserver(self, tmp_path, monkeypatch):
+        """Test that platforms without forkserver still run in a child process"""
+        print("\n🪟 Testing spawn fallback...")
+
+        monkeypatch.setattr(WarmRunner, "forking", property(lambda self: False))
+        run_id = os.environ.get("QA_RUN_ID")
+        cwd = os.getcwd()
+        events = []
+        result = WarmRunner().run(self.write_suite(tmp_path, "test_runner_spawned"), on_event=events.append)
+
+        assert result.counts == {"passed": 1, "failed": 1, "skipped": 1, "error": 1}
+        assert events[0]["pid"] != os.getpid(), "Run should happen in a child process"
+        assert os.environ.get("QA_RUN_ID") == run_id and os.getcwd() == cwd, "The caller is left untouched"
+
+        print(f"✅ Spawned run: {result.counts}")
+
+    @pytest.mark.skipif("forkserver" not in multiprocessing.get_all_start_methods(),
+                        reason="warm runner needs fork")
+    def test_warm_run_flushes_logs_before_exit(self, tmp_path):
+        """Test that records queued at the end of a forked run reach its log file"""
+        print("\n🧾 Testing log flush in forked runs...")
+
+        marker = f"last record {time.time()}"
+        # Logged as the session ends, so the queue may still hold them when the run finishes
+        (tmp_path / "conftest.py").write_text(
+            "from utilities.logger import get_logger\n"
+            "def pytest_sessionfinish(session):\n"
+            "    for i in range(2000):\n"
+            "        get_logger('ForkedRun').log_info('record %d', i)\n"
+            f"    get_logger('ForkedRun').log_info({marker!r})\n"
+        )
+        (tmp_path / "test_runner_logging.py").write_text("def test_passes():\n    pass\n")
+        runner = WarmRunner(preload=["pytest", "utilities.runner"])
+        events = []
+        result = runner.run(["-q", "-p", "no:cacheprovider", str(tmp_path)],
+                            on_event=events.append, output_file=tmp_path / "output.log")
+
+        assert result.success
+        child_logs = list(Config.LOGS_DIR.glob(f"test_execution_*_{events[0]['pid']}.log"))
+        assert child_logs and marker in child_logs[0].read_text(encoding="utf-8")
+        print(f"✅ Flushed to {child_logs[0].name}")
+
+
+@pytest.mark.framework
+class TestAsyncHTTPServer:
+    """Test the asyncio HTTP server behind the dashboard"""
+
+    @staticmethod
+    async def fetch(port, path, method="GET", keep_alive=False):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        connection = "keep-alive" if keep_alive else "close"
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nConnection: {connection}\r\n\r\n".encode())
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        headers = dict(line.split(": ", 1) for line in head.decode().split("\r\n")[1:] if line)
+        body = b"" if method == "HEAD" else await reader.readexactly(int(headers["Content-Length"]))
+        writer.close()
+        return int(head.split()[1]), headers, body
+
+    def test_slow_handler_does_not_block_other_clients(self):
+        """Test routing, errors and concurrency of the asyncio server"""
+        print("\n🌐 Testing asyncio HTTP server...")
+
+        async def scenario():
+            server = HTTPServer("127.0.0.1", 0)
+            release = asyncio.Event()
+
+            async def slow(request):
+                await release.wait()
+                return json_response({"slow": True})
+
+            server.route("/slow", slow)
+            server.route("/fast", lambda request: json_response({"query": request.query}))
+            server.route("/post-only", lambda request: Response("ok"), methods=("POST",))
+            await server.start()
+            port = server._server.sockets[0].getsockname()[1]
+
+            slow_request = asyncio.ensure_future(self.fetch(port, "/slow"))
+            status, headers, body = await asyncio.wait_for(self.fetch(port, "/fast?a=1"), timeout=5)
+            assert status == 200 and json.loads(body) == {"query": {"a": "1"}}
+            assert headers["Content-Type"] == "application/json"
+            assert not slow_request.done(), "Slow handler should still be pending"
+
+            release.set()
+            assert (await slow_request)[0] == 200
+            assert (await self.fetch(port, "/missing"))[0] == 404
+            assert (await self.fetch(port, "/post-only"))[0] == 405
+            head_status, head_headers, _ = await self.fetch(port, "/fast", method="HEAD")
+            assert head_status == 200
+            await server.close()
+
+        asyncio.run(scenario())
+        print("✅ Concurrent requests served while a slow handler waited")
+
+    def test_invalid_content_length_rejected(self):
+        """Test that a malformed or negative Content-Length gets a 400"""
+        print("\n🚫 Testing Content-Length validation...")
+
+        async def post(port, length):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"POST /echo HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\nok".encode())
+            await writer.drain()
+            status_line = await reader.readline()
+            writer.close()
+            return int(status_line.split()[1])
+
+        async def scenario():
+            server = HTTPServer("127.0.0.1", 0)
+            server.route("/echo", lambda request: Response(request.body), methods=("POST",))
+            await server.start()
+            port = server._server.sockets[0].getsockname()[1]
+            statuses = [await post(port, length) for length in ("2", "-1", "abc", "+2")]
+            await server.close()
+            return statuses
+
+        assert asyncio.run(scenario()) == [200, 400, 400, 400]
+        print("✅ Invalid Content-Length answered with 400")
+
+
+@pytest.mark.framework
+class TestReportIndex:
+    """Test the incremental report catalog used by the dashboard"""
+
+    @staticmethod
+    def write_report(directory, name, mtime):
+        path = directory / name
+        path.write_text("<html></html>")
+        os.utime(path, (mtime, mtime))
+
+    @pytest.mark.parametrize("use_inotify", [True, False], ids=["inotify", "scan"])
+    def test_index_tracks_changes_and_paginates(self, tmp_path, use_inotify):
+        """Test ordering, paging, kind filters and incremental updates"""
+        print(f"\n🗂️  Testing report index ({'inotify' if use_inotify else 'scan'})...")
+
+        base = time.time() - 1000
+        for i in range(25):
+            self.write_report(tmp_path, f"hcl_test_report_20260101_{i:06d}.html", base + i)
+        self.write_report(tmp_path, "hcl_demo_report_20260101_000000.html", base - 1)
+        (tmp_path / "notes.txt").write_text("not a report")
+
+        index = ReportIndex(tmp_path, use_inotify=use_inotify)
+        first = index.query(limit=10)
+        assert first["total"] == 26
+        assert first["reports"][0]["name"] == "hcl_test_report_20260101_000024.html"
+        assert index.query(offset=20, limit=10)["reports"][-1]["kind"] == "hcl_demo_report"
+        assert index.query(kind="hcl_demo_report")["total"] == 1
+        assert [r["name"] for r in index.query(search="00001", limit=3)["reports"]] == [
+            f"hcl_test_report_20260101_0000{i}.html" for i in (19, 18, 17)
+        ]
+        assert index.query(search="00001", limit=3)["total"] == 11  # 000001 and 000010-000019
+
+        # Incremental updates: a new report, a deletion and a rewrite
+        self.write_report(tmp_path, "hcl_report_20260102_000000.html", base + 100)
+        (tmp_path / "hcl_test_report_20260101_000024.html").unlink()
+        self.write_report(tmp_path, "hcl_test_report_20260101_000000.html", base + 50)
+
+        names = [r["name"] for r in index.query(limit=3)["reports"]]
+        assert names == [
+            "hcl_report_20260102_000000.html",
+            "hcl_test_report_20260101_000000.html",
+            "hcl_test_report_20260101_000023.html",
+        ]
+        assert len(index) == 26
+        mode = index.mode
+        if mode == "inotify":
+            assert index.stats["scans"] == 1, "inotify mode should not rescan"
+        index.close()
+
+        print(f"✅ Report index ({mode}): {index.stats}")
+
+
+@pytest.mark.framework
+class TestFileServing:
+    """Test conditional, ranged and precompressed file responses"""
+
+    @staticmethod
+    def request(**headers):
+        return Request("GET", "/reports/report.html", "HTTP/1.1",
+                       {name.replace("_", "-"): value for name, value in headers.items()})
+
+    def test_etag_range_and_gzip_sibling(self, tmp_path):
+        """Test 304, 206, 416 and the cached gzip sibling"""
+        print("\n📦 Testing static file responses...")
+
+        report = tmp_path / "report.html"
+        report.write_text("<html>" + "result row\n" * 500 + "</html>")
+        size = report.stat().st_size
+
+        plain = file_response(self.request(), report, "text/html")
+        assert isinstance(plain, FileResponse) and plain.length == size
+        assert file_response(self.request(if_none_match=plain.headers["ETag"]), report, "text/html").status == 304
+
+        partial = file_response(self.request(range="bytes=6-15"), report, "text/html")
+        assert partial.status == 206 and (partial.offset, partial.length) == (6, 10)
+        assert partial.headers["Content-Range"] == f"bytes 6-15/{size}"
+        assert file_response(self.request(range=f"bytes={size}-"), report, "text/html").status == 416
+
+        compressed = file_response(self.request(accept_encoding="gzip, br"), report, "text/html")
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert compressed.headers["ETag"] != plain.headers["ETag"]
+        assert gzip.decompress(Path(compressed.path).read_bytes()) == report.read_bytes()
+        assert compressed.length < size / 10
+
+        # The sibling is reused until the report changes
+        sibling_mtime = os.stat(compressed.path).st_mtime_ns
+        file_response(self.request(accept_encoding="gzip"), report, "text/html")
+        assert os.stat(compressed.path).st_mtime_ns == sibling_mtime
+
+        print(f"✅ {size} bytes served as {compressed.length} gzip bytes")
+
+
+@pytest.mark.framework
+class TestDashboardShell:
+    """Test the cached dashboard shell, hashed assets and JSON refresh"""
+
+    def test_shell_assets_and_fragments_are_cached(self):
+        """Test that the shell and assets are built once and revalidate cheaply"""
+        print("\n🧱 Testing dashboard shell caching...")
+
+        import dashboard
+        server = HTTPServer("localhost", 0)
+        app = dashboard.DashboardApp(server)
+
+        def get(path, **headers):
+            request = Request("GET", path, "HTTP/1.1",
+                              {name.replace("_", "-"): value for name, value in headers.items()})
+            return asyncio.run(server.dispatch(request))
+
+        shell = get("/")
+        css_url = app.assets.url("dashboard.css")
+        assert css_url.startswith("/assets/dashboard.") and css_url.encode() in shell.body
+        assert get("/", if_none_match=shell.headers["ETag"]).status == 304
+
+        css = get(css_url, accept_encoding="gzip")
+        assert css.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+        assert gzip.decompress(css.body) == (dashboard.STATIC_DIR / "dashboard.css").read_bytes()
+        assert get("/assets/dashboard.0000000000.css").status == 404
+
+        dashboard.render_reports_html.cache_clear()
+        first = app.get_dashboard_data()
+        second = app.get_dashboard_data()
+        assert first["reports"] == second["reports"]
+        assert dashboard.render_reports_html.cache_info().hits == 1, "Unchanged listing is not re-rendered"
+
+        print(f"✅ Shell {len(shell.body)} bytes, CSS at {css_url}")
+
+
+@pytest.mark.framework
+class TestCompactReport:
+    """Test the JSONL report mode and its shared viewer page"""
+
+    def test_pytest_run_writes_jsonl_and_viewer_stub(self, tmp_path):
+        """Test a real pytest session written as a compact report"""
+        print("\n🗜️ Testing compact report from a pytest run...")
+
+        (tmp_path / "test_sample.py").write_text(
+            "import pytest\n"
+            "def test_ok():\n    pass\n"
+            "def test_bad():\n    assert 1 == 2\n"
+            "@pytest.mark.skip\ndef test_skipped():\n    pass\n"
+        )
+        report = CompactReport(tmp_path / "out" / "report.html")
+        run_pytest(["-q", "-p", "no:cacheprovider", str(tmp_path)],
+                   plugins=[ResultsCollector(report.handle)])
+
+        lines = [json.loads(line) for line in report.path.read_text().splitlines()]
+        assert [line["type"] for line in lines] == ["run", "test", "test", "test", "summary"]
+        assert lines[-1]["counts"] == {"passed": 1, "failed": 1, "skipped": 1}
+        failed = next(line for line in lines if line.get("outcome") == "failed")
+        assert "assert 1 == 2" in failed["longrepr"]
+
+        stub = report.path.with_suffix(".html").read_text()
+        assert 'data-report="report.jsonl"' in stub and "report_viewer.js" in stub
+
+        args = build_args("demo", html_report=tmp_path / "r.html", report_format="compact")
+        assert f"--compact-report={tmp_path / 'r.jsonl'}" in args and "--self-contained-html" not in args
+
+        print(f"✅ {len(lines) - 2} tests in {report.path.stat().st_size} bytes")
+
+    def test_size_scales_with_tests_not_artifacts(self, tmp_path):
+        """Test that artifacts are referenced by path instead of inlined"""
+        print("\n📏 Testing compact report size...")
+
+        screenshot = tmp_path / "screenshot_login.png"
+        screenshot.write_bytes(os.urandom(1024 * 1024))
+
+        report = CompactReport(tmp_path / "big.html")
+        start = time.perf_counter()
+        report.handle({"event": "session_start", "ts": time.time(), "args": []})
+        for i in range(5000):
+            report.handle({"event": "test", "nodeid": f"tests/test_matrix.py::test_case[{i}]",
+                           "outcome": "passed", "duration": 0.01, "worker": "gw0",
+                           "artifacts": [str(screenshot)] if i % 100 == 0 else []})
+        report.handle({"event": "session_finish", "exit_code": 0, "duration": 50.0})
+        elapsed = time.perf_counter() - start
+
+        size = report.path.stat().st_size
+        assert size < 5000 * 150, f"{size} bytes for 5000 tests"
+        assert '"artifacts":["screenshot_login.png"]' in report.path.read_text()
+        assert elapsed < 1.0
+
+        print(f"✅ 5000 tests (50 x 1 MB screenshots referenced) in {size // 1024} KB, written in {elapsed * 1000:.0f}ms")
+
+
+    def test_streams_partial_report_with_flat_memory(self, tmp_path):
+        """Test that lines are on disk as tests finish and memory stays flat"""
+        print("\n🌊 Testing streaming compact report...")
+        import tracemalloc
+
+        def test_event(i):
+            return {"event": "test", "nodeid": f"tests/test_big.py::test_case[{i}]",
+                    "outcome": "failed" if i % 50 == 0 else "passed", "duration": 0.01,
+                    "worker": f"gw{i % 4}", "longrepr": "AssertionError" if i % 50 == 0 else ""}
+
+        report = CompactReport(tmp_path / "stream.html")
+        report.handle({"event": "session_start", "ts": time.time(), "args": ["-n", "4"]})
+        for i in range(100):
+            report.handle(test_event(i))
+
+        # Mid-run: the report is readable and has no summary yet
+        partial = list(iter_report(report.path))
+        assert len(partial) == 101 and partial[-1]["type"] == "test"
+        assert report.path.with_suffix(".html").exists()
+
+        tracemalloc.start()
+        for i in range(100, 2100):
+            report.handle(test_event(i))
+        peak_small = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        for i in range(2100, 22100):
+            report.handle(test_event(i))
+        peak_large = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        report.handle({"event": "session_finish", "exit_code": 1, "duration": 12.0})
+
+        assert peak_large < peak_small * 2 + 64 * 1024, f"Peak grew from {peak_small} to {peak_large} bytes"
+        records = list(iter_report(report.path))
+        assert records[-1]["total"] == 22100 and records[-1]["counts"]["failed"] == 442
+
+        # A crash mid-write leaves a truncated last line, which readers skip
+        with open(report.path, "a", encoding="utf-8") as f:
+            f.write('{"type":"test","nodeid":"cut')
+        assert len(list(iter_report(report.path))) == len(records)
+
+        print(f"✅ 22100 tests streamed; peak {peak_small} B after 2k vs {peak_large} B over 20k more")
+
+    def test_merge_worker_streams(self, tmp_path):
+        """Test merging separately written streams by finish time"""
+        print("\n🔀 Testing compact report merge...")
+
+        shards = []
+        for shard in range(2):
+            report = CompactReport(tmp_path / f"shard{shard}.html")
+            report.open(args=[f"--shard={shard}"])
+            for i in range(3):
+                report.write_test({"type": "test", "nodeid": f"t{shard}_{i}", "outcome": "passed",
+                                   "duration": 0.1, "worker": f"gw{shard}", "ts": i * 2 + shard})
+            report.close(shard, 1.0 + shard)
+            shards.append(report.path)
+
+        merged = merge_reports(tmp_path / "merged.html", shards)
+        records = list(iter_report(merged.path))
+        assert [r["nodeid"] for r in records if r["type"] == "test"] == \
+            ["t0_0", "t1_0", "t0_1", "t1_1", "t0_2", "t1_2"]
+        assert records[-1] == {"type": "summary", "exit_code": 1, "duration": 2.0,
+                               "total": 6, "counts": {"passed": 6}}
+
+        print(f"✅ Merged {len(shards)} streams into {merged.total} tests")
+
+
+@pytest.mark.framework
+class TestArtifactStore:
+    """Test the content-addressed artifact store"""
+
+    @staticmethod
+    def record_runs(store, source_dir, runs, failed=()):
+        for run in range(runs):
+            screenshot = source_dir / "login_page.png"
+            screenshot.write_bytes(b"\x89PNG same screenshot every run" * 100)
+            log = source_dir / f"run{run}.log"
+            log.write_text(f"run {run}\n" + "INFO step passed\n" * 500)
+            store.add(f"run{run}", screenshot, nodeid="tests/test_demo.py::test_login")
+            store.add(f"run{run}", log)
+            store.finish_run(f"run{run}", run in failed)
+
+    def test_dedup_retention_and_compaction(self, tmp_path):
+        """Test deduplication, keep-failures-longer retention and zip packs"""
+        print("\n🗃️ Testing artifact store...")
+
+        sources = tmp_path / "reports"
+        sources.mkdir()
+        store = ArtifactStore(tmp_path / "store")
+        self.record_runs(store, sources, runs=8, failed={2})
+        assert store.stats()["objects"] == 9, "One screenshot object shared by all runs"
+
+        assert store.apply_retention(keep_runs=3, keep_failed_runs=10, remove_sources=True) == 4
+        assert [run["run_uid"] for run in store.runs()] == ["run7", "run6", "run5", "run2"]
+        assert not (sources / "run0.log").exists() and (sources / "run2.log").exists()
+        assert (sources / "login_page.png").exists(), "Rewritten source belongs to the latest run"
+
+        packed = store.compact(keep_loose_runs=1)
+        assert packed == 3  # logs of run2, run5, run6; the screenshot is still used by run7
+        stats = store.stats()
+        assert stats["packs"] == 1 and stats["loose_objects"] == 2
+        (log,) = [a for a in store.lookup("run2") if a["name"] == "run2.log"]
+        assert log["pack"] and store.read(log["hash"]).startswith(b"run 2\n")
+        (shot,) = store.lookup("run2", "tests/test_demo.py::test_login")
+        assert store.locate(shot["hash"])[0] == "loose"
+
+        # Expiring most packed runs rewrites the pack with the survivors
+        assert store.apply_retention(keep_runs=1, keep_failed_runs=4) == 2
+        assert (sources / "run5.log").exists(), "Sources are kept unless remove_sources is set"
+        assert store.stats()["objects"] == 3
+        assert store.read(log["hash"]).startswith(b"run 2\n")
+        with zipfile.ZipFile(store.locate(log["hash"])[1]) as pack:
+            assert pack.namelist() == [log["hash"]]
+
+        store.close()
+        print(f"✅ {stats['artifacts']} artifacts in {stats['objects']} objects, {stats['packs']} pack")
+
+    def test_lookup_stays_fast_with_history(self, tmp_path):
+        """Test that run/test lookups are indexed as history grows"""
+        print("\n⏱️ Testing artifact lookups at scale...")
+
+        store = ArtifactStore(tmp_path / "store")
+        connection = store.connection()
+        connection.execute("BEGIN")
+        connection.execute("INSERT INTO objects (hash, size) VALUES (?, 1)", ("0" * 64,))
+        connection.executemany("INSERT INTO runs (id, run_uid, created) VALUES (?, ?, 0)",
+                               [(i, f"run{i}") for i in range(1, 5001)])
+        connection.executemany(
+            "INSERT INTO artifacts (run_id, nodeid, name, hash) VALUES (?, ?, 'shot.png', ?)",
+            [(run, f"tests/test_app.py::test_{test}", "0" * 64) for run in range(1, 5001) for test in range(20)],
+        )
+        connection.execute("COMMIT")
+
+        start = time.perf_counter()
+        for run in range(1, 5001, 50):
+            assert len(store.lookup(f"run{run}", "tests/test_app.py::test_7")) == 1
+        elapsed = (time.perf_counter() - start) / 100
+
+        plan = " ".join(row[3] for row in connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM artifacts WHERE run_id = 1 AND nodeid = 'x'"))
+        assert "idx_artifacts_run_test" in plan
+        assert elapsed < 0.005, f"Lookup took {elapsed * 1000:.2f}ms"
+        store.close()
+        print(f"✅ Lookup among 100,000 artifacts: {elapsed * 1000:.3f}ms")
+
+    def test_sessions_without_artifacts_leave_no_run(self, tmp_path):
+        """Test that only sessions that stored something create a run and expire old ones"""
+        print("\n🧹 Testing empty artifact sessions...")
+
+        store_dir = tmp_path / "store"
+        sources = tmp_path / "reports"
+        sources.mkdir()
+        self.record_runs(ArtifactStore(store_dir), sources, runs=3)
+        no_reports = SimpleNamespace(option=SimpleNamespace(htmlpath=None, compact_report=None, log_file=None))
+
+        empty = RunArtifacts(ArtifactStore(store_dir), "empty")
+        empty.handle({"event": "test", "nodeid": "t::a", "artifacts": []})
+        empty.handle({"event": "session_finish", "exit_code": 0})
+        empty.pytest_unconfigure(no_reports)
+        assert [run["run_uid"] for run in ArtifactStore(store_dir).runs()] == ["run2", "run1", "run0"]
+
+        # Report paths come from config.option, which includes pytest.ini addopts
+        report = sources / "report.html"
+        report.write_text("<html></html>")
+        with_report = SimpleNamespace(option=SimpleNamespace(htmlpath=str(report), compact_report=None,
+                                                             log_file=None))
+        RunArtifacts(ArtifactStore(store_dir), "real").pytest_unconfigure(with_report)
+        store = ArtifactStore(store_dir)
+        assert store.runs()[0]["run_uid"] == "real"
+        assert [a["name"] for a in store.lookup("real")] == ["report.html"]
+        store.close()
+
+        print("✅ Empty sessions skipped, report stored from the options")
+
+
+@pytest.mark.framework
+class TestLiveProgress:
+    """Test the SSE progress broker behind /api/runs/stream"""
+
+    def test_slow_subscriber_stays_bounded_and_consistent(self):
+        """Test bounded subscriber queues and snapshot-carrying messages"""
+        print("\n📡 Testing live progress broker...")
+
+        async def scenario():
+            broker = ProgressBroker(queue_size=5)
+            broker.bind(asyncio.get_running_loop())
+            stream = broker.sse_stream()
+            assert (await stream.__anext__()).startswith(b"event: snapshot")
+            assert broker.subscriber_count == 1
+
+            broker.start_run("run-1", label="login")
+            broker.publish_threadsafe("run-1", {"event": "collected", "count": 40})
+            for i in range(40):
+                nodeid = f"tests/test_login.py::test_{i}"
+                broker.publish_threadsafe("run-1", {"event": "test_start", "nodeid": nodeid, "ts": 0})
+                broker.publish_threadsafe("run-1", {
+                    "event": "test", "nodeid": nodeid, "worker": "gw0",
+                    "outcome": "failed" if i % 10 == 0 else "passed", "duration": 0.1,
+                })
+            broker.publish_threadsafe("run-1", {"event": "run_finished", "exit_code": 1})
+            await asyncio.sleep(0)
+
+            messages = [await stream.__anext__() for _ in range(5)]
+            last = json.loads(messages[-1].decode().split("data: ", 1)[1])
+            await stream.aclose()
+            return broker, last
+
+        broker, last = asyncio.run(scenario())
+        assert broker.dropped == 78, "Only the newest 5 of 83 messages should be queued"
+        assert last["progress"]["status"] == "finished"
+        assert last["progress"]["counts"] == {"failed": 4, "passed": 36}
+        assert last["progress"]["completed"] == last["progress"]["collected"] == 40
+        assert broker.subscriber_count == 0
+
+        print(f"✅ Slow subscriber kept 5 messages, dropped {broker.dropped}, counters intact")
+
+
+@pytest.mark.framework
+class TestJobScheduler:
+    """Test the dashboard's bounded run queue"""
+
+    def test_limit_priority_coalescing_and_cancel(self):
+        """Test concurrency limit, priority order, dedup and queued cancellation"""
+        print("\n📋 Testing job scheduler...")
+
+        release = threading.Event()
+        order = []
+
+        def execute(job):
+            order.append(job.kind)
+            release.wait(5)
+            return {"kind": job.kind}
+
+        async def scenario():
+            scheduler = JobScheduler(execute, max_running=1, max_queued=3)
+            first, _ = scheduler.submit("all")
+            login, _ = scheduler.submit("login")
+            again, coalesced = scheduler.submit("login")
+            assert coalesced and again is login and login.requests == 2
+            demo, _ = scheduler.submit("demo", priority=5)
+            reset, _ = scheduler.submit("reset")
+            assert first.state == "running"
+            assert scheduler.position(demo) == 1, "Higher priority runs first"
+
+            with pytest.raises(QueueFullError):
+                scheduler.submit("smoke")
+
+            assert scheduler.cancel(reset.id).state == "cancelled"
+            release.set()
+            while any(not job.done for job in (first, login, demo)):
+                await asyncio.sleep(0.01)
+            return scheduler, first
+
+        scheduler, first = asyncio.run(scenario())
+        assert order == ["all", "demo", "login"]
+        assert first.result == {"kind": "all"}
+        assert scheduler.status()["running"] == 0
+
+        print(f"✅ Executed in order: {order}")
+
+    def test_late_cancel_reports_the_real_outcome(self, tmp_path):
+        """Test that a job is cancelled only if its run was actually stopped"""
+        print("\n⏭️ Testing cancels around the start of a run...")
+
+        runner = WarmRunner(preload=["pytest", "utilities.runner"])
+        assert not runner.cancel("early"), "Not running yet"
+        result = runner.run(["-q", "-p", "no:cacheprovider", str(tmp_path)], run_id="early")
+        assert result.cancelled and not result.tests, "Cancelled before forking"
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def execute(job):
+            started.set()
+            release.wait(5)
+            return {"cancelled": False}
+
+        async def scenario():
+            scheduler = JobScheduler(execute, cancel_running=lambda job: False)
+            job, _ = scheduler.submit("all")
+            await asyncio.to_thread(started.wait, 5)
+            scheduler.cancel(job.id)
+            release.set()
+            while not job.done:
+                await asyncio.sleep(0.01)
+            return job
+
+        assert asyncio.run(scenario()).state == "finished", "The run completed, so it was not cancelled"
+        print("✅ Early cancel skipped the fork; a late one left the run finished")
+
+    @pytest.mark.skipif(not hasattr(os, "killpg"), reason="process groups need POSIX")
+    def test_cancel_kills_process_tree(self, tmp_path):
+        """Test that cancelling a warm run also stops processes it started"""
+        print("\n🛑 Testing run cancellation...")
+
+        pid_file = tmp_path / "grandchild.pid"
+        (tmp_path / "test_spawns_process.py").write_text(
+            "import subprocess, sys, time\n"
+            "def test_spawns():\n"
+            "    child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            f"    open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+            "    time.sleep(60)\n"
+        )
+        runner = WarmRunner(preload=["pytest", "utilities.runner"])
+        runner.start()
+        threading.Thread(target=lambda: (
+            [time.sleep(0.1) for _ in range(100) if not pid_file.exists()],
+            runner.cancel("cancel-me", grace=1.0)
+        ), daemon=True).start()
+
+        result = runner.run(["-q", "-p", "no:cacheprovider", str(tmp_path)], run_id="cancel-me")
+        assert result.cancelled and not result.success
+
+        grandchild = int(pid_file.read_text())
+        for _ in range(50):
+            try:
+                os.kill(grandchild, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("Grandchild process survived cancellation")
+
+        print(f"✅ Run cancelled: exit code {result.exit_code}")
+
+
+@pytest.mark.framework
+class TestResultsStore:
+    """Test the SQLite results history"""
+
+    @staticmethod
+    def record_run(store, run_uid, outcomes):
+        recorder = RunRecorder(store, run_uid, browser="chrome", batch_size=2)
+        recorder.handle({"event": "session_start", "ts": time.time(), "args": []})
+        for nodeid, outcome, duration in outcomes:
+            recorder.handle({"event": "test", "nodeid": nodeid, "outcome": outcome,
+                             "duration": duration, "worker": "gw0", "artifacts": []})
+        recorder.handle({"event": "session_finish", "exit_code": 0})
+
+    def test_history_queries(self, tmp_path):
+        """Test history, slowest, failure-rate and diff queries"""
+        print("\n🗄️ Testing results store...")
+
+        store = ResultsStore(tmp_path / "results.db")
+        self.record_run(store, "run1", [
+            ("t::login", "passed", 1.0), ("t::search", "passed", 0.2), ("t::old", "passed", 0.1),
+        ])
+        self.record_run(store, "run2", [
+            ("t::login", "rerun", 1.0), ("t::login", "failed", 2.0),
+            ("t::search", "passed", 0.2), ("t::new", "skipped", 0.0),
+        ])
+
+        runs = store.recent_runs()
+        assert [run["run_uid"] for run in runs] == ["run2", "run1"]
+        assert (runs[0]["total"], runs[0]["failed"], runs[0]["skipped"]) == (3, 1, 1)
+
+        history = store.test_history("t::login")
+        assert [(row["run_uid"], row["outcome"], row["retries"]) for row in history] == [
+            ("run2", "failed", 1), ("run1", "passed", 0)
+        ]
+        assert store.slowest_tests()[0] == {
+            "nodeid": "t::login", "samples": 2, "avg_duration": 1.5, "max_duration": 2.0
+        }
+        rates = store.failure_rates()
+        assert [(row["nodeid"], row["failure_rate"]) for row in rates] == [("t::login", 0.5)]
+
+        changes = store.diff_runs()["changes"]
+        assert changes["new_failures"] == ["t::login"]
+        assert changes["added"] == ["t::new"] and changes["removed"] == ["t::old"]
+        assert changes["slower"][0]["nodeid"] == "t::login"
+
+        store.close()
+        print(f"✅ {len(runs)} runs recorded, diff: {changes['new_failures']}")
+
+    def test_queries_stay_fast_with_history(self, tmp_path):
+        """Test that indexed queries stay fast over a long history"""
+        print("\n⏱️ Testing results store at scale...")
+
+        store = ResultsStore(tmp_path / "results.db")
+        nodeids = [f"tests/test_app.py::test_case_{i}" for i in range(40)]
+        for run in range(500):
+            run_id = store.start_run(f"run{run}")
+            store.add_results(run_id, [
+                {"nodeid": nodeid, "outcome": "failed" if (run + i) % 17 == 0 else "passed",
+                 "duration": 0.01 * i}
+                for i, nodeid in enumerate(nodeids)
+            ])
+
+        start = time.perf_counter()
+        assert len(store.test_history(nodeids[5], limit=50)) == 50
+        assert len(store.slowest_tests(runs=20)) == 10
+        assert store.failure_rates(runs=20)
+        assert store.diff_runs()["head"] == "run499"
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0, f"History queries took {elapsed:.3f}s"
+        store.close()
+        print(f"✅ 20,000 results queried in {elapsed * 1000:.1f}ms")
+
+    def test_schema_migrations(self, tmp_path):
+        """Test that older databases are migrated in place and newer ones refused"""
+        print("\n🧱 Testing results store migrations...")
+
+        import sqlite3
+        path = tmp_path / "results.db"
+        connection = sqlite3.connect(path)
+        connection.executescript(MIGRATIONS[0] + "PRAGMA user_version = 1;")
+        connection.execute("INSERT INTO runs (run_uid, started) VALUES ('old-run', 0)")
+        connection.commit()
+        connection.close()
+
+        store = ResultsStore(path)
+        connection = store.connection()
+        assert connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert {"page_metrics", "test_phases"} <= tables
+        assert [run["run_uid"] for run in store.recent_runs()] == ["old-run"], "Existing rows are kept"
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+        store.close()
+
+        with pytest.raises(SchemaVersionError):
+            ResultsStore(path)
+        print(f"✅ Migrated 1 -> {SCHEMA_VERSION}")
+
+
+@pytest.mark.framework
+class TestPageMetrics:
+    """Test page timing capture, budgets and their storage"""
+
+    class FakeDriver:
+        """Answers the timing script and CDP commands like Chrome would"""
+
+        def __init__(self):
+            self.origin = 1000.0
+            self.script_seconds = 0.0
+
+        def execute_script(self, script):
+            return {
+                "origin": self.origin,
+                "url": "https://www.saucedemo.com/",
+                "navigation": {"ttfb": 120.5, "dom_interactive": 300.0, "dom_content_loaded": 410.25,
+                               "load": 0, "transfer_size": 4096},
+                "first_paint": 350.0,
+                "first_contentful_paint": 351.5,
+            }
+
+        def execute_cdp_cmd(self, command, params):
+            if command == "Performance.enable":
+                return {}
+            return {"metrics": [
+                {"name": "ScriptDuration", "value": self.script_seconds},
+                {"name": "Nodes", "value": 120},
+                {"name": "Frames", "value": 1},
+            ]}
+
+    SUITE = '''
+from utilities.page_metrics import record_sample
+
+def sample(value):
+    record_sample({"page": "LoginPage", "action": "navigate", "url": "", "ts": 0,
+                   "metrics": {"dom_content_loaded": value}})
+
+def test_within_budget():
+    sample(500)
+
+def test_over_budget():
+    sample(1200)
+
+def test_failing_over_budget():
+    sample(1300)
+    assert False, "functional failure"
+
+def test_without_samples():
+    pass
+'''
+
+    def test_samples_new_documents_and_cdp_deltas(self):
+        """Test that navigation timings are read once per document and CDP durations as deltas"""
+        print("\n⏱️ Testing page metric sampling...")
+
+        driver = self.FakeDriver()
+        metrics = PageMetrics(driver)
+        driver.script_seconds = 0.25
+        first = metrics.sample("LoginPage", "navigate")
+        driver.script_seconds = 0.4
+        second = metrics.sample("LoginPage", "login")
+
+        assert first["metrics"]["dom_content_loaded"] == 410.25
+        assert first["metrics"]["first_contentful_paint"] == 351.5
+        assert first["metrics"]["script_ms"] == 250.0 and first["metrics"]["dom_nodes"] == 120
+        assert "dom_content_loaded" not in second["metrics"], "Same document: no navigation timings"
+        assert second["metrics"]["script_ms"] == 150.0, "CDP durations are reported since the last sample"
+
+        driver.origin = 2000.0
+        assert "dom_content_loaded" in metrics.sample("InventoryPage", "navigate")["metrics"]
+
+        budgets = {"LoginPage": {"navigate": {"dom_content_loaded": 400, "ttfb": 600}}}
+        assert check_budgets([first, second], budgets) == [
+            "LoginPage navigate: dom_content_loaded 410.25 exceeds budget 400"
+        ]
+        print(f"✅ Sampled: {first['metrics']}")
+
+    def test_budgets_fail_tests_and_metrics_reach_history(self, tmp_path):
+        """Test that exceeded budgets fail passing tests and samples are stored"""
+        print("\n📏 Testing performance budgets...")
+
+        (tmp_path / "test_budgets_sample.py").write_text(self.SUITE)
+        plugin = PageMetricsPlugin({"LoginPage": {"navigate": {"dom_content_loaded": 800}}})
+        store = ResultsStore(tmp_path / "results.db")
+        recorder = RunRecorder(store, "perf-run")
+        result = run_pytest(["-q", "-p", "no:cacheprovider", str(tmp_path)],
+                            on_event=recorder.handle, plugins=[plugin])
+
+        outcomes = {t.nodeid.split("::")[-1]: t for t in result.tests}
+        assert outcomes["test_within_budget"].outcome == "passed"
+        assert outcomes["test_without_samples"].outcome == "passed"
+        assert outcomes["test_over_budget"].outcome == "failed"
+        assert "dom_content_loaded 1200 exceeds budget 800" in outcomes["test_over_budget"].longrepr
+        assert "functional failure" in outcomes["test_failing_over_budget"].longrepr
+        assert outcomes["test_within_budget"].metrics[0]["metrics"] == {"dom_content_loaded": 500}
+
+        summary = store.page_metrics()
+        assert summary == [{"page": "LoginPage", "action": "navigate", "metric": "dom_content_loaded",
+                            "samples": 3, "avg_value": 1000.0, "max_value": 1300.0}]
+        history = store.page_metric_history("LoginPage", "navigate", "dom_content_loaded")
+        assert [row["run_uid"] for row in history] == ["perf-run"]
+        store.close()
+        print(f"✅ Budget failures: {[name for name, t in outcomes.items() if t.outcome == 'failed']}")
+
+
+@pytest.mark.framework
+class TestLoadRunner:
+    """Test the virtual-user load runner against the stand-in app"""
+
+    @staticmethod
+    def load_runner():
+        pytest.importorskip("numpy")
+        from utilities import load_runner
+        return load_runner
+
+    def test_histogram_percentiles_and_schedule(self):
+        """Test histogram accuracy, merging and ramp schedules"""
+        print("\n📈 Testing latency histograms...")
+
+        load_runner = self.load_runner()
+        import numpy as np
+
+        latencies = np.random.default_rng(7).lognormal(mean=3.0, sigma=0.8, size=20000)
+        histogram = load_runner.LatencyHistogram()
+        half = load_runner.LatencyHistogram()
+        histogram.record_many(latencies)
+        for value in latencies[:100]:
+            half.record(value)
+        half.record_many(latencies[100:])
+        assert np.array_equal(histogram.counts, half.counts), "Scalar and vectorized recording should agree"
+
+        for percent in (50, 95, 99):
+            exact = np.percentile(latencies, percent)
+            assert abs(histogram.percentile(percent) - exact) / exact < 0.03
+        merged = load_runner.LatencyHistogram().merge(histogram).merge(half)
+        assert merged.count == 40000 and merged.max_ms == histogram.max_ms
+
+        windows, total = load_runner.user_windows(load_runner.parse_stages("4:2,4:4,2:2"))
+        assert total == 8.0
+        assert [start for start, _ in windows] == [0.0, 0.5, 1.0, 1.5]
+        assert [stop for _, stop in windows] == [8.0, 8.0, 8.0, 7.0], "Newest users stop first"
+        assert sum(load_runner.is_browser_user(i, 10, 3) for i in range(10)) == 3
+        print(f"✅ p50/p95/p99: {[round(histogram.percentile(p), 1) for p in (50, 95, 99)]} ms")
+
+    def test_protocol_users_load_stand_in_server(self):
+        """Test concurrent protocol users, slow users and failed logins"""
+        print("\n🏋️ Testing virtual users against the stand-in app...")
+
+        load_runner = self.load_runner()
+        server = load_runner.StandInServer(slow_delay=0.2)
+        base_url = server.start()
+        credentials = {
+            0: ("standard_user", "secret_sauce"),
+            1: ("performance_glitch_user", "secret_sauce"),
+            2: ("standard_user", "wrong"),
+        }
+        try:
+            runner = load_runner.LoadRunner(
+                lambda index: load_runner.ProtocolUser(index, credentials[index % 3], base_url),
+                [(6, 0.2), (6, 1.0)], think_time=(0.0, 0.01), seed=1,
+            )
+            report = runner.run()
+        finally:
+            server.stop()
+
+        summary = report.to_dict()
+        steps = summary["steps"]
+        assert summary["users"] == {"protocol": 6}
+        assert steps["open"]["count"] == summary["iterations"] and steps["open"]["errors"] == 0
+        assert summary["errors"]["login"] == {"StepFailed": steps["login"]["errors"]}
+        assert steps["login"]["errors"] > 0, "Wrong password should fail the login step"
+        assert steps["login"]["p99_ms"] >= 200, "performance_glitch_user logins are slow"
+        assert steps["open"]["p50_ms"] <= steps["open"]["p95_ms"] <= steps["open"]["p99_ms"]
+        assert server.requests >= 2 * summary["iterations"]
+        print(f"✅ {summary['iterations']} iterations, {summary['iterations_per_s']}/s: {steps['login']}")
+
+
+@pytest.mark.framework
+class TestBasePageBenchmark:
+    """Test the BasePage micro-benchmark fixtures, statistics and baseline comparison"""
+
+    def test_fixture_pages_are_served_by_size(self):
+        """Test that generated fixture pages hold the requested number of elements"""
+        print("\n🧱 Testing benchmark fixture pages...")
+
+        import urllib.request
+        base_url = start_fixture_server()
+        with urllib.request.urlopen(f"{base_url}/fixture?size=1000") as response:
+            html = response.read().decode()
+
+        assert html == fixture_page(1000)
+        assert html.count('<li class="item"') == 1000
+        for element_id in ("target-input", "target-button", "target-text", "disabled-button", "hidden-text"):
+            assert f'id="{element_id}"' in html
+        print(f"✅ 1000-element fixture: {len(html)} bytes")
+
+    def test_statistics_and_baseline_comparison(self):
+        """Test run statistics and regression detection against a baseline"""
+        print("\n📐 Testing benchmark comparison...")
+
+        stats = summarize([[1.0, 2.0, 3.0], [2.0, 4.0, 6.0], [1.5, 1.5, 9.0]])
+        assert stats == {"median_ms": 2.0, "p95_ms": 9.0, "run_spread_ms": 2.5, "min_ms": 1.0, "calls": 9}
+
+        baseline = {
+            "find_element|explicit|100": {"median_ms": 4.0},
+            "get_text|explicit|100": {"median_ms": 0.5},
+            "click_element|explicit|100": {"median_ms": 20.0},
+        }
+        current = {
+            "find_element|explicit|100": {"median_ms": 6.0},    # +50% and +2ms
+            "get_text|explicit|100": {"median_ms": 0.9},        # +80% but under 1ms
+            "click_element|explicit|100": {"median_ms": 10.0},  # halved
+            "enter_text|explicit|100": {"median_ms": 8.0},      # not in the baseline
+        }
+        statuses = {key: status for key, _, _, status in compare_results(baseline, current)}
+        assert statuses == {
+            "find_element|explicit|100": "regressed",
+            "get_text|explicit|100": "ok",
+            "click_element|explicit|100": "improved",
+            "enter_text|explicit|100": "new",
+        }
+        print(f"✅ Comparison: {statuses}")
+
+
+@pytest.mark.framework
+class TestExecutionStrategies:
+    """Test the browser pool behind the pooled/tabs strategies and the suite benchmark"""
+
+    class FakeDriver:
+        """Records the calls a pool makes on a WebDriver session"""
+
+        def __init__(self, broken=False):
+            self.calls = []
+            self.handles = ["main"]
+            self.broken = broken
+            self.switch_to = self
+
+        def execute_script(self, script):
+            self.calls.append("clear_storage")
+
+        def delete_all_cookies(self):
+            if self.broken:
+                raise RuntimeError("session lost")
+            self.calls.append("delete_cookies")
+
+        def get(self, url):
+            self.calls.append(f"get {url}")
+
+        def new_window(self, kind):
+            self.handles.append(f"{kind}{len(self.handles)}")
+            self.calls.append(f"new_{kind}")
+
+        def close(self):
+            self.calls.append(f"close {self.handles.pop()}")
+
+        @property
+        def window_handles(self):
+            return list(self.handles)
+
+        def window(self, handle):
+            self.calls.append(f"switch {handle}")
+
+        def quit(self):
+            self.calls.append("quit")
+
+    def test_pool_reuses_resets_and_discards_sessions(self):
+        """Test pooled reuse, tab-per-test and discarding sessions that fail to reset"""
+        print("\n♻️ Testing browser pool...")
+
+        pool = DriverPool(1, factory=self.FakeDriver)
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is first and pool.created == 1, "Released session should be reused"
+        assert first.calls == ["clear_storage", "delete_cookies", "get about:blank"]
+
+        second = pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        assert second.calls[-1] == "quit", "Sessions beyond the pool size are quit"
+
+        tabs = DriverPool(1, tabs=True, factory=self.FakeDriver)
+        driver = tabs.acquire()
+        assert driver.calls == ["new_tab"]
+        tabs.release(driver)
+        assert driver.calls[-2:] == ["close tab1", "switch main"] and driver.handles == ["main"]
+        assert tabs.acquire() is driver and driver.calls[-1] == "new_tab"
+
+        broken = DriverPool(1, factory=lambda: self.FakeDriver(broken=True))
+        session = broken.acquire()
+        broken.release(session)
+        assert session.calls[-1] == "quit" and broken.acquire() is not session
+        pool.close()
+        assert first.calls[-1] == "quit"
+        print("✅ Pool reuses, resets and discards sessions")
+
+    def test_suite_benchmark_rows_and_stand_in_errors(self):
+        """Test strategy rows, flake rate and the stand-in app's SauceDemo messages"""
+        print("\n🏁 Testing suite benchmark summaries...")
+
+        runs = [
+            {"elapsed": 30.0, "cpu_seconds": 12.0, "peak_rss_mb": 800.0,
+             "outcomes": {"t::a": "passed", "t::b": "passed", "t::c": "failed", "t::d": "passed"}},
+            {"elapsed": 20.0, "cpu_seconds": 10.0, "peak_rss_mb": 900.0,
+             "outcomes": {"t::a": "passed", "t::b": "failed", "t::c": "failed", "t::d": "passed"}},
+        ]
+        assert flake_rate(runs) == 0.25, "Only t::b changed outcome"
+        row = summarize_strategy("pooled", 2, runs)
+        assert row["tests_per_minute"] == 10.0 and row["cpu_seconds"] == 11.0
+        assert row["peak_rss_mb"] == 900.0 and row["failures"] == 1.5
+
+        pytest.importorskip("numpy")
+        import urllib.parse
+        import urllib.request
+        from utilities.load_runner import StandInServer
+
+        server = StandInServer()
+        base_url = server.start()
+        try:
+            def login(username, password):
+                # The inventory page needs the session cookie set by the login redirect
+                opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor())
+                form = urllib.parse.urlencode({"username": username, "password": password}).encode()
+                with opener.open(base_url + "login", data=form) as response:
+                    return response.url, response.read().decode()
+
+            url, body = login("standard_user", "secret_sauce")
+            assert url.endswith("/inventory.html") and body.count("inventory_item") == 6
+            assert "this user has been locked out" in login("locked_out_user", "secret_sauce")[1]
+            assert "Username is required" in login("", "secret_sauce")[1]
+            assert "Password is required" in login("standard_user", "")[1]
+            assert "Username and password do not match" in login("STANDARD_USER", "secret_sauce")[1]
+        finally:
+            server.stop()
+        print(f"✅ Strategy row: {row}")
+
+
+@pytest.mark.framework
+class TestPhaseTiming:
+    """Test the per-test phase breakdown and its storage"""
+
+    SUITE = '''
+import time
+import pytest
+from utilities.phase_timing import timed
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+@pytest.fixture
+def browser():
+    with timed("browser_launch"):
+        busy(0.05)
+    yield
+    time.sleep(0.02)
+
+def test_sleeps_and_navigation(browser):
+    with timed("navigation"):
+        busy(0.03)
+        time.sleep(0.05)
+    time.sleep(0.1)
+    assert True
+
+def test_plain():
+    pass
+'''
+
+    def test_timer_is_exclusive_and_breakdown_adds_up(self):
+        """Test that nested phases are exclusive and residuals fill the pytest phases"""
+        print("\n🧭 Testing phase timer...")
+
+        timer = PhaseTimer()
+        assert not timer.active
+        timer.start()
+        with timer.phase("interactions"):
+            time.sleep(0.02)
+            with timer.phase("explicit_waits"):
+                time.sleep(0.05)
+        totals = timer.stop()
+        assert not timer.active
+        assert 0.05 <= totals["explicit_waits"] < 0.07
+        assert 0.02 <= totals["interactions"] < 0.04, "The nested wait is not counted twice"
+
+        # Lookups and sleeps polled by a wait belong to the wait
+        timer.start()
+        with timer.phase("explicit_waits"):
+            with timer.phase("interactions"):
+                time.sleep(0.02)
+            with timer.phase("sleeps"):
+                time.sleep(0.02)
+        assert set(timer.stop()) == {"explicit_waits"}
+
+        result = breakdown({"call": {"navigation": 0.5}, "setup": {"browser_launch": 1.0}},
+                           {"setup": 1.25, "call": 2.0, "teardown": 0.1})
+        assert result == {"navigation": 0.5, "test_body": 1.5, "browser_launch": 1.0,
+                          "setup": 0.25, "teardown": 0.1}
+        assert sum(result.values()) == pytest.approx(3.35)
+
+        lines = format_suite_summary({"tests/test_login.py": {"browser_launch": 3.0, "test_body": 1.0}})
+        assert "browser_laun" in lines[0] and "75%" in lines[1]
+        print("✅ " + lines[1])
+
+    def test_breakdown_reaches_results_and_history(self, tmp_path):
+        """Test that sleeps and instrumented phases are attached to each test and stored"""
+        print("\n🗂️ Testing phase breakdown in results...")
+
+        (tmp_path / "test_phases_sample.py").write_text(self.SUITE)
+        store = ResultsStore(tmp_path / "results.db")
+        recorder = RunRecorder(store, "phase-run")
+        plugin = PhaseTimingPlugin()
+        result = run_pytest(["-q", "-p", "no:cacheprovider", str(tmp_path)],
+                            on_event=recorder.handle, plugins=[plugin])
+
+        assert result.success
+        tests = {t.nodeid.split("::")[-1]: t for t in result.tests}
+        timed_test = tests["test_sleeps_and_navigation"].breakdown
+        assert 0.05 <= timed_test["browser_launch"] < 0.1
+        assert 0.08 <= timed_test["navigation"] < 0.1, "A sleep inside navigation is part of it"
+        assert 0.12 <= timed_test["sleeps"] < 0.15, "Test body and teardown sleeps"
+        assert sum(timed_test.values()) == pytest.approx(tests["test_sleeps_and_navigation"].duration, abs=0.01)
+        assert "sleeps" not in tests["test_plain"].breakdown
+        assert set(plugin.suites) == {"test_phases_sample.py"}
+
+        phases = {row["phase"]: row for row in store.phase_breakdown()}
+        assert phases["sleeps"]["samples"] == 1 and phases["sleeps"]["total_seconds"] >= 0.12
+        assert {row["phase"] for row in store.phase_breakdown(
+            nodeid=tests["test_plain"].nodeid)} <= {"setup", "test_body", "teardown"}
+        store.close()
+        print(f"✅ Breakdown: {timed_test}")
+
+
+@pytest.mark.framework
+class TestCommandTrace:
+    """Test the WebDriver command tracer, its summaries and trace files"""
+
+    class FakeExecutor:
+        """Answers commands like RemoteConnection.execute"""
+
+        def execute(self, command, params):
+            if command == "findElement" and params["value"] == "#missing":
+                return {"status": 404, "value": {"error": "no such element"}}
+            return {"value": {"element-6066": "abc"} if command == "findElement" else None}
+
+    class FakeDriver:
+        def __init__(self, executor):
+            self.command_executor = executor
+
+    SUITE = '''
+import pytest
+from utilities.command_trace import trace_driver
+
+class Executor:
+    def execute(self, command, params):
+        return {"value": "text" if command == "getElementText" else None}
+
+class Driver:
+    command_executor = Executor()
+
+@pytest.fixture
+def driver():
+    session = trace_driver(Driver())
+    yield session
+    session.command_executor.execute("quit", None)
+
+def test_reads_text(driver):
+    for _ in range(3):
+        driver.command_executor.execute("getElementText", {"id": "e1"})
+
+def test_without_driver():
+    pass
+'''
+
+    def test_ring_buffer_stats_and_trace_file(self, tmp_path):
+        """Test per-test statistics, dropping old commands and reading the trace back"""
+        print("\n📡 Testing command tracer...")
+
+        tracer = CommandTracer(size=3)
+        driver = trace_driver(self.FakeDriver(self.FakeExecutor()), tracer)
+        assert trace_driver(driver, tracer) is driver, "Sessions are wrapped once"
+        for selector in ("#login", "#missing", "#login", "#login"):
+            driver.command_executor.execute("findElement", {"using": "css selector", "value": selector})
+        tracer.record("elementClick", 12.5, 2, 4, True, test_id="t::b")
+
+        assert tracer.recorded == 5 and len(tracer.buffer) == 3 and tracer.dropped == 2
+        stats = tracer.take_test(events.current_test_id())
+        assert len(stats["commands"]["findElement"]) == 4, "Statistics survive the buffer wrapping"
+        assert stats["errors"] == 1 and stats["sent"] > 0 and stats["received"] > 0
+        assert tracer.take_test(events.current_test_id()) is None
+
+        path = tracer.write(tmp_path / "trace.jsonl.gz", run="r1")
+        records = list(iter_trace(path))
+        assert [r["command"] for r in records] == ["findElement", "findElement", "elementClick"]
+        assert records[-1]["test"] == "t::b" and records[-1]["duration_ms"] == 12.5 and records[-1]["ok"]
+
+        summary = CommandStats()
+        for record in records:
+            summary.add_record(record)
+        rows = {row["command"]: row for row in summary.per_command()}
+        assert rows["elementClick"]["p99_ms"] == 12.5 and rows["findElement"]["count"] == 2
+        assert summary.per_test()[0]["test"] == "t::b"
+        print(f"✅ Trace: {len(records)} commands, {tracer.dropped} dropped")
+
+    def test_plugin_attaches_commands_and_writes_trace(self, tmp_path):
+        """Test that each test's commands reach its report and the run summary"""
+        print("\n🧾 Testing command trace plugin...")
+
+        (tmp_path / "test_trace_sample.py").write_text(self.SUITE)
+        # The sample suite wraps its driver with the process-wide tracer
+        plugin = CommandTracePlugin(trace_dir=tmp_path / "traces")
+        reports = []
+
+        class Capture:
+            def pytest_runtest_logreport(self, report):
+                if report.when == "teardown":
+                    reports.append(report)
+
+        result = run_pytest(["-q", "-p", "no:cacheprovider", str(tmp_path / "test_trace_sample.py")],
+                            plugins=[plugin, Capture()])
+
+        assert result.success
+        properties = {r.nodeid.split("::")[-1]: dict(r.user_properties) for r in reports}
+        traced = properties["test_reads_text"]["command_trace"]
+        assert len(traced["commands"]["getElementText"]) == 3 and "quit" in traced["commands"]
+        assert "command_trace" not in properties["test_without_driver"]
+
+        rows = {row["command"]: row for row in plugin.stats.per_command()}
+        assert rows["getElementText"]["count"] == 3 and rows["quit"]["count"] == 1
+        trace_files = list((tmp_path / "traces").glob("commands_*.jsonl.gz"))
+        assert len(trace_files) == 1 and len(list(iter_trace(trace_files[0]))) == 4
+        print(f"✅ Commands per test: {plugin.stats.per_test()}")
@@ -1,16 +1,10 @@
 import pytest
 import time
-import sys
-import os
-from selenium.webdriver.common.by import By
+from pages.locators import By
 import time
 
-# Add project root to Python path
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
-
-from utilities.data_reader import TestDataReader
+from utilities.combinatorial import combinatorial
+from utilities.data_reader import TestDataReader, data_driven
 from utilities.logger import get_logger
 
 logger = get_logger("LoginTests")
@@ -80,11 +74,7 @@ class TestLoginFunctionality:
         print("✅ Valid login test completed")
         logger.log_info("test_valid_login PASSED")
     
-    @pytest.mark.parametrize("test_case", [
-        {"username": "wrong@test.com", "password": "wrong", "expected": "invalid"},
-        {"username": "", "password": "test123", "expected": "required"},
-        {"username": "test@test.com", "password": "", "expected": "required"},
-    ])
+    @data_driven(source="invalid_logins.csv", argname="test_case", id_field="case")
     def test_invalid_login(self, login_page, test_case):
         """Test various invalid login scenarios"""
         print(f"Testing invalid login: {test_case['username']}")
@@ -103,6 +93,32 @@ class TestLoginFunctionality:
         assert error_msg is not None, "Error message should be displayed"
         print(f"✅ Invalid login test passed for {test_case['username']}")
     
+    @combinatorial({
+        "username": list(TestDataReader.get_user_accounts()),
+        "password": ["secret_sauce", "wrong_password", ""],
+        "username_case": ["lower", "upper"],
+    }, name="test_login_user_matrix")
+    def test_login_user_matrix(self, login_page, username, password, username_case):
+        """Test login across user types, passwords and username casing"""
+        entered_username = username.upper() if username_case == "upper" else username
+        print(f"Testing login matrix: {entered_username!r} / {password!r}")
+        
+        login_page.login(entered_username, password)
+        
+        # Usernames are case-sensitive and the locked account never logs in
+        should_succeed = (
+            password == "secret_sauce"
+            and username_case == "lower"
+            and username != "locked_out_user"
+        )
+        
+        if should_succeed:
+            time.sleep(2)
+            assert "inventory" in login_page.driver.current_url, f"{username} should log in"
+        else:
+            assert login_page.get_error_message() is not None, "Error message should be displayed"
+        print(f"✅ Login matrix case passed for {entered_username!r}")
+    
     def test_password_masking(self, login_page):
         """Test that password field masks input"""
         print("Testing password masking...")
@@ -1,12 +1,5 @@
 import pytest
 import time
-import sys
-import os
-
-# Add project root to Python path
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
 
 from utilities.data_reader import TestDataReader
 from utilities.logger import get_logger
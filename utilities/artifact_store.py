@@ -0,0 +1,461 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import zipfile
+from pathlib import Path
+from utilities.config import Config
+from utilities.logger import get_logger
+
+# ============================================================
+# Artifact store
+# ============================================================
+# Screenshots, logs and reports are copied into a content-addressed
+# store when a run finishes with them:
+#
+#   objects/ab/abcdef...   one file per distinct content (SHA-256), so a
+#                          screenshot or report repeated across runs is
+#                          stored once
+#   packs/pack-*.zip       objects of older runs, compacted into
+#                          compressed archives (members named by hash)
+#   index.db               SQLite: runs, objects (loose or which pack) and
+#                          artifacts (run, test, name -> hash)
+#
+# Looking up a run's or test's artifacts is one indexed query, and an
+# object's location is one row, so the cost does not grow with history.
+#
+# Retention keeps the newest keep_runs runs plus failed runs up to the
+# newest keep_failed_runs. Expired runs lose their index rows, their
+# unchanged source files in reports/ and any object nothing else uses.
+# Originals are copied, never hard-linked: tests rewrite files such as
+# reports/login_page.png in place, which would corrupt a shared inode.
+
+logger = get_logger("ArtifactStore")
+
+CHUNK_SIZE = 1024 * 1024
+# Already-compressed formats are stored as-is inside packs
+STORED_SUFFIXES = (".png", ".jpg", ".jpeg", ".gz", ".zip")
+# Rewrite a pack once this share of its members is no longer referenced
+REPACK_DEAD_RATIO = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_uid TEXT NOT NULL UNIQUE,
+    created REAL NOT NULL,
+    failed INTEGER NOT NULL DEFAULT 0,
+    packed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS objects (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    pack TEXT
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    nodeid TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL,
+    hash TEXT NOT NULL REFERENCES objects(hash),
+    source TEXT,
+    source_mtime_ns INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_run_test ON artifacts(run_id, nodeid);
+CREATE INDEX IF NOT EXISTS idx_artifacts_hash ON artifacts(hash);
+CREATE INDEX IF NOT EXISTS idx_objects_pack ON objects(pack);
+"""
+
+
+def default_store_dir():
+    """Store directory from the artifact_store setting (empty disables it)"""
+    directory = Config.settings().artifact_store
+    if not directory:
+        return None
+    directory = Path(directory)
+    return directory if directory.is_absolute() else Config.BASE_DIR / directory
+
+
+def file_hash(path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """Deduplicating artifact store with retention and pack compaction"""
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory or default_store_dir())
+        self.objects_dir = self.directory / "objects"
+        self.packs_dir = self.directory / "packs"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.packs_dir.mkdir(exist_ok=True)
+        self.connection().executescript(SCHEMA)
+
+    def connection(self):
+        """One connection per thread (sqlite3 objects are not shareable)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.directory / "index.db", timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def object_path(self, digest):
+        """Path of a loose object"""
+        return self.objects_dir / digest[:2] / digest
+
+    def _unlink_object(self, digest):
+        # The .gz sibling is created when the dashboard serves a text object
+        path = self.object_path(digest)
+        for candidate in (path, path.with_name(f"{digest}.gz")):
+            try:
+                os.unlink(candidate)
+            except FileNotFoundError:
+                pass
+
+    # ------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------
+    def _run_id(self, connection, run_uid):
+        connection.execute(
+            "INSERT OR IGNORE INTO runs (run_uid, created) VALUES (?, ?)", (run_uid, time.time())
+        )
+        return connection.execute("SELECT id FROM runs WHERE run_uid = ?", (run_uid,)).fetchone()[0]
+
+    def add(self, run_uid, path, nodeid="", name=None):
+        """Store a file for a run (and test); return its content hash"""
+        path = Path(path)
+        stat = path.stat()
+        digest = file_hash(path)
+        target = self.object_path(digest)
+
+        with self._lock:
+            connection = self.connection()
+            known = connection.execute("SELECT pack FROM objects WHERE hash = ?", (digest,)).fetchone()
+            if known is None or (known["pack"] is None and not target.exists()):
+                target.parent.mkdir(exist_ok=True)
+                tmp_file = target.with_name(f"{digest}.{os.getpid()}.tmp")
+                shutil.copyfile(path, tmp_file)
+                os.replace(tmp_file, target)
+                connection.execute(
+                    "INSERT OR REPLACE INTO objects (hash, size, pack) VALUES (?, ?, NULL)",
+                    (digest, stat.st_size),
+                )
+            connection.execute(
+                "INSERT INTO artifacts (run_id, nodeid, name, hash, source, source_mtime_ns) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._run_id(connection, run_uid), nodeid, name or path.name, digest,
+                 str(path.resolve()), stat.st_mtime_ns),
+            )
+        return digest
+
+    def finish_run(self, run_uid, failed):
+        """Mark whether a run failed (failed runs are retained longer)"""
+        with self._lock:
+            connection = self.connection()
+            run_id = self._run_id(connection, run_uid)
+            connection.execute("UPDATE runs SET failed = ? WHERE id = ?", (int(bool(failed)), run_id))
+
+    # ------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------
+    def lookup(self, run_uid, nodeid=None):
+        """Artifacts of a run, or of one test in it (indexed lookup)"""
+        sql = (
+            "SELECT artifacts.nodeid, artifacts.name, artifacts.hash, objects.size, objects.pack "
+            "FROM artifacts JOIN objects ON objects.hash = artifacts.hash "
+            "WHERE artifacts.run_id = (SELECT id FROM runs WHERE run_uid = ?)"
+        )
+        params = [run_uid]
+        if nodeid is not None:
+            sql += " AND artifacts.nodeid = ?"
+            params.append(nodeid)
+        return [dict(row) for row in self.connection().execute(sql, params)]
+
+    def locate(self, digest):
+        """Return ("loose", path), ("pack", pack path) or None for a hash"""
+        row = self.connection().execute("SELECT pack FROM objects WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            return None
+        if row["pack"] is None:
+            return "loose", self.object_path(digest)
+        return "pack", self.packs_dir / row["pack"]
+
+    def read(self, digest):
+        """Content of an object, wherever it is stored"""
+        location = self.locate(digest)
+        if location is None:
+            raise KeyError(digest)
+        kind, path = location
+        if kind == "loose":
+            return path.read_bytes()
+        with zipfile.ZipFile(path) as pack:
+            return pack.read(digest)
+
+    def runs(self):
+        return [dict(row) for row in self.connection().execute(
+            "SELECT run_uid, created, failed, packed, "
+            "(SELECT COUNT(*) FROM artifacts WHERE artifacts.run_id = runs.id) AS artifacts "
+            "FROM runs ORDER BY id DESC"
+        )]
+
+    def stats(self):
+        connection = self.connection()
+        objects = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(pack IS NULL), 0) FROM objects"
+        ).fetchone()
+        artifacts = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(objects.size), 0) FROM artifacts "
+            "JOIN objects ON objects.hash = artifacts.hash"
+        ).fetchone()
+        packs = list(self.packs_dir.glob("pack-*.zip"))
+        return {
+            "runs": connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0],
+            "artifacts": artifacts[0],
+            "referenced_bytes": artifacts[1],
+            "objects": objects[0],
+            "object_bytes": objects[1],
+            "loose_objects": objects[2],
+            "packs": len(packs),
+            "pack_bytes": sum(p.stat().st_size for p in packs),
+        }
+
+    # ------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------
+    def apply_retention(self, keep_runs=20, keep_failed_runs=50, remove_sources=False):
+        """
+        Expire runs outside the policy; return the number of runs removed
+
+        Kept: the newest keep_runs runs, and failed runs among the newest
+        keep_failed_runs. With remove_sources, the original files of expired
+        runs are deleted too, but only if they have not changed since they
+        were stored.
+        """
+        with self._lock:
+            connection = self.connection()
+            expired = [row["id"] for row in connection.execute(
+                "SELECT id FROM (SELECT id, failed, ROW_NUMBER() OVER (ORDER BY id DESC) AS age FROM runs) "
+                "WHERE age > ? AND NOT (failed AND age <= ?)",
+                (keep_runs, keep_failed_runs),
+            )]
+            if not expired:
+                return 0
+
+            placeholders = ",".join("?" * len(expired))
+            if remove_sources:
+                self._remove_sources(connection, expired, placeholders)
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(f"DELETE FROM runs WHERE id IN ({placeholders})", expired)
+            connection.execute("COMMIT")
+            self._collect_garbage(connection)
+        logger.log_info("Expired %d runs from the artifact store", len(expired))
+        return len(expired)
+
+    def _remove_sources(self, connection, run_ids, placeholders):
+        # Sources still used by a retained run (same path, same version) stay
+        for row in connection.execute(
+            f"SELECT DISTINCT source, source_mtime_ns FROM artifacts WHERE run_id IN ({placeholders}) "
+            "AND NOT EXISTS (SELECT 1 FROM artifacts AS kept WHERE kept.source = artifacts.source "
+            f"AND kept.source_mtime_ns = artifacts.source_mtime_ns AND kept.run_id NOT IN ({placeholders}))",
+            run_ids + run_ids,
+        ).fetchall():
+            try:
+                if os.stat(row["source"]).st_mtime_ns == row["source_mtime_ns"]:
+                    os.unlink(row["source"])
+                    logger.log_info("Removed expired source %s", row["source"])
+            except OSError:
+                pass
+
+    def _collect_garbage(self, connection):
+        """Delete objects no artifact references; repack mostly-dead packs"""
+        unreferenced = connection.execute(
+            "SELECT hash, pack FROM objects WHERE NOT EXISTS "
+            "(SELECT 1 FROM artifacts WHERE artifacts.hash = objects.hash)"
+        ).fetchall()
+        for row in unreferenced:
+            if row["pack"] is None:
+                self._unlink_object(row["hash"])
+        connection.executemany("DELETE FROM objects WHERE hash = ?", [(row["hash"],) for row in unreferenced])
+
+        for pack in {row["pack"] for row in unreferenced if row["pack"]}:
+            self._repack(connection, pack)
+
+    def _repack(self, connection, pack_name):
+        """Rewrite a pack without its dead members once enough of them are dead"""
+        pack_path = self.packs_dir / pack_name
+        live = {row["hash"] for row in connection.execute("SELECT hash FROM objects WHERE pack = ?", (pack_name,))}
+        if not live:
+            pack_path.unlink(missing_ok=True)
+            return
+        tmp_path = pack_path.with_suffix(".tmp")
+        with zipfile.ZipFile(pack_path) as pack:
+            members = pack.infolist()
+            if 1 - len(live) / len(members) < REPACK_DEAD_RATIO:
+                return
+            with zipfile.ZipFile(tmp_path, "w") as target:
+                for member in members:
+                    if member.filename in live:
+                        target.writestr(member, pack.read(member))
+        os.replace(tmp_path, pack_path)
+
+    # ------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------
+    def compact(self, keep_loose_runs=5):
+        """
+        Move objects used only by runs older than the newest keep_loose_runs
+        into a new compressed pack; return the number of objects packed
+        """
+        with self._lock:
+            connection = self.connection()
+            old_runs = [row["id"] for row in connection.execute(
+                "SELECT id FROM runs WHERE packed = 0 AND id NOT IN "
+                "(SELECT id FROM runs ORDER BY id DESC LIMIT ?)", (keep_loose_runs,)
+            )]
+            if not old_runs:
+                return 0
+            recent = [row["id"] for row in connection.execute(
+                "SELECT id FROM runs ORDER BY id DESC LIMIT ?", (keep_loose_runs,)
+            )] or [0]
+
+            placeholders = ",".join("?" * len(old_runs))
+            recent_placeholders = ",".join("?" * len(recent))
+            candidates = connection.execute(
+                f"SELECT objects.hash, MIN(artifacts.name) AS name FROM objects "
+                f"JOIN artifacts ON artifacts.hash = objects.hash "
+                f"WHERE objects.pack IS NULL AND artifacts.run_id IN ({placeholders}) "
+                f"AND NOT EXISTS (SELECT 1 FROM artifacts AS recent WHERE recent.hash = objects.hash "
+                f"AND recent.run_id IN ({recent_placeholders})) GROUP BY objects.hash",
+                old_runs + recent,
+            ).fetchall()
+            candidates = [(row["hash"], row["name"]) for row in candidates]
+
+            pack_name = None
+            if candidates:
+                pack_name = f"pack-{time.strftime('%Y%m%d_%H%M%S')}-{candidates[0][0][:8]}.zip"
+                pack_path = self.packs_dir / pack_name
+                tmp_path = pack_path.with_suffix(".tmp")
+                with zipfile.ZipFile(tmp_path, "w") as pack:
+                    for digest, name in candidates:
+                        stored = name.lower().endswith(STORED_SUFFIXES)
+                        pack.write(self.object_path(digest), digest,
+                                   zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED)
+                os.replace(tmp_path, pack_path)
+
+            connection.execute("BEGIN IMMEDIATE")
+            if candidates:
+                connection.executemany(
+                    "UPDATE objects SET pack = ? WHERE hash = ?", [(pack_name, digest) for digest, _ in candidates]
+                )
+            connection.execute(f"UPDATE runs SET packed = 1 WHERE id IN ({placeholders})", old_runs)
+            connection.execute("COMMIT")
+
+            # Loose copies go only after the index points at the pack
+            for digest, _ in candidates:
+                self._unlink_object(digest)
+        if candidates:
+            logger.log_info("Packed %d objects from %d runs into %s", len(candidates), len(old_runs), pack_name)
+        return len(candidates)
+
+
+class RunArtifacts:
+    """
+    pytest plugin storing a run's artifacts
+
+    Test artifacts arrive with the collector's "test" events. Reports and
+    logs set by the pytest options are stored at unconfigure, after
+    pytest-html and the compact report have finished writing them, and
+    the retention policy runs last. A session that stored nothing leaves
+    no run behind and expires nothing.
+    """
+
+    def __init__(self, store, run_uid):
+        self.store = store
+        self.run_uid = run_uid
+        self.failed = True  # until a session_finish says otherwise
+        self.stored = 0
+
+    def handle(self, event):
+        kind = event["event"]
+        if kind == "test":
+            for path in event.get("artifacts") or []:
+                self._add(path, event["nodeid"])
+        elif kind == "session_finish":
+            self.failed = event["exit_code"] != 0
+
+    def pytest_unconfigure(self, config):
+        for path in _run_files(config):
+            self._add(path)
+        if not self.stored:
+            self.store.close()
+            return
+        settings = Config.settings()
+        try:
+            self.store.finish_run(self.run_uid, self.failed)
+            self.store.apply_retention(settings.artifact_keep_runs, settings.artifact_keep_failed_runs,
+                                       settings.artifact_remove_sources)
+            self.store.compact(settings.artifact_compact_after)
+        except (OSError, sqlite3.Error) as e:
+            logger.log_error("Artifact retention failed: %s", e)
+        self.store.close()
+
+    def _add(self, path, nodeid=""):
+        try:
+            self.store.add(self.run_uid, path, nodeid)
+            self.stored += 1
+        except FileNotFoundError:
+            pass
+        except (OSError, sqlite3.Error) as e:
+            logger.log_error("Could not store artifact %s: %s", path, e)
+
+
+def _run_files(config):
+    """Report and log files set by the command line or pytest.ini addopts"""
+    files = []
+    for option in ("htmlpath", "compact_report", "log_file"):
+        value = getattr(config.option, option, None)
+        if value:
+            path = Path(value)
+            files.append(path)
+            if option == "compact_report":
+                files.append(path.with_suffix(".html"))
+    return files
+
+
+def register_artifact_plugin(config, run_id):
+    """Register the artifact store's collector on a pytest config (controller only)"""
+    if hasattr(config, "workerinput"):
+        return None  # xdist worker: the controller stores its artifacts
+    if config.option.collectonly:
+        return None
+    directory = default_store_dir()
+    if directory is None:
+        return None
+
+    from utilities.runner import ResultsCollector
+    try:
+        store = ArtifactStore(directory)
+    except (OSError, sqlite3.Error) as e:
+        logger.log_error("Artifact store disabled (%s): %s", directory, e)
+        return None
+    recorder = RunArtifacts(store, run_id)
+    config.pluginmanager.register(ResultsCollector(recorder.handle), "qa_artifact_events")
+    config.pluginmanager.register(recorder, "qa_artifact_store")
+    return recorder
@@ -0,0 +1,50 @@
+import hashlib
+from pathlib import Path
+from utilities.http_server import CachedContent, HTTPError
+
+# ============================================================
+# Hashed static assets
+# ============================================================
+# The dashboard's CSS and JavaScript are served under names that contain
+# a hash of their content (dashboard.css -> dashboard.1a2b3c4d5e.css).
+# A changed file gets a new URL, so browsers may cache every URL for a
+# year without revalidating, and the HTML shell that references them is
+# the only thing they need to check.
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+HASH_LENGTH = 10
+
+
+class StaticAssets:
+    """Content-hashed URLs for a fixed set of static files, served from memory"""
+
+    def __init__(self, directory, names, content_types, prefix="/assets/"):
+        """
+        Args:
+            directory: folder holding the files
+            names: file names to publish, e.g. ("dashboard.css",)
+            content_types: suffix -> Content-Type mapping
+            prefix: URL prefix the assets are routed under
+        """
+        self.prefix = prefix
+        self._urls = {}
+        self._content = {}
+        for name in names:
+            path = Path(directory) / name
+            body = path.read_bytes()
+            digest = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+            hashed = f"{path.stem}.{digest}{path.suffix}"
+            content_type = content_types.get(path.suffix.lower(), "application/octet-stream")
+            self._urls[name] = prefix + hashed
+            self._content[hashed] = CachedContent(body, content_type, cache_control=IMMUTABLE)
+
+    def url(self, name):
+        """Hashed URL of a published file"""
+        return self._urls[name]
+
+    def response(self, request):
+        """Serve /assets/<hashed name>; unknown or outdated hashes are 404"""
+        content = self._content.get(request.path[len(self.prefix):])
+        if content is None:
+            raise HTTPError(404, "File not found")
+        return content.response(request)
@@ -0,0 +1,210 @@
+import itertools
+import os
+import pytest
+
+# ============================================================
+# Combinatorial test design
+# ============================================================
+# Most interaction defects are triggered by a combination of two (or
+# three) parameters. A t-wise covering array contains every value pair
+# (or triple) of the declared dimensions at least once, which is far
+# fewer cases than the full cartesian product once there are three or
+# more dimensions.
+#
+#   QA_COMBINATORIAL=pairwise     2-wise coverage (default)
+#   QA_COMBINATORIAL=3            3-wise coverage
+#   QA_COMBINATORIAL=exhaustive   full cartesian product (nightly runs)
+#
+# The variable sets the default; a strength passed in code wins over it.
+#
+# Every generated case carries a "combinatorial" marker with its matrix's
+# reduction (name, strength, exhaustive and generated case counts).
+# CombinatorialPlugin reads it from the collected items, so the summary
+# only lists matrices that are part of the run. Under xdist the workers
+# collect and send their matrices to the controller at shutdown.
+
+COMBINATORIAL_ENV_VAR = "QA_COMBINATORIAL"
+EXHAUSTIVE = "exhaustive"
+MARKER = "combinatorial"
+WORKER_OUTPUT_KEY = "qa_combinatorial"
+
+
+def exhaustive_count(dimensions):
+    """Number of cases in the full cartesian product"""
+    count = 1
+    for values in dimensions.values():
+        count *= len(values)
+    return count
+
+
+def resolve_strength(strength=None):
+    """Return the coverage strength (2 or more) or EXHAUSTIVE; an explicit strength wins over the env"""
+    if strength is None:
+        mode = os.environ.get(COMBINATORIAL_ENV_VAR, "").strip().lower()
+        strength = int(mode) if mode.isdigit() else (mode or "pairwise")
+    if strength == "pairwise":
+        return 2
+    if strength == EXHAUSTIVE or (type(strength) is int and strength >= 2):
+        return strength
+    raise ValueError(
+        f"Invalid combinatorial strength {strength!r}: expected an integer of 2 or more, "
+        f"'pairwise' or '{EXHAUSTIVE}' (set in code or ${COMBINATORIAL_ENV_VAR})"
+    )
+
+
+def covering_array(dimensions, strength=2):
+    """
+    Build a t-wise covering array with a deterministic greedy algorithm
+
+    Args:
+        dimensions: Ordered mapping of parameter name to list of values
+        strength: Size of the value combinations that must all be covered
+
+    Returns:
+        List of dicts, one per generated case
+    """
+    names = list(dimensions)
+    values = [list(dimensions[name]) for name in names]
+    if any(not column for column in values):
+        return []
+
+    if strength >= len(names):
+        return [dict(zip(names, row)) for row in itertools.product(*values)]
+
+    # Every t-tuple is stored as ((param indices), (value indices))
+    uncovered = set()
+    for params in itertools.combinations(range(len(names)), strength):
+        for picks in itertools.product(*(range(len(values[p])) for p in params)):
+            uncovered.add((params, picks))
+
+    rows = []
+    while uncovered:
+        # Seed the row with the smallest uncovered tuple so every row
+        # makes progress, then fill the other parameters greedily.
+        seed_params, seed_picks = min(uncovered)
+        row = dict(zip(seed_params, seed_picks))
+
+        for param in range(len(names)):
+            if param in row:
+                continue
+            best_pick, best_gain = 0, -1
+            for pick in range(len(values[param])):
+                row[param] = pick
+                gain = _newly_covered(row, param, strength, uncovered)
+                if gain > best_gain:
+                    best_pick, best_gain = pick, gain
+            row[param] = best_pick
+
+        for params in itertools.combinations(range(len(names)), strength):
+            uncovered.discard((params, tuple(row[p] for p in params)))
+
+        rows.append({names[p]: values[p][row[p]] for p in range(len(names))})
+
+    return rows
+
+
+def _newly_covered(row, param, strength, uncovered):
+    """Count uncovered tuples completed by assigning param in row"""
+    others = sorted(p for p in row if p != param)
+    gain = 0
+    for combo in itertools.combinations(others, strength - 1):
+        params = tuple(sorted(combo + (param,)))
+        if (params, tuple(row[p] for p in params)) in uncovered:
+            gain += 1
+    return gain
+
+
+def generate_cases(dimensions, strength=None):
+    """Return the cases for the resolved strength (or every combination)"""
+    resolved = resolve_strength(strength)
+    if resolved == EXHAUSTIVE:
+        names = list(dimensions)
+        return [dict(zip(names, row)) for row in itertools.product(*dimensions.values())]
+    return covering_array(dimensions, resolved)
+
+
+def combinatorial(dimensions, strength=None, name=None):
+    """
+    Parametrize a test with a t-wise covering set of the given dimensions
+
+    Each dimension becomes a test argument. Set QA_COMBINATORIAL=exhaustive
+    to run every combination of matrices that don't pass a strength.
+    """
+    names = list(dimensions)
+    cases = generate_cases(dimensions, strength)
+    reduction = pytest.mark.combinatorial(
+        name=name or ",".join(names),
+        strength=resolve_strength(strength),
+        total=exhaustive_count(dimensions),
+        generated=len(cases),
+    )
+    params = [
+        pytest.param(
+            *(case[n] for n in names),
+            id="-".join(str(case[n]) or "empty" for n in names),
+            marks=reduction,
+        )
+        for case in cases
+    ]
+    return pytest.mark.parametrize(names, params)
+
+
+def collect_reductions(items):
+    """(name, strength, exhaustive count, generated count) of each matrix in items"""
+    reductions = {}
+    for item in items:
+        marker = item.get_closest_marker(MARKER)
+        if marker is not None:
+            spec = marker.kwargs
+            reductions[spec["name"]] = (spec["name"], spec["strength"], spec["total"], spec["generated"])
+    return list(reductions.values())
+
+
+def format_reduction_report(reductions):
+    """Return one summary line per combinatorial test matrix"""
+    lines = []
+    for name, strength, total, generated in reductions:
+        label = "exhaustive" if strength == EXHAUSTIVE else f"{strength}-wise"
+        eliminated = total - generated
+        percent = (eliminated / total * 100) if total else 0
+        lines.append(
+            f"{name}: {generated}/{total} cases ({label}), "
+            f"{eliminated} eliminated ({percent:.0f}%)"
+        )
+    return lines
+
+
+class CombinatorialPlugin:
+    """Prints the case reduction of the matrices in the run"""
+
+    def __init__(self):
+        self.reductions = {}
+
+    def _add(self, reductions):
+        for name, strength, total, generated in reductions:
+            self.reductions[name] = (name, strength, total, generated)
+
+    def pytest_collection_finish(self, session):
+        self._add(collect_reductions(session.items))
+
+    def pytest_sessionfinish(self, session):
+        # xdist worker: hand the collected matrices to the controller
+        workeroutput = getattr(session.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput[WORKER_OUTPUT_KEY] = list(self.reductions.values())
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # xdist controller: it never collects, the workers report instead
+        self._add(getattr(node, "workeroutput", {}).get(WORKER_OUTPUT_KEY, []))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        for line in format_reduction_report(self.reductions.values()):
+            terminalreporter.write_line(f"Combinatorial matrix {line}")
+
+
+def register_combinatorial_plugin(config):
+    """Register the reduction summary in every process"""
+    plugin = CombinatorialPlugin()
+    config.pluginmanager.register(plugin, "qa_combinatorial")
+    return plugin
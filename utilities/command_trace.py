@@ -0,0 +1,299 @@
+import gzip
+import json
+import sys
+import time
+from collections import deque
+from pathlib import Path
+import pytest
+from utilities.config import Config
+from utilities.events import current_test_id, get_run_id
+from utilities.logger import get_logger, get_worker_id
+
+# ============================================================
+# WebDriver command tracer
+# ============================================================
+# Every BasePage call becomes one or more WebDriver HTTP commands
+# (findElement, elementClick, getElementText, ...). With the
+# command_trace setting on, trace_driver() wraps a session's command
+# executor and records each command: its name, round-trip time, request
+# and response payload sizes, whether the driver reported an error and
+# the test that issued it (PYTEST_CURRENT_TEST).
+#
+# Commands are kept in a ring buffer of command_trace_buffer entries per
+# process; older ones are dropped and counted. Per-test statistics are
+# kept separately, so summaries are complete even when the buffer wraps.
+# CommandTracePlugin attaches each test's commands to its report as the
+# "command_trace" user property, prints per-command latency percentiles
+# and the busiest tests in the terminal summary, and writes the buffer
+# to reports/traces/commands_<run id>_<worker>.jsonl.gz:
+#
+#   {"type": "trace", "fields": [...], "tests": [...], ...}   header
+#   [offset_ms, test index, command, duration_ms, sent, received, ok]
+#
+# Sessions are wrapped after they start, so newSession itself is not
+# traced (utilities/phase_timing.py times the browser launch).
+#
+#   python -m utilities.command_trace reports/traces/commands_*.jsonl.gz
+
+logger = get_logger("CommandTrace")
+
+USER_PROPERTY = "command_trace"
+FORMAT_VERSION = 1
+TRACE_DIR = Config.REPORTS_DIR / "traces"
+FIELDS = ["offset_ms", "test", "command", "duration_ms", "sent", "received", "ok"]
+PERCENTILES = (50, 95, 99)
+
+
+def payload_size(value):
+    """Approximate JSON size of a request or response payload in bytes"""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value)
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+def percentile(ordered, q):
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+class CommandTracer:
+    """Ring buffer of executed commands plus per-test statistics"""
+
+    def __init__(self, size=10000):
+        self.buffer = deque(maxlen=size)
+        self.recorded = 0
+        self.started = time.time()
+        self._tests = {}
+
+    @property
+    def dropped(self):
+        return self.recorded - len(self.buffer)
+
+    def resize(self, size):
+        self.buffer = deque(self.buffer, maxlen=size)
+
+    def record(self, command, duration_ms, sent, received, ok, test_id=None):
+        test_id = current_test_id() if test_id is None else test_id
+        self.buffer.append((time.time(), test_id, command, duration_ms, sent, received, ok))
+        self.recorded += 1
+        stats = self._tests.setdefault(test_id, {"commands": {}, "sent": 0, "received": 0, "errors": 0})
+        stats["commands"].setdefault(command, []).append(round(duration_ms, 3))
+        stats["sent"] += sent
+        stats["received"] += received
+        stats["errors"] += not ok
+
+    def take_test(self, test_id):
+        """Remove and return the statistics of one test (None if it sent no commands)"""
+        return self._tests.pop(test_id, None)
+
+    def write(self, path, **header):
+        """Write the buffered commands as a compact gzip JSONL trace"""
+        tests = {}
+        rows = []
+        for ts, test_id, command, duration_ms, sent, received, ok in self.buffer:
+            index = tests.setdefault(test_id, len(tests))
+            rows.append([round((ts - self.started) * 1000, 3), index, command,
+                         round(duration_ms, 3), sent, received, int(ok)])
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "type": "trace",
+                "version": FORMAT_VERSION,
+                "started": self.started,
+                "recorded": self.recorded,
+                "dropped": self.dropped,
+                "fields": FIELDS,
+                "tests": list(tests),
+                **header,
+            }, separators=(",", ":")) + "\n")
+            for row in rows:
+                f.write(json.dumps(row, separators=(",", ":")) + "\n")
+        return path
+
+
+command_tracer = CommandTracer()
+
+
+def trace_driver(driver, tracer=None):
+    """Record every command a driver session sends to its browser driver"""
+    executor = driver.command_executor
+    if getattr(executor, "_qa_command_trace", False):
+        return driver  # pooled sessions are wrapped once
+    tracer = tracer or command_tracer
+    execute = executor.execute
+
+    def traced_execute(command, params=None):
+        started = time.perf_counter()
+        response = None
+        try:
+            response = execute(command, params)
+            return response
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            # Errors come back as {"status": <HTTP status>, "value": {...}}
+            status = response.get("status", 0) if isinstance(response, dict) else None
+            ok = isinstance(status, int) and status < 400
+            received = payload_size(response.get("value")) if isinstance(response, dict) else 0
+            tracer.record(command, duration_ms, payload_size(params), received, ok)
+
+    executor.execute = traced_execute
+    executor._qa_command_trace = True
+    return driver
+
+
+def iter_trace(path):
+    """Commands of a trace file as dicts, with test ids and absolute times"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        for line in f:
+            record = dict(zip(header["fields"], json.loads(line)))
+            record["test"] = header["tests"][record["test"]]
+            record["ts"] = header["started"] + record.pop("offset_ms") / 1000
+            record["ok"] = bool(record["ok"])
+            yield record
+
+
+# ============================================================
+# Summaries
+# ============================================================
+class CommandStats:
+    """Aggregates per-test command statistics into per-command and per-test tables"""
+
+    def __init__(self):
+        self.commands = {}
+        self.tests = {}
+
+    def add(self, test_id, stats):
+        test = self.tests.setdefault(test_id, {"commands": 0, "total_ms": 0.0, "errors": 0,
+                                               "sent": 0, "received": 0})
+        for command, durations in stats["commands"].items():
+            self.commands.setdefault(command, []).extend(durations)
+            test["commands"] += len(durations)
+            test["total_ms"] += sum(durations)
+        for key in ("errors", "sent", "received"):
+            test[key] += stats[key]
+
+    def add_record(self, record):
+        """Add one command read back from a trace file"""
+        self.add(record["test"], {"commands": {record["command"]: [record["duration_ms"]]},
+                                  "sent": record["sent"], "received": record["received"],
+                                  "errors": int(not record["ok"])})
+
+    def per_command(self):
+        """Count, total and latency percentiles (ms) of each command, busiest first"""
+        rows = []
+        for command, durations in self.commands.items():
+            ordered = sorted(durations)
+            row = {"command": command, "count": len(ordered), "total_ms": round(sum(ordered), 3)}
+            for q in PERCENTILES:
+                row[f"p{q}_ms"] = percentile(ordered, q)
+            row["max_ms"] = ordered[-1]
+            rows.append(row)
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def per_test(self, limit=None):
+        """Tests by command time, with their command counts"""
+        rows = [{"test": test_id, **stats, "total_ms": round(stats["total_ms"], 3)}
+                for test_id, stats in self.tests.items()]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows[:limit]
+
+
+def format_summary(stats, tests=10):
+    """Lines of the per-command and busiest-test tables"""
+    commands = stats.per_command()
+    if not commands:
+        return []
+    lines = [f"{'command':28}{'count':>8}{'total ms':>12}" + "".join(f"{f'p{q}':>10}" for q in PERCENTILES)
+             + f"{'max':>10}"]
+    for row in commands:
+        lines.append(f"{row['command'][:28]:28}{row['count']:>8}{row['total_ms']:>12.1f}"
+                     + "".join(f"{row[f'p{q}_ms']:>10.1f}" for q in PERCENTILES) + f"{row['max_ms']:>10.1f}")
+    sent = sum(row["sent"] for row in stats.tests.values())
+    received = sum(row["received"] for row in stats.tests.values())
+    lines.append(f"{sum(row['count'] for row in commands)} commands, {sent} bytes sent, {received} received")
+    lines.append("")
+    lines.append(f"{'test':60}{'commands':>10}{'total ms':>12}{'errors':>8}")
+    for row in stats.per_test(tests):
+        lines.append(f"{(row['test'] or '(outside tests)')[-60:]:60}{row['commands']:>10}"
+                     f"{row['total_ms']:>12.1f}{row['errors']:>8}")
+    return lines
+
+
+# ============================================================
+# pytest plugin
+# ============================================================
+class CommandTracePlugin:
+    """Attaches each test's commands to its report, summarizes them and writes the trace"""
+
+    def __init__(self, tracer=None, summarize=True, trace_dir=TRACE_DIR):
+        self.tracer = tracer or command_tracer
+        self.summarize = summarize
+        self.trace_dir = Path(trace_dir) if trace_dir else None
+        self.stats = CommandStats()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when != "teardown":
+            return
+        stats = self.tracer.take_test(item.nodeid)
+        if stats:
+            item.user_properties.append((USER_PROPERTY, stats))
+            report.user_properties = list(item.user_properties)
+
+    def pytest_runtest_logreport(self, report):
+        if not self.summarize or report.when != "teardown":
+            return
+        for key, value in report.user_properties:
+            if key == USER_PROPERTY:
+                self.stats.add(report.nodeid, value)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        lines = format_summary(self.stats) if self.summarize else []
+        if lines:
+            terminalreporter.section("webdriver commands")
+            for line in lines:
+                terminalreporter.write_line(line)
+
+    def pytest_unconfigure(self, config):
+        # Under xdist each worker writes the commands it executed
+        if self.trace_dir is None or not self.tracer.recorded:
+            return
+        worker = get_worker_id()
+        path = self.tracer.write(self.trace_dir / f"commands_{get_run_id()}_{worker}.jsonl.gz",
+                                 run=get_run_id(), worker=worker)
+        logger.log_info("Wrote %d WebDriver commands to %s (%d dropped)",
+                        len(self.tracer.buffer), path, self.tracer.dropped)
+
+
+def register_command_trace_plugin(config):
+    """Register the tracer in every process that runs tests when command_trace is on"""
+    settings = Config.settings()
+    if not settings.command_trace:
+        return None
+    command_tracer.resize(settings.command_trace_buffer)
+    plugin = CommandTracePlugin(summarize=not hasattr(config, "workerinput"))
+    config.pluginmanager.register(plugin, "qa_command_trace")
+    return plugin
+
+
+def main(paths):
+    """Print the summary of trace files written by earlier runs"""
+    stats = CommandStats()
+    for path in paths:
+        for record in iter_trace(path):
+            stats.add_record(record)
+    for line in format_summary(stats, tests=20) or ["No commands in the given traces"]:
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
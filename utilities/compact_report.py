@@ -0,0 +1,212 @@
+import heapq
+import json
+import os
+import socket
+import time
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from utilities.config import Config
+from utilities.logger import get_logger
+
+# ============================================================
+# Compact report
+# ============================================================
+# Alternative to the self-contained pytest-html report. A run writes:
+#
+#   <name>.jsonl   one JSON object per line: a "run" header, one "test"
+#                  line per finished test, and a closing "summary" line
+#   <name>.html    a few hundred bytes that load the shared viewer from
+#                  static/report_viewer.{css,js}
+#
+# Screenshots and logs are not inlined. Test lines list them as paths
+# relative to the report, and the viewer fetches them only when a test
+# is opened, so the report grows with the number of tests and not with
+# the size of their artifacts.
+#
+# Lines are appended as tests finish and the file is line-buffered, so
+# a partial report is on disk during the run (and after a crash; the
+# viewer then shows "run did not finish" and polls for new lines). Only
+# per-outcome counters are kept in memory. Under xdist the controller
+# receives every worker's reports and appends them to one stream in
+# completion order; merge_reports() combines separately written
+# streams (e.g. CI shards) by finish time.
+
+logger = get_logger("CompactReport")
+
+FORMAT_VERSION = 1
+REPORT_TITLE = "HCLTech QA Automation Test Report"
+VIEWER_DIR = Config.BASE_DIR / "static"
+
+STUB_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>{title}</title>
+<link rel="stylesheet" href="{assets}/report_viewer.css">
+<script src="{assets}/report_viewer.js" defer></script>
+</head>
+<body data-report="{data}">
+<noscript>Open {data} or enable JavaScript to view this report.</noscript>
+</body>
+</html>
+"""
+
+
+def artifact_url(path, report_dir):
+    """Path of an artifact relative to the report, with forward slashes"""
+    try:
+        return Path(os.path.relpath(path, report_dir)).as_posix()
+    except ValueError:
+        # Different drive on Windows: keep the absolute path
+        return Path(path).as_posix()
+
+
+def write_viewer_stub(html_path, data_name, title=REPORT_TITLE):
+    """Write the small HTML page that opens data_name in the shared viewer"""
+    assets = artifact_url(VIEWER_DIR, html_path.parent)
+    html_path.write_text(
+        STUB_TEMPLATE.format(title=escape(title), assets=escape(assets), data=escape(data_name)),
+        encoding="utf-8",
+    )
+
+
+class CompactReport:
+    """Appends runner events to a JSONL report as tests finish"""
+
+    def __init__(self, path, title=REPORT_TITLE):
+        self.path = Path(path).with_suffix(".jsonl")
+        self.title = title
+        self.counts = {}
+        self.total = 0
+        self._file = None
+
+    def handle(self, event):
+        kind = event["event"]
+        if kind == "session_start":
+            self.open(event["ts"], event["args"])
+        elif kind == "test":
+            self.append(event)
+        elif kind == "session_finish":
+            self.close(event["exit_code"], event["duration"])
+
+    def open(self, started=None, args=None):
+        """Start the stream with its header and write the viewer page"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Line-buffered: every finished test reaches the file immediately
+        self._file = open(self.path, "w", encoding="utf-8", buffering=1)
+        self._write({
+            "type": "run",
+            "version": FORMAT_VERSION,
+            "title": self.title,
+            "started": datetime.fromtimestamp(started or time.time()).isoformat(),
+            "host": socket.gethostname(),
+            "args": args or [],
+        })
+        write_viewer_stub(self.path.with_suffix(".html"), self.path.name, self.title)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def append(self, event):
+        """Write one finished test from a runner event"""
+        line = {
+            "type": "test",
+            "nodeid": event["nodeid"],
+            "outcome": event["outcome"],
+            "duration": round(event["duration"], 3),
+            "worker": event.get("worker"),
+            "ts": round(time.time(), 3),
+        }
+        if event.get("longrepr"):
+            line["longrepr"] = event["longrepr"]
+        if event.get("metrics"):
+            line["metrics"] = event["metrics"]
+        if event.get("breakdown"):
+            line["breakdown"] = event["breakdown"]
+        if event.get("artifacts"):
+            line["artifacts"] = [artifact_url(path, self.path.parent) for path in event["artifacts"]]
+        self.write_test(line)
+
+    def write_test(self, line):
+        """Write one test line and count its outcome"""
+        if self._file is None:
+            self.open()
+        self.counts[line["outcome"]] = self.counts.get(line["outcome"], 0) + 1
+        self.total += 1
+        self._write(line)
+
+    def close(self, exit_code, duration):
+        """Write the summary line and close the stream"""
+        if self._file is None:
+            self.open()
+        self._write({
+            "type": "summary",
+            "exit_code": exit_code,
+            "duration": round(duration, 3),
+            "total": self.total,
+            "counts": self.counts,
+        })
+        self.abort()
+        logger.log_info("Compact report: %d tests, %d bytes", self.total, self.path.stat().st_size)
+
+    def abort(self):
+        """Close the stream without a summary (the run did not finish)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def iter_report(path):
+    """Yield the records of a JSONL report, skipping a truncated last line"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                return  # cut off by a crash mid-write
+            yield json.loads(line)
+
+
+def merge_reports(output, paths, title=REPORT_TITLE):
+    """
+    Merge compact report streams into one, ordered by test finish time
+
+    Reads each input once, line by line (heapq.merge keeps one pending
+    line per input), so memory does not depend on the number of tests.
+    """
+    def tests(path):
+        return (record for record in iter_report(path) if record["type"] == "test")
+
+    headers, summaries = [], []
+    for path in paths:
+        for record in iter_report(path):
+            if record["type"] == "run":
+                headers.append(record)
+            elif record["type"] == "summary":
+                summaries.append(record)
+
+    report = CompactReport(output, title)
+    report.open(
+        started=min((datetime.fromisoformat(h["started"]).timestamp() for h in headers), default=None),
+        args=[arg for h in headers for arg in h.get("args", [])],
+    )
+    for record in heapq.merge(*(tests(path) for path in paths), key=lambda r: r.get("ts", 0)):
+        report.write_test(record)
+
+    if len(summaries) == len(paths):
+        report.close(max(s["exit_code"] for s in summaries), max(s["duration"] for s in summaries))
+    else:
+        # An input without a summary did not finish: the merged run did not either
+        report.abort()
+    return report
+
+
+def register_compact_report(config):
+    """Register the compact report writer when --compact-report is given"""
+    path = config.getoption("--compact-report", None)
+    if not path or hasattr(config, "workerinput"):
+        return None  # not requested, or an xdist worker (the controller writes)
+
+    from utilities.runner import ResultsCollector
+    report = CompactReport(path)
+    config.pluginmanager.register(ResultsCollector(report.handle), "qa_compact_report")
+    return report
@@ -1,6 +1,23 @@
-import os
 from pathlib import Path
-import json
+from utilities.settings import get_settings
+
+class _Setting:
+    """Class attribute that reads a value from the layered settings on access"""
+    
+    def __init__(self, key):
+        self.key = key
+    
+    def __get__(self, instance, owner):
+        return get_settings()[self.key]
+
+class _DerivedURL:
+    """Class attribute built from BASE_URL on access"""
+    
+    def __init__(self, path):
+        self.path = path
+    
+    def __get__(self, instance, owner):
+        return f"{get_settings().base_url.rstrip('/')}{self.path}"
 
 class Config:
     """Configuration management for the automation framework"""
@@ -12,46 +29,56 @@ class Config:
     LOGS_DIR = BASE_DIR / "reports" / "logs"
     
     # Browser configuration
-    BROWSER = "chrome"  # chrome, firefox, edge
-    HEADLESS = False  # Set to True for CI/CD pipelines
-    IMPLICIT_WAIT = 10
-    EXPLICIT_WAIT = 20
+    # Resolved lazily from defaults -> profile -> environment -> CLI,
+    # see utilities/settings.py. Use QA_PROFILE=ci-fast or --headless
+    # instead of editing these values.
+    BROWSER = _Setting("browser")  # chrome, firefox
+    HEADLESS = _Setting("headless")
+    IMPLICIT_WAIT = _Setting("implicit_wait")
+    EXPLICIT_WAIT = _Setting("explicit_wait")
     
     # ============================================================
-    # 🎯 IMPORTANT: Change these URLs to real test websites
+    # 🎯 IMPORTANT: Change the base_url setting to real test websites
     # ============================================================
     
     # Option 1: SauceDemo (Free demo e-commerce site - RECOMMENDED)
-    BASE_URL = "https://www.saucedemo.com"
-    LOGIN_URL = f"{BASE_URL}/"
-    PASSWORD_RESET_URL = f"{BASE_URL}/"  # Note: SauceDemo doesn't have password reset
+    BASE_URL = _Setting("base_url")
+    LOGIN_URL = _DerivedURL("/")
+    PASSWORD_RESET_URL = _DerivedURL("/")  # Note: SauceDemo doesn't have password reset
     
     # Option 2: OrangeHRM Demo (Free HR management demo)
-    # BASE_URL = "https://opensource-demo.orangehrmlive.com"
-    # LOGIN_URL = f"{BASE_URL}/web/index.php/auth/login"
-    # PASSWORD_RESET_URL = f"{BASE_URL}/web/index.php/auth/requestPasswordResetCode"
+    # QA_BASE_URL=https://opensource-demo.orangehrmlive.com
+    # LOGIN_URL = _DerivedURL("/web/index.php/auth/login")
+    # PASSWORD_RESET_URL = _DerivedURL("/web/index.php/auth/requestPasswordResetCode")
     
     # Option 3: Your local application (if testing locally)
-    # BASE_URL = "http://localhost:3000"
-    # LOGIN_URL = f"{BASE_URL}/login"
-    # PASSWORD_RESET_URL = f"{BASE_URL}/forgot-password"
+    # QA_BASE_URL=http://localhost:3000
+    # LOGIN_URL = _DerivedURL("/login")
+    # PASSWORD_RESET_URL = _DerivedURL("/forgot-password")
     
     # Test Data Files
     CREDENTIALS_FILE = TEST_DATA_DIR / "credentials.json"
     TEST_CONFIG_FILE = TEST_DATA_DIR / "test_config.json"
     
-    # Create directories if they don't exist
-    for directory in [TEST_DATA_DIR, REPORTS_DIR, LOGS_DIR]:
-        directory.mkdir(exist_ok=True)
+    @classmethod
+    def settings(cls):
+        """Return the typed, layered settings for this process"""
+        return get_settings()
+    
+    @classmethod
+    def ensure_directories(cls):
+        """Create the data, reports and logs directories if they don't exist"""
+        for directory in [cls.TEST_DATA_DIR, cls.REPORTS_DIR, cls.LOGS_DIR]:
+            directory.mkdir(parents=True, exist_ok=True)
     
     @classmethod
     def load_test_data(cls):
-        """Load test data from JSON files"""
+        """Load read-only test data from JSON files via the shared data cache"""
+        # Imported here because data_cache itself depends on Config
+        from utilities.data_cache import data_cache
         try:
-            with open(cls.CREDENTIALS_FILE, 'r') as f:
-                credentials = json.load(f)
-            with open(cls.TEST_CONFIG_FILE, 'r') as f:
-                config = json.load(f)
+            credentials = data_cache.load_json(cls.CREDENTIALS_FILE)
+            config = data_cache.load_json(cls.TEST_CONFIG_FILE)
             return credentials, config
         except FileNotFoundError:
             # Return default data if files don't exist
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from utilities.config import Config
+
+# ============================================================
+# Process-wide test data cache
+# ============================================================
+# Parsed JSON files are memoized by path and invalidated when the file's
+# mtime or size changes. Callers get read-only views (MappingProxyType
+# for objects, tuples for arrays) so one test cannot corrupt the data
+# another test sees.
+#
+# The first process to parse a file also writes a pickled sidecar under
+# .qa_cache/data/. Other xdist workers load the sidecar instead of
+# re-parsing the JSON, as long as it matches the source's mtime and size.
+
+CACHE_DIR = Config.BASE_DIR / ".qa_cache" / "data"
+SIDECAR_VERSION = 1
+
+
+def freeze(value):
+    """Return a deeply read-only view of parsed JSON data"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Return a mutable deep copy of frozen data"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class DataCache:
+    """Memoize parsed data files keyed by path and modification time"""
+
+    def __init__(self, sidecar_dir=CACHE_DIR, use_sidecar=True):
+        self.sidecar_dir = Path(sidecar_dir)
+        self.use_sidecar = use_sidecar
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "parses": 0,
+            "hits": 0,
+            "sidecar_hits": 0,
+            "invalidations": 0,
+        }
+
+    @property
+    def parses_avoided(self):
+        """Number of loads served without parsing the source file"""
+        return self.stats["hits"] + self.stats["sidecar_hits"]
+
+    def load_json(self, file_path):
+        """
+        Return the frozen contents of a JSON file
+
+        Raises FileNotFoundError or json.JSONDecodeError like json.load would.
+        """
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == signature:
+            self.stats["hits"] += 1
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self.stats["hits"] += 1
+                return entry[1]
+            if entry is not None:
+                self.stats["invalidations"] += 1
+
+            data = self._read_sidecar(path, signature)
+            if data is None:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.stats["parses"] += 1
+                self._write_sidecar(path, signature, data)
+            else:
+                self.stats["sidecar_hits"] += 1
+
+            frozen = freeze(data)
+            self._entries[path] = (signature, frozen)
+            return frozen
+
+    def clear(self):
+        """Drop all in-memory entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            for key in self.stats:
+                self.stats[key] = 0
+
+    # ============================================================
+    # Sidecar files shared between worker processes
+    # ============================================================
+    def _sidecar_path(self, path):
+        digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:16]
+        return self.sidecar_dir / f"{path.stem}_{digest}.pickle"
+
+    def _read_sidecar(self, path, signature):
+        if not self.use_sidecar:
+            return None
+        try:
+            with open(self._sidecar_path(path), "rb") as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+        if payload.get("version") != SIDECAR_VERSION or payload.get("signature") != signature:
+            return None
+        return payload["data"]
+
+    def _write_sidecar(self, path, signature, data):
+        if not self.use_sidecar:
+            return
+        sidecar = self._sidecar_path(path)
+        # Write to a per-process temp file and rename, so concurrent
+        # workers never observe a half-written sidecar.
+        tmp_file = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+        try:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, "wb") as f:
+                pickle.dump(
+                    {"version": SIDECAR_VERSION, "signature": signature, "data": data},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_file, sidecar)
+        except OSError:
+            # The sidecar is only an optimization
+            tmp_file.unlink(missing_ok=True)
+
+
+# Shared by TestDataReader and Config
+data_cache = DataCache()
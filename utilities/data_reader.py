@@ -1,16 +1,20 @@
+import csv
 import json
 import os
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from pathlib import Path
 from utilities.config import Config
+from utilities.data_cache import data_cache
 
 class TestDataReader:
     """Utility class to read test data from various sources"""
     
     @staticmethod
     def load_json_data(file_path):
-        """Load data from JSON file"""
+        """Load read-only data from JSON file, served from the shared cache"""
         try:
-            with open(file_path, 'r') as file:
-                return json.load(file)
+            return data_cache.load_json(file_path)
         except FileNotFoundError:
             raise Exception(f"Test data file not found: {file_path}")
         except json.JSONDecodeError:
@@ -34,6 +38,12 @@ class TestDataReader:
         data = TestDataReader.get_credentials()
         return data['invalid_credentials']
     
+    @staticmethod
+    def get_user_accounts():
+        """Get the demo application's user account names"""
+        data = TestDataReader.get_credentials()
+        return data['user_accounts']
+    
     @staticmethod
     def get_password_reset_data():
         """Get password reset test data"""
@@ -43,4 +53,305 @@ class TestDataReader:
     @staticmethod
     def get_test_config():
         """Get test configuration"""
-        return TestDataReader.load_json_data(Config.TEST_CONFIG_FILE)
\ No newline at end of file
+        return TestDataReader.load_json_data(Config.TEST_CONFIG_FILE)
+
+# ============================================================
+# Streaming data sources for data-driven tests
+# ============================================================
+# A data source is scanned once at collection time. Only a small RowRef
+# (row index, byte offset, test id) is kept per row; the row itself is
+# read from disk the first time the test accesses it. This keeps
+# collection memory flat for sources with hundreds of thousands of rows.
+
+DATA_DRIVEN_MARKER = "data_driven"
+SHARD_ENV_VAR = "QA_DATA_SHARD"
+
+
+class RowRef(Mapping):
+    """Lazy, read-only reference to one row of a data source"""
+
+    __slots__ = ("source", "index", "offset", "row_id", "_row")
+
+    def __init__(self, source, index, offset, row_id):
+        self.source = source
+        self.index = index
+        self.offset = offset
+        self.row_id = row_id
+        self._row = None
+
+    def load(self):
+        """Read this row from the underlying source"""
+        return self.source.read_row(self.offset)
+
+    @property
+    def row(self):
+        """The row, read from the source on first access"""
+        if self._row is None:
+            self._row = self.load()
+        return self._row
+
+    def __getitem__(self, key):
+        return self.row[key]
+
+    def __iter__(self):
+        return iter(self.row)
+
+    def __len__(self):
+        return len(self.row)
+
+    # References compare by identity; comparing rows would hit the disk
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return f"RowRef({self.source.path.name}#{self.index})"
+
+
+class DataSource(ABC):
+    """Base class for row-oriented test data files"""
+
+    def __init__(self, path, where=None, shard=None, id_field=None):
+        path = Path(path)
+        if not path.is_absolute():
+            path = Config.TEST_DATA_DIR / path
+        self.path = path
+        self.where = where
+        self.shard = parse_shard(shard)
+        self.id_field = id_field
+
+    @abstractmethod
+    def scan(self):
+        """Yield (offset, row) pairs in file order"""
+
+    @abstractmethod
+    def read_row(self, offset):
+        """Return the row stored at offset"""
+
+    def __iter__(self):
+        """Stream matching rows without keeping them in memory"""
+        for _, row in self._matching():
+            yield row
+
+    def refs(self):
+        """Stream RowRefs for matching rows in this shard"""
+        for index, (offset, row) in enumerate(self._matching()):
+            row_id = row.get(self.id_field) if self.id_field else None
+            yield RowRef(self, index, offset, str(row_id or f"{self.path.stem}-{index}"))
+
+    def _matching(self):
+        shard_index, shard_count = self.shard
+        position = 0
+        for offset, row in self.scan():
+            if self.where is not None and not self.where(row):
+                continue
+            if position % shard_count == shard_index:
+                yield offset, row
+            position += 1
+
+    def close(self):
+        """Release any open file handles"""
+
+
+class CsvSource(DataSource):
+    """Rows from a CSV file with a header line"""
+
+    def __init__(self, path, encoding="utf-8", **kwargs):
+        super().__init__(path, **kwargs)
+        self.encoding = encoding
+        self._header = None
+
+    def _records(self, f):
+        # Track the byte offset where each CSV record starts. csv.reader
+        # pulls lines one at a time, so quoted multi-line fields are kept
+        # intact and the offset always points at a record boundary.
+        position = [f.tell()]
+
+        def lines():
+            for raw in iter(f.readline, b""):
+                position[0] += len(raw)
+                yield raw.decode(self.encoding)
+
+        reader = csv.reader(lines())
+        start = position[0]
+        for record in reader:
+            yield start, record
+            start = position[0]
+
+    def scan(self):
+        with open(self.path, "rb") as f:
+            records = self._records(f)
+            _, self._header = next(records, (0, []))
+            for offset, record in records:
+                if record:
+                    yield offset, dict(zip(self._header, record))
+
+    def read_row(self, offset):
+        with open(self.path, "rb") as f:
+            if self._header is None:
+                _, self._header = next(self._records(f), (0, []))
+            f.seek(offset)
+            _, record = next(self._records(f))
+        return dict(zip(self._header, record))
+
+
+class JsonlSource(DataSource):
+    """Rows from a file with one JSON object per line"""
+
+    def scan(self):
+        with open(self.path, "rb") as f:
+            offset = 0
+            for raw in f:
+                if raw.strip():
+                    yield offset, json.loads(raw)
+                offset += len(raw)
+
+    def read_row(self, offset):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+
+class ExcelSource(DataSource):
+    """Rows from the first (or named) sheet of an .xlsx workbook"""
+
+    def __init__(self, path, sheet=None, **kwargs):
+        super().__init__(path, **kwargs)
+        self.sheet = sheet
+        self._workbook = None
+        self._header = None
+        self._cursor = None
+
+    def _open_workbook(self):
+        # Imported lazily: openpyxl is only needed for Excel sources
+        from openpyxl import load_workbook
+        # read_only mode streams rows instead of loading the whole sheet,
+        # but keeps the file open until the workbook is closed
+        return load_workbook(self.path, read_only=True, data_only=True)
+
+    def _worksheet(self, workbook):
+        sheet = workbook[self.sheet] if self.sheet else workbook.worksheets[0]
+        if self._header is None:
+            first = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+            self._header = [str(cell) if cell is not None else "" for cell in first]
+        return sheet
+
+    @staticmethod
+    def _cell(value):
+        return "" if value is None else value
+
+    def scan(self):
+        workbook = self._open_workbook()
+        try:
+            sheet = self._worksheet(workbook)
+            for row_number, values in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+                if any(value is not None for value in values):
+                    yield row_number, dict(zip(self._header, map(self._cell, values)))
+        finally:
+            workbook.close()
+
+    def read_row(self, offset):
+        # Read-only worksheets can only be streamed from the top, so keep a
+        # forward cursor: tests run in row order, making sequential reads
+        # O(1) instead of rescanning the sheet for every row. The cursor's
+        # workbook stays open until close() or a failed read.
+        try:
+            if self._cursor is None or self._cursor[0] > offset:
+                if self._workbook is None:
+                    self._workbook = self._open_workbook()
+                rows = self._worksheet(self._workbook).iter_rows(min_row=offset, values_only=True)
+                self._cursor = [offset, rows]
+            row_number, rows = self._cursor
+            for _ in range(offset - row_number):
+                next(rows)
+            values = next(rows)
+        except Exception:
+            self.close()
+            raise
+        self._cursor[0] = offset + 1
+        return dict(zip(self._header, map(self._cell, values)))
+
+    def close(self):
+        self._cursor = None
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+
+
+SOURCE_TYPES = {
+    ".csv": CsvSource,
+    ".jsonl": JsonlSource,
+    ".ndjson": JsonlSource,
+    ".xlsx": ExcelSource,
+    ".xlsm": ExcelSource,
+}
+
+
+def parse_shard(shard):
+    """Normalize a shard spec ('1/4', (1, 4) or None) to (index, count)"""
+    if shard is None:
+        shard = os.environ.get(SHARD_ENV_VAR)
+    if not shard:
+        return (0, 1)
+    if isinstance(shard, str):
+        index, count = (int(part) for part in shard.split("/", 1))
+    else:
+        index, count = shard
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard {shard!r}: expected index/count with 0 <= index < count")
+    return (index, count)
+
+
+def open_data_source(path, **kwargs):
+    """Create the DataSource matching the file extension"""
+    suffix = Path(path).suffix.lower()
+    if suffix not in SOURCE_TYPES:
+        raise ValueError(f"Unsupported data source type: {path}")
+    return SOURCE_TYPES[suffix](path, **kwargs)
+
+
+def data_driven(source, argname="data_row", where=None, shard=None, id_field=None, **options):
+    """
+    Parametrize a test with the rows of a CSV, JSONL or Excel file
+
+    The file is scanned during collection by pytest_generate_tests, so
+    importing the test module stays cheap. Each test receives a RowRef
+    that reads its row on access.
+
+    Args:
+        source: Path to the data file, relative to test_data/
+        argname: Name of the test argument receiving the row
+        where: Optional predicate to filter rows
+        shard: 'index/count' or (index, count); defaults to $QA_DATA_SHARD
+        id_field: Column used as the test id
+    """
+    # Imported here: scripts that only read test data don't need pytest
+    import pytest
+    return pytest.mark.data_driven(
+        source=source, argname=argname, where=where,
+        shard=shard, id_field=id_field, options=options,
+    )
+
+
+def parametrize_data_driven(metafunc):
+    """pytest_generate_tests helper for @data_driven tests"""
+    marker = metafunc.definition.get_closest_marker(DATA_DRIVEN_MARKER)
+    if marker is None:
+        return
+
+    spec = marker.kwargs
+    data_source = open_data_source(
+        spec["source"],
+        where=spec.get("where"),
+        shard=spec.get("shard"),
+        id_field=spec.get("id_field"),
+        **spec.get("options", {}),
+    )
+    try:
+        refs = list(data_source.refs())
+    finally:
+        data_source.close()
+    metafunc.parametrize(
+        spec.get("argname", "data_row"),
+        refs,
+        ids=lambda ref: ref.row_id,
+    )
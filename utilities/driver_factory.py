@@ -0,0 +1,186 @@
+from utilities.config import Config
+from utilities.logger import get_logger
+from utilities.phase_timing import timed
+
+# ============================================================
+# WebDriver factory
+# ============================================================
+# Selenium and webdriver-manager are imported inside the functions below
+# rather than at module level. Importing selenium.webdriver pulls in
+# every browser backend, so keeping it out of conftest means
+# --collect-only and browser-less tests never pay for it.
+
+logger = get_logger("DriverFactory")
+
+
+def _chrome(settings):
+    """Start a Chrome session configured from settings"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    options = Options()
+    if settings.headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument(f"--window-size={settings.window_size}")
+    options.add_argument("--disable-notifications")
+    options.add_argument("--disable-gpu")
+    options.page_load_strategy = settings.page_load_strategy
+    if settings.block_images:
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+
+    with timed("driver_resolution"):
+        service = Service(ChromeDriverManager().install())
+    with timed("browser_launch"):
+        driver = webdriver.Chrome(service=service, options=options)
+
+    if settings.blocked_urls:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": settings.blocked_urls})
+
+    return driver
+
+
+def _firefox(settings):
+    """Start a Firefox session configured from settings"""
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options
+    from selenium.webdriver.firefox.service import Service
+    from webdriver_manager.firefox import GeckoDriverManager
+
+    options = Options()
+    if settings.headless:
+        options.add_argument("--headless")
+    options.page_load_strategy = settings.page_load_strategy
+    if settings.block_images:
+        options.set_preference("permissions.default.image", 2)
+
+    with timed("driver_resolution"):
+        service = Service(GeckoDriverManager().install())
+    with timed("browser_launch"):
+        return webdriver.Firefox(service=service, options=options)
+
+
+BROWSERS = {
+    "chrome": _chrome,
+    "firefox": _firefox,
+}
+
+
+def create_driver(settings=None):
+    """Create a WebDriver for the configured browser with waits applied"""
+    settings = settings or Config.settings()
+    browser = settings.browser.lower()
+    if browser not in BROWSERS:
+        raise ValueError(f"Unsupported browser: {settings.browser}")
+
+    logger.log_info(
+        "Initializing %s browser (Headless: %s, profile: %s)",
+        browser, settings.headless, settings.profile or "default"
+    )
+    driver = BROWSERS[browser](settings)
+
+    # Set waits
+    driver.implicitly_wait(settings.implicit_wait)
+    driver.set_page_load_timeout(settings.page_load_timeout)
+
+    # Maximize window (headless windows keep the configured size)
+    if not settings.headless:
+        driver.maximize_window()
+
+    logger.log_info("%s browser initialized successfully", browser)
+    return driver
+
+
+# ============================================================
+# Browser pool
+# ============================================================
+# With driver_pool_size > 0 the driver fixture borrows sessions from a
+# per-process pool instead of starting a browser for every test. On
+# release a session is reset (cookies, web storage, about:blank) and kept
+# while fewer than driver_pool_size sessions are idle. With driver_tabs
+# on, each test instead gets a new tab of the pooled browser, which is
+# closed on release. Sessions that fail to reset are quit.
+
+class DriverPool:
+    """Idle WebDriver sessions reused across tests in this process"""
+
+    def __init__(self, size, tabs=False, factory=None):
+        self.size = size
+        self.tabs = tabs
+        self.factory = factory or create_driver
+        self.created = 0
+        self._idle = []
+
+    def acquire(self):
+        """Return an idle session (or a new one), in a fresh tab when tabs are on"""
+        if self._idle:
+            driver = self._idle.pop()
+        else:
+            driver = self.factory()
+            self.created += 1
+        if self.tabs:
+            driver.switch_to.new_window("tab")
+        return driver
+
+    def release(self, driver):
+        """Reset a borrowed session and keep it for the next test"""
+        try:
+            # Storage is per origin, so it is cleared before leaving the page
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass  # about:blank, data: and file: pages have no storage
+        try:
+            driver.delete_all_cookies()
+            if self.tabs:
+                driver.close()
+                driver.switch_to.window(driver.window_handles[0])
+            else:
+                driver.get("about:blank")
+        except Exception as e:
+            logger.log_info("Discarding pooled browser that could not be reset: %s", e)
+            self._quit(driver)
+            return
+        if len(self._idle) < self.size:
+            self._idle.append(driver)
+        else:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.log_error("Could not quit browser: %s", e)
+
+    def close(self):
+        """Quit every idle session"""
+        while self._idle:
+            self._quit(self._idle.pop())
+
+
+_pool = None
+
+
+def get_driver_pool(settings=None):
+    """The process-wide pool, or None when driver_pool_size is 0"""
+    global _pool
+    settings = settings or Config.settings()
+    if settings.driver_pool_size <= 0:
+        return None
+    if _pool is None:
+        _pool = DriverPool(settings.driver_pool_size, settings.driver_tabs)
+    return _pool
+
+
+def close_driver_pool():
+    """Quit the pooled browsers (at the end of the session)"""
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
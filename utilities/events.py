@@ -0,0 +1,256 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from utilities.config import Config
+
+# ============================================================
+# Structured page events
+# ============================================================
+# BasePage reports every find/click/type/wait as a PageEvent. Successful
+# operations are emitted at DEBUG and failures at WARNING, so with the
+# default level only failures are recorded. The level check is the only
+# work done when an event is filtered out: the event object, its dict and
+# its JSON line are never built.
+#
+#   QA_EVENT_LEVEL=DEBUG   record every operation
+#   QA_EVENT_LEVEL=OFF     record nothing
+#
+# Events are serialized as one JSON object per line into
+# reports/events/events_<run_id>_<worker>.jsonl by a background thread.
+
+EVENT_LOGGER_NAME = "qa.events"
+EVENTS_DIR_NAME = "events"
+
+_event_logger = logging.getLogger(EVENT_LOGGER_NAME)
+_event_logger.propagate = False
+_lock = threading.Lock()
+_listener = None
+_owner_pid = None
+
+
+class PageEvent:
+    """A single timed page-object operation"""
+
+    __slots__ = ("timestamp", "operation", "locator", "duration_ms",
+                 "outcome", "test_id", "page", "detail")
+
+    def __init__(self, operation, locator, duration_ms, outcome,
+                 test_id="", page="", detail=None):
+        self.timestamp = time.time()
+        self.operation = operation
+        self.locator = locator
+        self.duration_ms = duration_ms
+        self.outcome = outcome
+        self.test_id = test_id
+        self.page = page
+        self.detail = detail or {}
+
+    def to_dict(self):
+        """Return the event as a JSON-serializable dict"""
+        return {
+            "ts": round(self.timestamp, 6),
+            "op": self.operation,
+            "locator": format_locator(self.locator),
+            "duration_ms": round(self.duration_ms, 3),
+            "outcome": self.outcome,
+            "test_id": self.test_id,
+            "page": self.page,
+            "worker": os.environ.get("PYTEST_XDIST_WORKER", "main"),
+            **self.detail,
+        }
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Serialize the PageEvent attached to a record as one JSON line"""
+
+    def format(self, record):
+        event = getattr(record, "event", None)
+        if event is None:
+            return json.dumps({"message": record.getMessage()})
+        return json.dumps(event.to_dict(), default=str)
+
+
+def format_locator(locator):
+    """Render a (By, value) tuple as 'by=value'"""
+    if isinstance(locator, (tuple, list)) and len(locator) == 2:
+        return f"{locator[0]}={locator[1]}"
+    return str(locator) if locator is not None else ""
+
+
+def current_test_id():
+    """Return the node id of the test pytest is currently running"""
+    current = os.environ.get("PYTEST_CURRENT_TEST", "")
+    return current.rsplit(" (", 1)[0]
+
+
+def get_run_id():
+    """Return the id shared by every process taking part in this run"""
+    run_id = os.environ.get("QA_RUN_ID")
+    if not run_id:
+        # The pid keeps runs started within the same second apart
+        run_id = f"{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}"
+        os.environ["QA_RUN_ID"] = run_id
+    return run_id
+
+
+def get_events_dir():
+    """Return the directory holding per-run event files"""
+    return Path(Config.REPORTS_DIR) / EVENTS_DIR_NAME
+
+
+def get_events_file():
+    """Return the JSONL file events from this process are written to"""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    return get_events_dir() / f"events_{get_run_id()}_{worker}.jsonl"
+
+
+def configure_events(level=None):
+    """Set the event level from the argument or QA_EVENT_LEVEL"""
+    level = (level or os.environ.get("QA_EVENT_LEVEL", "INFO")).upper()
+    if level == "OFF":
+        _event_logger.setLevel(logging.CRITICAL + 1)
+    else:
+        _event_logger.setLevel(getattr(logging, level, logging.INFO))
+
+
+def events_enabled(level=logging.DEBUG):
+    """Return True if events at the given level would be recorded"""
+    return _event_logger.isEnabledFor(level)
+
+
+def _ensure_writer():
+    """Start the background JSONL writer once per process"""
+    global _listener, _owner_pid
+
+    if _listener is not None and _owner_pid == os.getpid():
+        return
+
+    with _lock:
+        if _listener is not None and _owner_pid == os.getpid():
+            return
+
+        events_file = get_events_file()
+        events_file.parent.mkdir(parents=True, exist_ok=True)
+
+        file_handler = logging.FileHandler(events_file, encoding="utf-8", delay=True)
+        file_handler.setFormatter(JsonLineFormatter())
+
+        event_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(event_queue, file_handler)
+        listener.events_file = events_file
+        listener.start()
+
+        _event_logger.handlers.clear()
+        _event_logger.addHandler(logging.handlers.QueueHandler(event_queue))
+        _listener = listener
+        _owner_pid = os.getpid()
+
+
+def shutdown_events():
+    """Flush pending events and stop the background writer"""
+    global _listener, _owner_pid
+
+    with _lock:
+        if _listener is not None and _owner_pid == os.getpid():
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+        _event_logger.handlers.clear()
+        _listener = None
+        _owner_pid = None
+
+
+atexit.register(shutdown_events)
+
+
+def record_event(operation, locator, started, outcome="ok", page="", **detail):
+    """
+    Record a page operation that began at time.perf_counter() == started
+
+    Returns immediately when the event's level is disabled.
+    """
+    level = logging.DEBUG if outcome == "ok" else logging.WARNING
+    if not _event_logger.isEnabledFor(level):
+        return
+
+    _ensure_writer()
+    event = PageEvent(
+        operation,
+        locator,
+        (time.perf_counter() - started) * 1000,
+        outcome,
+        test_id=current_test_id(),
+        page=page,
+        detail=detail,
+    )
+    _event_logger.log(level, "%s %s", operation, outcome, extra={"event": event})
+
+
+# ============================================================
+# Querying
+# ============================================================
+def find_event_files(run_id=None):
+    """Return event files for a run (or the latest run), newest first"""
+    events_dir = get_events_dir()
+    if not events_dir.exists():
+        return []
+
+    files = sorted(events_dir.glob("events_*.jsonl"), key=lambda p: p.name, reverse=True)
+    if run_id is None and files:
+        run_id = event_file_run_id(files[0])
+    return [f for f in files if f.name.startswith(f"events_{run_id}_")]
+
+
+def event_file_run_id(path):
+    """Extract the run id from an events_<run_id>_<worker>.jsonl file name"""
+    return Path(path).stem[len("events_"):].rsplit("_", 1)[0]
+
+
+def iter_events(paths, operation=None, outcome=None, test_id=None):
+    """Stream events from JSONL files, optionally filtered"""
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if operation and event.get("op") != operation:
+                    continue
+                if outcome and event.get("outcome") != outcome:
+                    continue
+                if test_id and event.get("test_id") != test_id:
+                    continue
+                yield event
+
+
+def summarize_events(events):
+    """Aggregate events into per-operation counts and timings"""
+    summary = defaultdict(lambda: {"count": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0})
+    for event in events:
+        stats = summary[event["op"]]
+        stats["count"] += 1
+        stats["total_ms"] += event["duration_ms"]
+        stats["max_ms"] = max(stats["max_ms"], event["duration_ms"])
+        if event["outcome"] != "ok":
+            stats["failures"] += 1
+
+    result = {}
+    for operation, stats in summary.items():
+        result[operation] = {
+            "count": stats["count"],
+            "failures": stats["failures"],
+            "avg_ms": round(stats["total_ms"] / stats["count"], 3),
+            "max_ms": round(stats["max_ms"], 3),
+        }
+    return result
+
+
+configure_events()
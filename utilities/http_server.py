@@ -0,0 +1,503 @@
+import asyncio
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import re
+import shutil
+import threading
+import traceback
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+from utilities.logger import get_logger
+
+# ============================================================
+# Minimal asyncio HTTP/1.1 server
+# ============================================================
+# Used by dashboard.py in place of socketserver.TCPServer, which handled
+# one connection at a time. Every connection is a coroutine on one event
+# loop, so a slow client or a long report generation never blocks the
+# other clients.
+#
+# Handlers take a Request and return a Response. Coroutine handlers run on
+# the loop; plain functions run in the default thread pool so file and
+# directory access does not stall it. Long operations are started with
+# server.spawn() and keep running after the response is sent.
+#
+# Supported: keep-alive, Content-Length bodies, HEAD, exact and prefix
+# routes. Not supported: chunked request bodies, TLS, HTTP/2.
+#
+# Files are returned as FileResponse and written with loop.sendfile()
+# (os.sendfile where the transport allows it, bounded chunks otherwise),
+# so memory per request does not grow with the file. file_response()
+# adds ETag/Last-Modified validation, single byte ranges, and a gzip
+# sibling (<file>.gz) generated once per file version for text types.
+# CachedContent does the same for bodies rendered once and kept in memory.
+# StreamResponse sends an async iterator's chunks until it ends (SSE).
+
+logger = get_logger("HTTPServer")
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 15
+SERVER_NAME = "HCLTechDashboard/1.0"
+
+# Text types served from a precompressed <file>.gz sibling
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/x-ndjson")
+MIN_COMPRESS_BYTES = 1024
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class HTTPError(Exception):
+    """Raised by handlers (or the parser) to send an error response"""
+
+    def __init__(self, status, message=None):
+        super().__init__(message or HTTPStatus(status).phrase)
+        self.status = status
+        self.message = message or HTTPStatus(status).phrase
+
+
+class Request:
+    """A parsed HTTP request"""
+
+    __slots__ = ("method", "target", "path", "query", "version", "headers", "body", "params")
+
+    def __init__(self, method, target, version, headers, body=b""):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        self.body = body
+        url = urlsplit(target)
+        self.path = unquote(url.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.params = {}
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self):
+        return json.loads(self.body or b"null")
+
+
+class Response:
+    """An HTTP response with a complete body"""
+
+    __slots__ = ("status", "body", "headers")
+
+    def __init__(self, body=b"", status=200, headers=None, content_type="text/plain; charset=utf-8"):
+        self.status = status
+        self.body = body.encode("utf-8") if isinstance(body, str) else body
+        self.headers = {"Content-Type": content_type}
+        self.headers.update(headers or {})
+
+
+class FileResponse(Response):
+    """A response whose body is sent from a file, optionally a byte range of it"""
+
+    __slots__ = ("path", "offset", "length")
+
+    def __init__(self, path, status=200, headers=None, content_type="application/octet-stream",
+                 offset=0, length=None):
+        super().__init__(b"", status=status, headers=headers, content_type=content_type)
+        self.path = path
+        self.offset = offset
+        self.length = os.path.getsize(path) - offset if length is None else length
+
+
+class StreamResponse(Response):
+    """A response whose body is produced by an async iterator of bytes
+
+    Sent without Content-Length; the connection closes when the iterator
+    ends or the client goes away (used for Server-Sent Events).
+    """
+
+    __slots__ = ("stream",)
+
+    def __init__(self, stream, status=200, headers=None, content_type="text/event-stream"):
+        super().__init__(b"", status=status, headers={"Cache-Control": "no-cache", **(headers or {})},
+                         content_type=content_type)
+        self.stream = stream
+
+
+def sse_message(event, data):
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode("utf-8")
+
+
+def json_response(data, status=200, headers=None):
+    """Serialize data as a JSON response (CORS-enabled, like the old handler)"""
+    return Response(
+        json.dumps(data, default=str), status=status,
+        headers={"Access-Control-Allow-Origin": "*", **(headers or {})},
+        content_type="application/json",
+    )
+
+
+def html_response(html, status=200):
+    return Response(html, status=status, content_type="text/html; charset=utf-8")
+
+
+def error_response(status, message=None):
+    message = message or HTTPStatus(status).phrase
+    body = f"<html><body><h1>{status} {HTTPStatus(status).phrase}</h1><p>{message}</p></body></html>"
+    return html_response(body, status=status)
+
+
+def _etag(stat, variant=""):
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{variant}"'
+
+
+def _etag_matches(if_none_match, etag):
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _not_modified(request, etag, stat):
+    """Evaluate If-None-Match / If-Modified-Since against the file"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(stat.st_mtime) <= since
+    return False
+
+
+def _byte_range(header, size):
+    """Parse a single 'bytes=' range; return (offset, length) or raise 416"""
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        raise HTTPError(416)
+    start, end = match.groups()
+    if start == "":
+        # Suffix range: the last N bytes
+        length = min(int(end), size)
+        if length == 0:
+            raise HTTPError(416)
+        return size - length, length
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or end < start:
+        raise HTTPError(416)
+    return start, end - start + 1
+
+
+def _gzip_sibling(path, stat):
+    """Return <path>.gz for this version of the file, creating it if needed"""
+    compressed = f"{path}.gz"
+    try:
+        if os.stat(compressed).st_mtime_ns == stat.st_mtime_ns:
+            return compressed
+    except FileNotFoundError:
+        pass
+
+    tmp_file = f"{compressed}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(path, "rb") as source, gzip.open(tmp_file, "wb", compresslevel=6) as target:
+            shutil.copyfileobj(source, target, 256 * 1024)
+        # The sibling carries the source mtime so a rewrite invalidates it
+        os.utime(tmp_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_file, compressed)
+    except OSError:
+        if os.path.exists(tmp_file):
+            os.unlink(tmp_file)
+        return None
+    return compressed
+
+
+def file_response(request, path, content_type="application/octet-stream",
+                  cache_control="no-cache"):
+    """
+    Build a conditional, range-aware FileResponse for a file on disk
+
+    Returns 304 when the client's ETag or date is current, 206 for a
+    satisfiable Range request, and the gzip sibling when the client
+    accepts gzip and the type is compressible. Call from a plain (thread
+    pool) handler: it stats the file and may compress it.
+    """
+    path = str(path)
+    stat = os.stat(path)
+    headers = {
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+
+    compressible = content_type.startswith(COMPRESSIBLE_TYPES) and stat.st_size >= MIN_COMPRESS_BYTES
+    if compressible:
+        headers["Vary"] = "Accept-Encoding"
+    wants_gzip = compressible and "gzip" in request.headers.get("accept-encoding", "") \
+        and "range" not in request.headers
+
+    etag = _etag(stat, "-gz" if wants_gzip else "")
+    headers["ETag"] = etag
+    if _not_modified(request, etag, stat):
+        return Response(b"", status=304, headers=headers, content_type=content_type)
+
+    range_header = request.headers.get("range")
+    if range_header and request.headers.get("if-range", etag) in (etag, headers["Last-Modified"]):
+        try:
+            offset, length = _byte_range(range_header, stat.st_size)
+        except HTTPError:
+            return Response(b"", status=416, content_type=content_type,
+                            headers={"Content-Range": f"bytes */{stat.st_size}"})
+        headers["Content-Range"] = f"bytes {offset}-{offset + length - 1}/{stat.st_size}"
+        return FileResponse(path, status=206, headers=headers, content_type=content_type,
+                            offset=offset, length=length)
+
+    if wants_gzip:
+        compressed = _gzip_sibling(path, stat)
+        if compressed:
+            headers["Content-Encoding"] = "gzip"
+            return FileResponse(compressed, headers=headers, content_type=content_type)
+        headers["ETag"] = _etag(stat)
+
+    return FileResponse(path, headers=headers, content_type=content_type)
+
+
+class CachedContent:
+    """
+    A body rendered once and served from memory
+
+    The ETag is a hash of the content and the gzip copy is compressed up
+    front, so a request costs a header comparison and no rendering. Use
+    for pages and assets that change only when the server restarts.
+    """
+
+    def __init__(self, body, content_type, cache_control="no-cache"):
+        self.body = body.encode("utf-8") if isinstance(body, str) else body
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()[:16]}"'
+        self.gzipped = None
+        if content_type.startswith(COMPRESSIBLE_TYPES) and len(self.body) >= MIN_COMPRESS_BYTES:
+            self.gzipped = gzip.compress(self.body, compresslevel=9)
+
+    def response(self, request):
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        body = self.body
+        if self.gzipped is not None:
+            headers["Vary"] = "Accept-Encoding"
+            if "gzip" in request.headers.get("accept-encoding", ""):
+                headers["ETag"] = f'{self.etag[:-1]}-gz"'
+                headers["Content-Encoding"] = "gzip"
+                body = self.gzipped
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and _etag_matches(if_none_match, headers["ETag"]):
+            headers.pop("Content-Encoding", None)
+            return Response(b"", status=304, headers=headers, content_type=self.content_type)
+        return Response(body, headers=headers, content_type=self.content_type)
+
+
+class HTTPServer:
+    """Route table plus an asyncio connection loop"""
+
+    def __init__(self, host="localhost", port=8080):
+        self.host = host
+        self.port = port
+        self._routes = {}
+        self._prefix_routes = []
+        self._tasks = set()
+        self._server = None
+
+    # ------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------
+    def route(self, path, handler, methods=("GET",)):
+        """Register a handler for an exact path"""
+        for method in methods:
+            self._routes[(method, path)] = handler
+
+    def route_prefix(self, prefix, handler, methods=("GET",)):
+        """Register a handler for every path starting with prefix"""
+        self._prefix_routes.append((prefix, tuple(methods), handler))
+        self._prefix_routes.sort(key=lambda item: len(item[0]), reverse=True)
+
+    def _resolve(self, method, path):
+        lookup = "GET" if method == "HEAD" else method
+        handler = self._routes.get((lookup, path))
+        if handler:
+            return handler
+        for prefix, methods, handler in self._prefix_routes:
+            if path.startswith(prefix) and lookup in methods:
+                return handler
+        if any(route_path == path for _, route_path in self._routes):
+            raise HTTPError(405)
+        raise HTTPError(404, "Not Found")
+
+    async def dispatch(self, request):
+        """Run the matching handler and return its Response"""
+        try:
+            handler = self._resolve(request.method, request.path)
+            if inspect.iscoroutinefunction(handler):
+                response = await handler(request)
+            else:
+                response = await asyncio.to_thread(handler, request)
+        except HTTPError as e:
+            return error_response(e.status, e.message)
+        except Exception as e:
+            logger.log_error("Handler error for %s %s: %s", request.method, request.path, e)
+            logger.log_debug("%s", traceback.format_exc())
+            return error_response(500, f"Server Error: {e}")
+        return response
+
+    # ------------------------------------------------------------
+    # Background tasks
+    # ------------------------------------------------------------
+    def spawn(self, coroutine, name=None):
+        """Run a coroutine in the background, keeping a reference until done"""
+        task = asyncio.get_running_loop().create_task(coroutine, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.log_error("Background task %s failed: %s", task.get_name(), task.exception())
+
+    @property
+    def background_tasks(self):
+        return [task.get_name() for task in self._tasks]
+
+    # ------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------
+    async def _read_request(self, reader):
+        try:
+            head = await asyncio.wait_for(
+                reader.readuntil(b"\r\n\r\n"), timeout=KEEP_ALIVE_TIMEOUT
+            )
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(501, "Chunked request bodies are not supported")
+        length = headers.get("content-length") or "0"
+        if not (length.isascii() and length.isdigit()):
+            raise HTTPError(400, "Invalid Content-Length")
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413)
+        body = await reader.readexactly(length) if length else b""
+
+        return Request(method.upper(), target, version, headers, body)
+
+    @staticmethod
+    def _head(response, keep_alive):
+        status = HTTPStatus(response.status)
+        headers = dict(response.headers)
+        if status != HTTPStatus.NOT_MODIFIED and not isinstance(response, StreamResponse):
+            length = response.length if isinstance(response, FileResponse) else len(response.body)
+            headers["Content-Length"] = str(length)
+        headers["Server"] = SERVER_NAME
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        head = f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        return (head + "\r\n").encode("latin-1")
+
+    async def _write_response(self, writer, request, response, keep_alive):
+        writer.write(self._head(response, keep_alive))
+        send_body = request is None or request.method != "HEAD"
+
+        if isinstance(response, StreamResponse):
+            await writer.drain()
+            try:
+                if send_body:
+                    async for chunk in response.stream:
+                        if writer.transport.is_closing():
+                            break
+                        writer.write(chunk)
+                        await writer.drain()
+            finally:
+                await response.stream.aclose()
+            return
+        elif isinstance(response, FileResponse):
+            await writer.drain()
+            if send_body and response.length:
+                # Opening can block on slow or network filesystems
+                loop = asyncio.get_running_loop()
+                f = await loop.run_in_executor(None, open, response.path, "rb")
+                try:
+                    await loop.sendfile(writer.transport, f, response.offset, response.length)
+                finally:
+                    f.close()
+        elif send_body and response.status != 304:
+            writer.write(response.body)
+        await writer.drain()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = None
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    response = await self.dispatch(request)
+                    keep_alive = request.keep_alive and not isinstance(response, StreamResponse)
+                except HTTPError as e:
+                    response = error_response(e.status, e.message)
+                    keep_alive = False
+
+                await self._write_response(writer, request, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self):
+        """Bind the listening socket"""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port,
+            limit=MAX_HEADER_BYTES, reuse_address=True, backlog=512,
+        )
+        return self._server
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting connections and cancel background tasks"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._tasks):
+            task.cancel()
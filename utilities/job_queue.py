@@ -0,0 +1,205 @@
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime
+from utilities.logger import get_logger
+
+# ============================================================
+# Run scheduler
+# ============================================================
+# Queues dashboard-triggered test runs instead of starting a thread per
+# click. At most max_running jobs execute at once; the rest wait in a
+# bounded priority queue (higher priority first, FIFO within a priority).
+#
+# Submitting a job whose key matches a job that is still queued returns
+# the queued job instead of adding another ("coalescing"), so repeated
+# clicks on "Run All Tests" cost one run. Queued jobs are cancelled by
+# removing them; running jobs through the cancel callback (the warm
+# runner kills the run's whole process group).
+
+logger = get_logger("JobQueue")
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED = "finished"
+FAILED = "failed"
+CANCELLED = "cancelled"
+HISTORY_SIZE = 50
+
+
+class QueueFullError(Exception):
+    """Raised when the pending queue is at its limit"""
+
+
+class Job:
+    """One scheduled run"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, kind, key=None, priority=0, payload=None):
+        self.id = f"{kind}-{next(self._ids)}-{datetime.now().strftime('%H%M%S')}"
+        self.kind = kind
+        self.key = key or kind
+        self.priority = priority
+        self.payload = payload or {}
+        self.state = QUEUED
+        self.requests = 1
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.cancel_requested = False
+        self.task = None
+
+    @property
+    def done(self):
+        return self.state in (FINISHED, FAILED, CANCELLED)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "key": self.key,
+            "priority": self.priority,
+            "state": self.state,
+            "requests": self.requests,
+            "created": datetime.fromtimestamp(self.created).isoformat(),
+            "started": datetime.fromtimestamp(self.started).isoformat() if self.started else None,
+            "finished": datetime.fromtimestamp(self.finished).isoformat() if self.finished else None,
+            "wait_seconds": round((self.started or time.time()) - self.created, 1),
+            "run_seconds": round((self.finished or time.time()) - self.started, 1) if self.started else None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobScheduler:
+    """Bounded, deduplicating priority queue of runs on an asyncio loop"""
+
+    def __init__(self, execute, cancel_running=None, max_running=1, max_queued=10):
+        """
+        Args:
+            execute: blocking function(job) -> JSON-serializable result,
+                     run in a worker thread; a result dict with a true
+                     "cancelled" marks the job cancelled
+            cancel_running: function(job) -> bool that stops a running job
+            max_running: jobs allowed to execute at the same time
+            max_queued: pending jobs allowed before submit() is refused
+        """
+        self.execute = execute
+        self.cancel_running = cancel_running
+        self.max_running = max(1, max_running)
+        self.max_queued = max_queued
+        self.jobs = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._pending = {}   # key -> queued job
+        self._running = set()
+
+    # ------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------
+    def submit(self, kind, key=None, priority=0, payload=None):
+        """Queue a job; return (job, coalesced)"""
+        key = key or kind
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending.requests += 1
+            if priority > pending.priority:
+                # Re-queue at the higher priority; the old heap entry is skipped
+                pending.priority = priority
+                heapq.heappush(self._heap, (-priority, next(self._sequence), pending))
+            return pending, True
+
+        if len(self._pending) >= self.max_queued:
+            raise QueueFullError(f"{len(self._pending)} jobs already queued")
+
+        job = Job(kind, key, priority, payload)
+        self.jobs[job.id] = job
+        self._pending[key] = job
+        heapq.heappush(self._heap, (-priority, next(self._sequence), job))
+        self._trim_history()
+        self._pump()
+        return job, False
+
+    def position(self, job):
+        """1-based position of a queued job, or None"""
+        if job.state != QUEUED:
+            return None
+        ahead = sorted(
+            (-j.priority, j.created, j.id) for j in self._pending.values()
+        )
+        return ahead.index((-job.priority, job.created, job.id)) + 1
+
+    # ------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------
+    def _next_job(self):
+        while self._heap:
+            negative_priority, _, job = heapq.heappop(self._heap)
+            # Skip cancelled jobs and entries superseded by a priority bump
+            if job.state == QUEUED and -negative_priority == job.priority:
+                return job
+        return None
+
+    def _pump(self):
+        while len(self._running) < self.max_running:
+            job = self._next_job()
+            if job is None:
+                return
+            del self._pending[job.key]
+            job.state = RUNNING
+            job.started = time.time()
+            self._running.add(job)
+            job.task = asyncio.get_running_loop().create_task(self._run(job), name=f"job-{job.id}")
+
+    async def _run(self, job):
+        try:
+            job.result = await asyncio.to_thread(self.execute, job)
+            # Only a run that was actually stopped counts as cancelled: a
+            # cancel that came too late lets the run finish normally
+            stopped = isinstance(job.result, dict) and job.result.get("cancelled")
+            job.state = CANCELLED if stopped else FINISHED
+        except Exception as e:
+            logger.log_error("Job %s failed: %s", job.id, e)
+            job.error = f"{type(e).__name__}: {e}"
+            job.state = FAILED
+        finally:
+            job.finished = time.time()
+            self._running.discard(job)
+            self._pump()
+
+    # ------------------------------------------------------------
+    # Cancellation and status
+    # ------------------------------------------------------------
+    def cancel(self, job_id):
+        """Cancel a queued or running job; return the job or None"""
+        job = self.jobs.get(job_id)
+        if job is None or job.done:
+            return job
+        job.cancel_requested = True
+        if job.state == QUEUED:
+            del self._pending[job.key]
+            job.state = CANCELLED
+            job.finished = time.time()
+        elif self.cancel_running is not None:
+            self.cancel_running(job)
+        return job
+
+    def _trim_history(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:-HISTORY_SIZE]:
+            del self.jobs[job_id]
+
+    def status(self):
+        """Snapshot for /api/jobs"""
+        jobs = sorted(self.jobs.values(), key=lambda j: j.created, reverse=True)
+        return {
+            "max_running": self.max_running,
+            "max_queued": self.max_queued,
+            "running": len(self._running),
+            "queued": len(self._pending),
+            "jobs": [dict(job.to_dict(), position=self.position(job)) for job in jobs],
+        }
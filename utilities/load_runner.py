@@ -0,0 +1,477 @@
+import asyncio
+import math
+import random
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import Counter
+from contextlib import contextmanager
+from http.cookiejar import CookieJar
+import numpy as np
+from utilities.config import Config
+from utilities.logger import get_logger
+
+# ============================================================
+# Virtual-user load runner
+# ============================================================
+# Drives the login flow with N concurrent virtual users, each on its own
+# thread, and records every step's latency:
+#
+#   BrowserUser    a (headless) WebDriver session running the page objects:
+#                  LoginPage(driver), login(), is_login_successful()
+#   ProtocolUser   plain HTTP with a cookie jar: GET the login page, POST
+#                  the form, follow the redirect to the inventory page.
+#                  Needs a server-rendered login form (StandInServer, or
+#                  staging apps that post their login form)
+#
+# Users start and stop according to stages of (target users, seconds),
+# k6-style: [(20, 30), (20, 60), (0, 10)] ramps to 20 users over 30s,
+# holds for a minute and ramps down over 10s. Between iterations a user
+# sleeps a random think time. An iteration that is running when its user
+# is due to stop is finished, not interrupted.
+#
+# Latencies go into LatencyHistogram, a fixed array of log-spaced
+# buckets (about 2% wide), so memory does not grow with the number of
+# requests and per-user histograms merge by adding their arrays.
+# StandInServer serves a login page, form POST and inventory page on the
+# dashboard's asyncio server so the runner can be exercised locally. It
+# has SauceDemo's accounts and error messages, so the login and demo
+# tests also pass against it (benchmark_suite.py uses it that way).
+
+logger = get_logger("LoadRunner")
+
+# Histogram range and resolution
+MIN_LATENCY_MS = 0.01
+MAX_LATENCY_MS = 600_000.0
+BUCKETS_PER_DOUBLING = 32
+BUCKET_COUNT = math.ceil(math.log2(MAX_LATENCY_MS / MIN_LATENCY_MS) * BUCKETS_PER_DOUBLING) + 1
+BUCKET_UPPER_MS = MIN_LATENCY_MS * np.exp2(np.arange(1, BUCKET_COUNT + 1) / BUCKETS_PER_DOUBLING)
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Latency counts in log-spaced buckets backed by a NumPy array"""
+
+    def __init__(self):
+        self.counts = np.zeros(BUCKET_COUNT, dtype=np.int64)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @staticmethod
+    def bucket(latency_ms):
+        if latency_ms <= MIN_LATENCY_MS:
+            return 0
+        return min(int(math.log2(latency_ms / MIN_LATENCY_MS) * BUCKETS_PER_DOUBLING), BUCKET_COUNT - 1)
+
+    def record(self, latency_ms):
+        self.counts[self.bucket(latency_ms)] += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def record_many(self, latencies_ms):
+        """Record an array of latencies in one vectorized pass"""
+        values = np.asarray(latencies_ms, dtype=np.float64)
+        if not values.size:
+            return
+        ratios = np.maximum(values / MIN_LATENCY_MS, 1.0)
+        buckets = np.minimum((np.log2(ratios) * BUCKETS_PER_DOUBLING).astype(np.int64), BUCKET_COUNT - 1)
+        self.counts += np.bincount(buckets, minlength=BUCKET_COUNT)
+        self.total_ms += float(values.sum())
+        self.max_ms = max(self.max_ms, float(values.max()))
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        return self
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        """Upper bound of the bucket holding the given percentile (ms)"""
+        total = self.count
+        if not total:
+            return 0.0
+        rank = max(math.ceil(percent / 100.0 * total), 1)
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return min(float(BUCKET_UPPER_MS[index]), self.max_ms)
+
+
+# ============================================================
+# Virtual users
+# ============================================================
+class StepFailed(Exception):
+    """A step completed but did not reach the expected state"""
+
+
+class VirtualUser:
+    """Base class: runs iterations of named, timed steps"""
+
+    kind = "user"
+
+    def __init__(self, index, credentials):
+        self.index = index
+        self.username, self.password = credentials
+        self.histograms = {}
+        self.errors = {}
+        self.iterations = 0
+
+    @contextmanager
+    def step(self, name):
+        """Time the block; an exception counts as an error of this step and ends the iteration"""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.errors.setdefault(name, Counter())[type(e).__name__] += 1
+            raise
+        self.histograms.setdefault(name, LatencyHistogram()).record((time.perf_counter() - started) * 1000)
+
+    def start(self):
+        pass
+
+    def iteration(self):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+
+class ProtocolUser(VirtualUser):
+    """Logs in with HTTP requests only: GET the form, POST it, land on the inventory"""
+
+    kind = "protocol"
+
+    def __init__(self, index, credentials, base_url, login_path="/", submit_path="/login", timeout=30):
+        super().__init__(index, credentials)
+        self.login_url = urllib.parse.urljoin(base_url, login_path)
+        self.submit_url = urllib.parse.urljoin(base_url, submit_path)
+        self.timeout = timeout
+        self.opener = None
+
+    def iteration(self):
+        # A fresh cookie jar per iteration: every login starts logged out
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+        with self.step("open"):
+            with self.opener.open(self.login_url, timeout=self.timeout) as response:
+                response.read()
+        with self.step("login"):
+            form = urllib.parse.urlencode({"username": self.username, "password": self.password})
+            with self.opener.open(self.submit_url, data=form.encode(), timeout=self.timeout) as response:
+                response.read()
+                if "inventory" not in response.url:
+                    raise StepFailed(f"Login did not reach the inventory page: {response.url}")
+
+
+class BrowserUser(VirtualUser):
+    """Logs in through the page objects in its own WebDriver session"""
+
+    kind = "browser"
+
+    def __init__(self, index, credentials):
+        super().__init__(index, credentials)
+        self.driver = None
+
+    def start(self):
+        from utilities.driver_factory import create_driver
+        self.driver = create_driver()
+
+    def iteration(self):
+        from pages.login_page import LoginPage
+        self.driver.delete_all_cookies()
+        with self.step("open"):
+            page = LoginPage(self.driver)
+        with self.step("login"):
+            page.login(self.username, self.password)
+        # Not timed: is_login_successful() sleeps before reading the URL
+        if not page.is_login_successful():
+            self.errors.setdefault("login", Counter())["StepFailed"] += 1
+
+    def stop(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+
+def is_browser_user(index, users, browser_users):
+    """Spread browser users evenly among the protocol users"""
+    return (index + 1) * browser_users // users > index * browser_users // users
+
+
+# ============================================================
+# Schedule and runner
+# ============================================================
+def parse_stages(text):
+    """Parse "10:30,10:60,0:10" into [(10, 30.0), (10, 60.0), (0, 10.0)]"""
+    stages = []
+    for part in text.split(","):
+        target, _, seconds = part.strip().partition(":")
+        stages.append((int(target), float(seconds.rstrip("s") or 0)))
+    return stages
+
+
+def user_windows(stages):
+    """
+    Return ([(start, stop), ...] offsets per user, total seconds) for stages
+
+    Within a stage, users are added (or stopped, newest first) at even
+    intervals so the count reaches the stage's target at its end.
+    """
+    windows = []
+    running = []
+    current = 0
+    offset = 0.0
+    for target, seconds in stages:
+        if target > current:
+            for n in range(target - current):
+                windows.append([offset + seconds * n / (target - current), None])
+                running.append(len(windows) - 1)
+        elif target < current:
+            for n in range(current - target):
+                windows[running.pop()][1] = offset + seconds * (n + 1) / (current - target)
+        current = target
+        offset += seconds
+    for index in running:
+        windows[index][1] = offset
+    return [tuple(window) for window in windows], offset
+
+
+class LoadReport:
+    """Merged histograms and errors of a finished load run"""
+
+    def __init__(self, users, elapsed):
+        self.elapsed = elapsed
+        self.users = Counter(user.kind for user in users)
+        self.iterations = sum(user.iterations for user in users)
+        self.histograms = {}
+        self.errors = {}
+        for user in users:
+            for name, histogram in user.histograms.items():
+                self.histograms.setdefault(name, LatencyHistogram()).merge(histogram)
+            for name, errors in user.errors.items():
+                self.errors.setdefault(name, Counter()).update(errors)
+
+    def steps(self):
+        """Per-step count, errors, throughput and latency percentiles"""
+        names = list(self.histograms) + [name for name in self.errors if name not in self.histograms]
+        summary = {}
+        for name in names:
+            histogram = self.histograms.get(name, LatencyHistogram())
+            stats = {
+                "count": histogram.count,
+                "errors": sum(self.errors.get(name, {}).values()),
+                "throughput_per_s": round(histogram.count / self.elapsed, 2) if self.elapsed else 0.0,
+                "mean_ms": round(histogram.mean_ms, 2),
+                "max_ms": round(histogram.max_ms, 2),
+            }
+            for percent in PERCENTILES:
+                stats[f"p{percent}_ms"] = round(histogram.percentile(percent), 2)
+            summary[name] = stats
+        return summary
+
+    def to_dict(self):
+        return {
+            "elapsed": round(self.elapsed, 3),
+            "users": dict(self.users),
+            "iterations": self.iterations,
+            "iterations_per_s": round(self.iterations / self.elapsed, 2) if self.elapsed else 0.0,
+            "steps": self.steps(),
+            "errors": {name: dict(errors) for name, errors in self.errors.items()},
+        }
+
+    def format_table(self):
+        """Lines of a plain-text summary table"""
+        lines = [f"{'step':<10}{'count':>8}{'errors':>8}{'req/s':>9}"
+                 + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES) + f"{'max ms':>10}"]
+        for name, stats in self.steps().items():
+            lines.append(f"{name:<10}{stats['count']:>8}{stats['errors']:>8}{stats['throughput_per_s']:>9}"
+                         + "".join(f"{stats[f'p{p}_ms']:>10}" for p in PERCENTILES)
+                         + f"{stats['max_ms']:>10}")
+        return lines
+
+
+class LoadRunner:
+    """Starts one thread per virtual user and stops them on schedule"""
+
+    def __init__(self, user_factory, stages, think_time=(0.0, 0.0), seed=None):
+        self.user_factory = user_factory
+        self.windows, self.duration = user_windows(stages)
+        self.think_time = think_time
+        self.seed = seed
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Ask every user to stop after its current iteration"""
+        self._stop.set()
+
+    def _run_user(self, user, start, stop, began):
+        rng = random.Random(None if self.seed is None else self.seed + user.index)
+        if self._stop.wait(max(0.0, began + start - time.monotonic())):
+            return
+        try:
+            user.start()
+        except Exception as e:
+            logger.log_error("Virtual user %d (%s) could not start: %s", user.index, user.kind, e)
+            user.errors.setdefault("start", Counter())[type(e).__name__] += 1
+            return
+        try:
+            while time.monotonic() - began < stop and not self._stop.is_set():
+                try:
+                    user.iteration()
+                except Exception as e:
+                    logger.log_debug("Virtual user %d iteration failed: %s", user.index, e)
+                user.iterations += 1
+                if self._stop.wait(rng.uniform(*self.think_time)):
+                    break
+        finally:
+            user.stop()
+
+    def run(self):
+        """Run the schedule to completion; returns a LoadReport"""
+        users = [self.user_factory(index) for index in range(len(self.windows))]
+        began = time.monotonic()
+        threads = [
+            threading.Thread(target=self._run_user, args=(user, start, stop, began),
+                             name=f"vu-{user.index}", daemon=True)
+            for user, (start, stop) in zip(users, self.windows)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return LoadReport(users, time.monotonic() - began)
+
+
+# ============================================================
+# Stand-in application
+# ============================================================
+LOGIN_FORM = """<!DOCTYPE html>
+<html><head><title>Swag Labs</title></head>
+<body>
+<div id="login_button_container">
+<form method="post" action="/login">
+<input id="user-name" name="username" type="text">
+<input id="password" name="password" type="password">
+{error}
+<input id="login-button" type="submit" value="Login">
+</form>
+</div>
+</body></html>
+"""
+
+INVENTORY_PAGE = """<!DOCTYPE html>
+<html><head><title>Swag Labs</title></head>
+<body><div id="inventory_container">{items}</div></body></html>
+""".format(items="".join(f'<div class="inventory_item">Product {i}</div>' for i in range(6)))
+
+# SauceDemo's accounts (all share one password) and error messages
+STAND_IN_USERS = ("standard_user", "locked_out_user", "problem_user",
+                  "performance_glitch_user", "error_user", "visual_user")
+STAND_IN_PASSWORD = "secret_sauce"
+ERROR_TEMPLATE = '<h3 data-test="error">Epic sadface: {message}</h3>'
+
+
+class StandInServer:
+    """A local copy of SauceDemo's login flow, served on a background event loop"""
+
+    def __init__(self, users=None, delay=0.0, slow_users=("performance_glitch_user",), slow_delay=1.0,
+                 locked_users=("locked_out_user",)):
+        self.users = users or dict.fromkeys(STAND_IN_USERS, STAND_IN_PASSWORD)
+        self.locked_users = set(locked_users)
+        self.delay = delay
+        self.slow_users = set(slow_users)
+        self.slow_delay = slow_delay
+        self.port = None
+        self.requests = 0
+        self._loop = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}/"
+
+    async def _pause(self, seconds):
+        self.requests += 1
+        if seconds:
+            await asyncio.sleep(seconds)
+
+    async def login_page(self, request):
+        from utilities.http_server import html_response
+        await self._pause(self.delay)
+        return html_response(LOGIN_FORM.format(error=""))
+
+    async def login(self, request):
+        from utilities.http_server import Response, html_response
+        form = urllib.parse.parse_qs(request.body.decode())
+        username = form.get("username", [""])[0]
+        password = form.get("password", [""])[0]
+        await self._pause(self.slow_delay if username in self.slow_users else self.delay)
+        if not username:
+            message = "Username is required"
+        elif not password:
+            message = "Password is required"
+        elif self.users.get(username) != password:
+            message = "Username and password do not match any user in this service"
+        elif username in self.locked_users:
+            message = "Sorry, this user has been locked out."
+        else:
+            message = None
+        if message:
+            return html_response(LOGIN_FORM.format(error=ERROR_TEMPLATE.format(message=message)))
+        return Response(status=303, headers={
+            "Location": "/inventory.html",
+            "Set-Cookie": f"session-username={username}; Path=/",
+        })
+
+    async def inventory(self, request):
+        from utilities.http_server import Response, html_response
+        await self._pause(self.delay)
+        if "session-username=" not in request.headers.get("cookie", ""):
+            return Response(status=303, headers={"Location": "/"})
+        return html_response(INVENTORY_PAGE)
+
+    def start(self):
+        """Serve on a free port in a background thread; returns the base URL"""
+        from utilities.http_server import HTTPServer
+
+        ready = threading.Event()
+
+        async def serve():
+            server = HTTPServer("127.0.0.1", 0)
+            server.route("/", self.login_page)
+            server.route("/login", self.login, methods=("POST",))
+            server.route("/inventory.html", self.inventory)
+            listener = await server.start()
+            self.port = listener.sockets[0].getsockname()[1]
+            self._loop = asyncio.get_running_loop()
+            self._closed = asyncio.Event()
+            ready.set()
+            await self._closed.wait()
+            await server.close()
+
+        self._thread = threading.Thread(target=lambda: asyncio.run(serve()), name="stand-in", daemon=True)
+        self._thread.start()
+        if not ready.wait(10):
+            raise RuntimeError("Stand-in server did not start")
+        return self.base_url
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._closed.set)
+            self._thread.join(10)
+            self._loop = None
+
+
+def default_credentials():
+    """Valid credentials from test_data/credentials.json"""
+    credentials, _ = Config.load_test_data()
+    valid = credentials["valid_credentials"]
+    return valid["username"], valid["password"]
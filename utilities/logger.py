@@ -1,9 +1,122 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
 from utilities.config import Config
 
+# ============================================================
+# Logging backend
+# ============================================================
+# Every TestLogger shares one QueueHandler. Records are pushed onto an
+# in-memory queue by the test thread and written to disk by a single
+# QueueListener thread, so test code never waits on file I/O. Each
+# process (xdist worker or controller) owns exactly one log file.
+
+FILE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+CONSOLE_FORMAT = '%(levelname)s - %(message)s'
+LOG_LEVEL = getattr(logging, os.environ.get("QA_LOG_LEVEL", "DEBUG").upper(), logging.DEBUG)
+
+_registry = {}
+_lock = threading.RLock()
+_queue_handler = None
+_listener = None
+_owner_pid = None
+
+
+def get_worker_id():
+    """Return the xdist worker id, or 'main' outside of xdist"""
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def get_log_file():
+    """Return the log file used by the current process"""
+    _ensure_backend()
+    return _listener.log_file
+
+
+def _build_log_file():
+    """Build a log file name that is unique per worker process"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_dir = Path(Config.LOGS_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return log_dir / f"test_execution_{timestamp}_{get_worker_id()}_{os.getpid()}.log"
+
+
+def _ensure_backend():
+    """Start the queue listener once per process"""
+    global _queue_handler, _listener, _owner_pid
+
+    if _listener is not None and _owner_pid == os.getpid():
+        return _queue_handler
+
+    with _lock:
+        if _listener is not None and _owner_pid == os.getpid():
+            return _queue_handler
+
+        # A forked child inherits the parent's handler but not its
+        # listener thread, so it must start a backend of its own.
+        log_file = _build_log_file()
+
+        file_handler = logging.FileHandler(log_file, encoding="utf-8", delay=True)
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        listener.log_file = log_file
+        listener.start()
+
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        _listener = listener
+        _owner_pid = os.getpid()
+
+        # Re-point loggers inherited across a fork at the new queue
+        for test_logger in _registry.values():
+            test_logger.setup_logger()
+
+        return _queue_handler
+
+
+def shutdown_logging():
+    """Flush pending records and stop the background writer"""
+    global _listener, _queue_handler, _owner_pid
+
+    with _lock:
+        if _listener is not None and _owner_pid == os.getpid():
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+        _listener = None
+        _queue_handler = None
+        _owner_pid = None
+
+
+atexit.register(shutdown_logging)
+
+
+def _after_fork_in_child():
+    """Give a forked child its own backend and re-point cached loggers at it"""
+    global _lock
+    # The parent's lock may have been held by another thread at fork time
+    _lock = threading.RLock()
+    if _listener is not None:
+        _ensure_backend()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
 class TestLogger:
     """Custom logger for test execution tracking"""
     
@@ -13,50 +126,35 @@ class TestLogger:
         self.setup_logger()
     
     def setup_logger(self):
-        """Configure logger with handlers"""
-        # Create unique log file name
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = Config.LOGS_DIR / f"test_execution_{timestamp}.log"
+        """Attach the shared queue handler to the underlying logger"""
+        queue_handler = _ensure_backend()
         
         # Clear any existing handlers
         self.logger.handlers.clear()
         
         # Set logging level
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Create formatters
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_formatter = logging.Formatter(
-            '%(levelname)s - %(message)s'
-        )
-        
-        # File handler
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(file_formatter)
+        self.logger.setLevel(LOG_LEVEL)
         
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(console_formatter)
-        
-        # Add handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        self.logger.addHandler(queue_handler)
     
-    def log_info(self, message):
+    def _log(self, level, message, args):
+        """Prefix the test name; %-style args are formatted only if the level is enabled"""
+        if args:
+            self.logger.log(level, "[%s] " + message, self.test_name, *args)
+        else:
+            self.logger.log(level, "[%s] %s", self.test_name, message)
+    
+    def log_info(self, message, *args):
         """Log informational messages"""
-        self.logger.info(f"[{self.test_name}] {message}")
+        self._log(logging.INFO, message, args)
     
-    def log_error(self, message):
+    def log_error(self, message, *args):
         """Log error messages"""
-        self.logger.error(f"[{self.test_name}] {message}")
+        self._log(logging.ERROR, message, args)
     
-    def log_debug(self, message):
+    def log_debug(self, message, *args):
         """Log debug messages"""
-        self.logger.debug(f"[{self.test_name}] {message}")
+        self._log(logging.DEBUG, message, args)
     
     def log_test_start(self):
         """Log test start information"""
@@ -70,6 +168,17 @@ class TestLogger:
         self.logger.info(f"Test {self.test_name} {status}")
         self.logger.info("=" * 50)
 
-# Global logger instance
+# Global logger registry
 def get_logger(test_name=""):
-    return TestLogger(test_name)
\ No newline at end of file
+    """Return the cached TestLogger for test_name, creating it on first use"""
+    test_logger = _registry.get(test_name)
+    if test_logger is not None:
+        _ensure_backend()  # re-points cached loggers after a fork
+        return test_logger
+
+    with _lock:
+        test_logger = _registry.get(test_name)
+        if test_logger is None:
+            test_logger = TestLogger(test_name)
+            _registry[test_name] = test_logger
+        return test_logger
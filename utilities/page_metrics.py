@@ -0,0 +1,177 @@
+import json
+import time
+from utilities.config import Config
+from utilities.logger import get_logger
+
+# ============================================================
+# Page performance metrics
+# ============================================================
+# With the page_metrics setting on (the "perf" profile turns it on),
+# BasePage.capture_performance() reads timings from the browser after a
+# navigation or a key interaction:
+#
+#   Navigation Timing   ttfb, dom_interactive, dom_content_loaded, load,
+#                       transfer_size of the current document
+#   Paint Timing        first_paint, first_contentful_paint
+#   CDP (Chrome only)   script, layout, recalc_style and task time spent
+#                       since the previous sample, js_heap_used, dom_nodes
+#
+# Times are milliseconds from the start of the navigation. Navigation and
+# paint values are only reported for a document that has not been sampled
+# yet, so an interaction that stays on the page records only CDP values.
+#
+# Samples are kept per test. PageMetricsPlugin
+# (utilities/page_metrics_plugin.py, so BasePage imports this module
+# without pytest) attaches them to the report as the "page_metrics" user property, which the results
+# collector passes on to the results history and the compact report,
+# and checks them against test_data/performance_budgets.json:
+#
+#   {"LoginPage": {"navigate": {"dom_content_loaded": 800}}}
+#
+# A test whose samples exceed a budget fails after its own assertions
+# have passed, with one line per exceeded metric.
+
+logger = get_logger("PageMetrics")
+
+USER_PROPERTY = "page_metrics"
+
+COLLECT_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const paint = {};
+for (const entry of performance.getEntriesByType('paint')) paint[entry.name] = entry.startTime;
+return {
+    origin: performance.timeOrigin,
+    url: location.href,
+    navigation: nav ? {
+        ttfb: nav.responseStart,
+        dom_interactive: nav.domInteractive,
+        dom_content_loaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd,
+        transfer_size: nav.transferSize,
+    } : null,
+    first_paint: paint['first-paint'],
+    first_contentful_paint: paint['first-contentful-paint'],
+};
+"""
+
+# CDP Performance.getMetrics name -> (metric name, scale, reported as delta)
+CDP_METRICS = {
+    "ScriptDuration": ("script_ms", 1000.0, True),
+    "LayoutDuration": ("layout_ms", 1000.0, True),
+    "RecalcStyleDuration": ("recalc_style_ms", 1000.0, True),
+    "TaskDuration": ("task_ms", 1000.0, True),
+    "JSHeapUsedSize": ("js_heap_used", 1.0, False),
+    "Nodes": ("dom_nodes", 1.0, False),
+}
+
+
+def default_budget_path():
+    """Budget file from the page_budgets setting, or None when disabled"""
+    configured = Config.settings().page_budgets
+    if not configured:
+        return None
+    path = Config.BASE_DIR / configured
+    return path if path.exists() else None
+
+
+def load_budgets(path=None):
+    """Read {page: {action: {metric: max}}} from a budget file"""
+    path = path or default_budget_path()
+    if path is None:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_budgets(samples, budgets):
+    """Return one message per sampled metric above its page/action budget"""
+    violations = []
+    for sample in samples:
+        limits = budgets.get(sample["page"], {}).get(sample["action"], {})
+        for metric, limit in limits.items():
+            value = sample["metrics"].get(metric)
+            if value is not None and value > limit:
+                violations.append(
+                    f"{sample['page']} {sample['action']}: {metric} {value:g} exceeds budget {limit:g}"
+                )
+    return violations
+
+
+class PageMetrics:
+    """Collects timing samples from one driver"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._origin = None
+        self._cdp = hasattr(driver, "execute_cdp_cmd")
+        self._cdp_enabled = False
+        self._previous = {}
+
+    def _cdp_metrics(self):
+        if not self._cdp:
+            return {}
+        try:
+            if not self._cdp_enabled:
+                self.driver.execute_cdp_cmd("Performance.enable", {})
+                self._cdp_enabled = True
+            raw = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        except Exception as e:
+            # Remote grids and non-Chromium browsers may refuse CDP commands
+            logger.log_debug("CDP metrics unavailable: %s", e)
+            self._cdp = False
+            return {}
+
+        metrics = {}
+        for entry in raw:
+            if entry["name"] not in CDP_METRICS:
+                continue
+            name, scale, delta = CDP_METRICS[entry["name"]]
+            value = entry["value"] * scale
+            if delta:
+                # Cumulative for the renderer: report the time spent since the last sample
+                value, self._previous[name] = value - self._previous.get(name, 0.0), value
+            metrics[name] = round(value, 3)
+        return metrics
+
+    def sample(self, page, action):
+        """Read the browser's timings; returns a sample dict"""
+        timing = self.driver.execute_script(COLLECT_SCRIPT) or {}
+        metrics = {}
+        if timing.get("origin") != self._origin:
+            # A new document: its navigation and paint timings are new too
+            self._origin = timing.get("origin")
+            self._previous.clear()
+            metrics.update({k: round(v, 3) for k, v in (timing.get("navigation") or {}).items()
+                            if v is not None})
+            for name in ("first_paint", "first_contentful_paint"):
+                if timing.get(name) is not None:
+                    metrics[name] = round(timing[name], 3)
+        metrics.update(self._cdp_metrics())
+        return {
+            "page": page,
+            "action": action,
+            "url": timing.get("url", ""),
+            "ts": round(time.time(), 3),
+            "metrics": metrics,
+        }
+
+
+# ============================================================
+# Per-test collection
+# ============================================================
+_samples = []
+
+
+def record_sample(sample):
+    """Add a sample to the test that is running"""
+    _samples.append(sample)
+
+
+def current_samples():
+    """Samples recorded by the running test so far"""
+    return list(_samples)
+
+
+def clear_samples():
+    """Forget the samples of the previous test"""
+    _samples.clear()
@@ -0,0 +1,51 @@
+import pytest
+from utilities.config import Config
+from utilities.logger import get_logger
+from utilities.page_metrics import USER_PROPERTY, check_budgets, clear_samples, current_samples, load_budgets
+
+# ============================================================
+# Page metrics plugin
+# ============================================================
+# pytest side of utilities/page_metrics.py: clears the samples before
+# each test, attaches them to the call report and fails passing tests
+# that exceed a budget.
+
+logger = get_logger("PageMetrics")
+
+
+class PageMetricsPlugin:
+    """Attaches each test's samples to its report and enforces budgets"""
+
+    def __init__(self, budgets=None):
+        self.budgets = budgets or {}
+
+    def pytest_runtest_setup(self, item):
+        clear_samples()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when != "call":
+            return
+        samples = current_samples()
+        if not samples:
+            return
+
+        item.user_properties.append((USER_PROPERTY, samples))
+        report.user_properties = list(item.user_properties)
+
+        violations = check_budgets(samples, self.budgets)
+        if violations and report.passed:
+            report.outcome = "failed"
+            report.longrepr = "Performance budget exceeded:\n  " + "\n  ".join(violations)
+            logger.log_error("Performance budget exceeded in %s: %s", item.nodeid, violations)
+
+
+def register_page_metrics_plugin(config):
+    """Register the plugin in every process that runs tests (xdist workers too)"""
+    if not Config.settings().page_metrics:
+        return None
+    plugin = PageMetricsPlugin(load_budgets())
+    config.pluginmanager.register(plugin, "qa_page_metrics")
+    return plugin
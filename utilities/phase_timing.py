@@ -0,0 +1,211 @@
+import threading
+import time
+
+# ============================================================
+# Per-test phase timing
+# ============================================================
+# Splits each test's duration into where the time went:
+#
+#   driver_resolution   webdriver-manager locating/downloading the driver
+#   browser_launch      starting the browser session
+#   setup               rest of the setup phase (fixtures)
+#   navigation          driver.get/back/forward/refresh, BasePage.navigate
+#   explicit_waits      BasePage's WebDriverWait.until calls
+#   interactions        clicks, typing and reads through BasePage, and
+#                       driver.find_element(s) calls made by tests
+#   sleeps              time.sleep on the test's thread
+#   artifact_capture    screenshots
+#   test_body           rest of the call phase: test logic and assertions
+#   teardown            teardown phase (driver.quit, fixture cleanup)
+#
+# Instrumented code runs inside phase_timer.phase(name). Time is
+# exclusive: a wait inside an interaction counts as a wait, and the
+# enclosing phase resumes afterwards. Waits and navigation own everything
+# below them: the lookups and time.sleep polls WebDriverWait makes while
+# waiting stay in explicit_waits. The three "rest" phases are what the
+# pytest phase took beyond the instrumented time, so the breakdown of a
+# test always adds up to its duration.
+#
+# PhaseTimingPlugin (utilities/phase_timing_plugin.py) attaches each
+# test's breakdown as the "phase_timing" user property (stored with the
+# result in the history database) and prints per-suite totals in the
+# terminal summary. This module does not import pytest, so BasePage and
+# the driver factory stay cheap to import. Timer state is per
+# thread, so in-process runs started by the dashboard don't mix. When
+# timing is off, or outside a test, phase() is a shared no-op context
+# manager.
+
+USER_PROPERTY = "phase_timing"
+PHASES = (
+    "driver_resolution", "browser_launch", "setup",
+    "navigation", "explicit_waits", "interactions", "sleeps", "artifact_capture", "test_body",
+    "teardown",
+)
+# Phases that do not open nested phases (their polls and sleeps are part of them)
+OWNING_PHASES = frozenset({"navigation", "explicit_waits"})
+# pytest phase -> the phase that receives its uninstrumented time
+RESIDUAL_PHASES = {"setup": "setup", "call": "test_body", "teardown": "teardown"}
+
+# Driver methods wrapped per session by instrument_driver()
+DRIVER_METHODS = {
+    "get": "navigation",
+    "back": "navigation",
+    "forward": "navigation",
+    "refresh": "navigation",
+    "find_element": "interactions",
+    "find_elements": "interactions",
+    "save_screenshot": "artifact_capture",
+    "get_screenshot_as_file": "artifact_capture",
+    "get_screenshot_as_png": "artifact_capture",
+    "get_screenshot_as_base64": "artifact_capture",
+}
+
+_real_sleep = time.sleep
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Phase:
+    __slots__ = ("timer", "name")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.timer._push(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.timer._pop()
+        return False
+
+
+NO_PHASE = _NoPhase()
+
+
+class PhaseTimer(threading.local):
+    """Accumulates exclusive time per phase for the test running on each thread"""
+
+    def __init__(self):
+        self.totals = None
+        self._stack = []
+        self._outer = []
+
+    def start(self):
+        """Begin a test on the calling thread (nested in-process runs resume the outer test)"""
+        self._outer.append((self.totals, self._stack))
+        self.totals = {}
+        self._stack = []
+
+    def stop(self):
+        """End the test; returns its instrumented totals"""
+        totals = self.totals or {}
+        self.totals, self._stack = self._outer.pop() if self._outer else (None, [])
+        return totals
+
+    @property
+    def active(self):
+        return self.totals is not None
+
+    def phase(self, name):
+        """Context manager timing a block as `name` (a no-op when inactive or inside a wait)"""
+        if not self.active or (self._stack and self._stack[-1][0] in OWNING_PHASES):
+            return NO_PHASE
+        return _Phase(self, name)
+
+    def _push(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            parent, started = self._stack[-1]
+            self.totals[parent] = self.totals.get(parent, 0.0) + now - started
+        self._stack.append((name, now))
+
+    def _pop(self):
+        if not self._stack or self.totals is None:
+            return
+        now = time.perf_counter()
+        name, started = self._stack.pop()
+        self.totals[name] = self.totals.get(name, 0.0) + now - started
+        if self._stack:
+            parent, _ = self._stack[-1]
+            self._stack[-1] = (parent, now)
+
+
+phase_timer = PhaseTimer()
+
+
+def timed(name):
+    """Shorthand for phase_timer.phase(name)"""
+    return phase_timer.phase(name)
+
+
+def _timed_sleep(seconds):
+    with phase_timer.phase("sleeps"):
+        _real_sleep(seconds)
+
+
+def _timed_method(method, name):
+    def wrapper(*args, **kwargs):
+        with phase_timer.phase(name):
+            return method(*args, **kwargs)
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+def instrument_driver(driver):
+    """Time navigation, lookups and screenshots made through a driver session"""
+    if getattr(driver, "_qa_phase_timing", False):
+        return driver  # pooled sessions are instrumented once
+    for attribute, name in DRIVER_METHODS.items():
+        method = getattr(driver, attribute, None)
+        if method is not None:
+            setattr(driver, attribute, _timed_method(method, name))
+    driver._qa_phase_timing = True
+    return driver
+
+
+def breakdown(instrumented, durations):
+    """
+    Combine instrumented totals with pytest phase durations
+
+    instrumented: {pytest phase: {phase: seconds}}
+    durations: {pytest phase: seconds}
+    """
+    result = {}
+    for when, duration in durations.items():
+        spent = instrumented.get(when, {})
+        for name, seconds in spent.items():
+            result[name] = result.get(name, 0.0) + seconds
+        residual = RESIDUAL_PHASES[when]
+        result[residual] = result.get(residual, 0.0) + max(0.0, duration - sum(spent.values()))
+    return {name: round(seconds, 6) for name, seconds in result.items() if seconds > 0}
+
+
+def suite_of(nodeid):
+    """Suite a test belongs to: its file"""
+    return nodeid.split("::", 1)[0]
+
+
+def format_suite_summary(suites):
+    """Lines of a per-suite table: total seconds and share of each phase"""
+    used = [name for name in PHASES if any(name in totals for totals in suites.values())]
+    if not used:
+        return []
+    lines = [f"{'suite':36}{'total s':>9}" + "".join(f"{name[:12]:>14}" for name in used)]
+    for suite, totals in sorted(suites.items()):
+        total = sum(totals.values())
+        cells = "".join(
+            f"{totals.get(name, 0.0):>8.2f}s{totals.get(name, 0.0) / total:>5.0%}" if total else f"{'-':>14}"
+            for name in used
+        )
+        lines.append(f"{suite[-36:]:36}{total:>9.2f}{cells}")
+    return lines
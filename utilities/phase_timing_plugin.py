@@ -0,0 +1,92 @@
+import time
+import pytest
+from utilities.config import Config
+from utilities.phase_timing import USER_PROPERTY, _timed_sleep, breakdown, format_suite_summary, phase_timer, suite_of
+
+# ============================================================
+# Phase timing plugin
+# ============================================================
+# pytest side of utilities/phase_timing.py: times setup/call/teardown,
+# attaches each test's breakdown to its teardown report and prints the
+# per-suite totals. Lives in its own module so importing the timer
+# (BasePage, driver_factory) does not import pytest.
+
+
+class PhaseTimingPlugin:
+    """Times test phases where tests run and sums them where results arrive"""
+
+    def __init__(self, summarize=True):
+        self.summarize = summarize
+        self.suites = {}
+        self._instrumented = {}
+        self._durations = {}
+        self._previous_sleep = None
+
+    def pytest_configure(self, config):
+        self._previous_sleep = time.sleep
+        time.sleep = _timed_sleep
+
+    def pytest_unconfigure(self, config):
+        if self._previous_sleep is not None:
+            time.sleep = self._previous_sleep
+
+    # ------------------------------------------------------------
+    # Timing (every process that runs tests)
+    # ------------------------------------------------------------
+    def _wrap_phase(self, when):
+        phase_timer.start()
+        yield
+        self._instrumented[when] = phase_timer.stop()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        self._instrumented = {}
+        self._durations = {}
+        yield from self._wrap_phase("setup")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._wrap_phase("call")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        yield from self._wrap_phase("teardown")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        self._durations[report.when] = report.duration
+        if report.when == "teardown":
+            item.user_properties.append((USER_PROPERTY, breakdown(self._instrumented, self._durations)))
+            report.user_properties = list(item.user_properties)
+
+    # ------------------------------------------------------------
+    # Summary (the controller, or the only process)
+    # ------------------------------------------------------------
+    def pytest_runtest_logreport(self, report):
+        if not self.summarize or report.when != "teardown":
+            return
+        for key, value in report.user_properties:
+            if key == USER_PROPERTY:
+                totals = self.suites.setdefault(suite_of(report.nodeid), {})
+                for name, seconds in value.items():
+                    totals[name] = totals.get(name, 0.0) + seconds
+
+    def pytest_terminal_summary(self, terminalreporter):
+        lines = format_suite_summary(self.suites) if self.summarize else []
+        if lines:
+            terminalreporter.section("time per phase")
+            for line in lines:
+                terminalreporter.write_line(line)
+
+
+def register_phase_timing_plugin(config):
+    """Register the plugin when the phase_timing setting is on"""
+    if not Config.settings().phase_timing:
+        return None
+    # Under xdist the runtest hooks only fire in workers; the controller sums
+    # the breakdowns they report and prints the summary
+    plugin = PhaseTimingPlugin(summarize=not hasattr(config, "workerinput"))
+    config.pluginmanager.register(plugin, "qa_phase_timing")
+    return plugin
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from collections import OrderedDict
+from utilities.http_server import sse_message
+
+# ============================================================
+# Live run progress
+# ============================================================
+# The dashboard passes every runner event (utilities/runner.py) for a run
+# to ProgressBroker.publish_threadsafe(). The broker keeps a RunProgress
+# per run and fans each event out to subscribed browsers over SSE.
+#
+# Each subscriber has a bounded queue. When a slow client falls behind,
+# its oldest messages are dropped. Every message carries the run's full
+# progress snapshot (counters and current tests), so a client that
+# misses messages still shows correct totals on the next one.
+
+SUBSCRIBER_QUEUE_SIZE = 100
+FINISHED_RUNS_KEPT = 5
+HEARTBEAT_SECONDS = 15
+
+
+class RunProgress:
+    """Counters and in-flight tests for one run"""
+
+    def __init__(self, run_id, label=""):
+        self.run_id = run_id
+        self.label = label
+        self.status = "running"
+        self.collected = 0
+        self.counts = {}
+        self.current = {}
+        self.last_test = None
+        self.exit_code = None
+        self.started = time.time()
+        self.finished = None
+
+    def apply(self, event):
+        kind = event["event"]
+        if kind == "collected":
+            self.collected = event["count"]
+        elif kind == "test_start":
+            self.current[event["nodeid"]] = event["ts"]
+        elif kind == "test":
+            self.current.pop(event["nodeid"], None)
+            self.counts[event["outcome"]] = self.counts.get(event["outcome"], 0) + 1
+            self.last_test = {key: event[key] for key in ("nodeid", "outcome", "duration", "worker")}
+        elif kind == "session_finish":
+            self.exit_code = event["exit_code"]
+        elif kind == "run_finished":
+            self.status = "finished"
+            self.exit_code = event.get("exit_code", self.exit_code)
+            self.finished = time.time()
+            self.current.clear()
+
+    def snapshot(self):
+        return {
+            "run_id": self.run_id,
+            "label": self.label,
+            "status": self.status,
+            "collected": self.collected,
+            "completed": sum(self.counts.values()),
+            "counts": dict(self.counts),
+            "current": list(self.current),
+            "last_test": self.last_test,
+            "exit_code": self.exit_code,
+            "elapsed": round((self.finished or time.time()) - self.started, 1),
+        }
+
+
+class ProgressBroker:
+    """Fan runner events out to SSE subscribers with bounded queues"""
+
+    def __init__(self, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.runs = OrderedDict()
+        self.dropped = 0
+        self._subscribers = set()
+        self._loop = None
+
+    def bind(self, loop):
+        """Set the event loop that owns the subscriber queues"""
+        self._loop = loop
+
+    def start_run(self, run_id, label=""):
+        self.publish_threadsafe(run_id, {"event": "run_started", "label": label})
+
+    def publish_threadsafe(self, run_id, event):
+        """Publish from any thread (e.g. the runner's worker thread)"""
+        if self._loop is None:
+            self._publish(run_id, event)
+        else:
+            self._loop.call_soon_threadsafe(self._publish, run_id, event)
+
+    def _publish(self, run_id, event):
+        progress = self.runs.get(run_id)
+        if progress is None:
+            progress = self.runs[run_id] = RunProgress(run_id, event.get("label", ""))
+            self._prune()
+        progress.apply(event)
+
+        message = sse_message(event["event"], {"event": event, "progress": progress.snapshot()})
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+
+    def _prune(self):
+        finished = [run_id for run_id, run in self.runs.items() if run.status == "finished"]
+        for run_id in finished[:-FINISHED_RUNS_KEPT]:
+            del self.runs[run_id]
+
+    def snapshot(self):
+        return [run.snapshot() for run in self.runs.values()]
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    async def sse_stream(self):
+        """Async generator of SSE messages for one subscriber"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            # Late joiners start from the current state of every known run
+            yield sse_message("snapshot", {"runs": self.snapshot()})
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": heartbeat\n\n"
+        finally:
+            self._subscribers.discard(queue)
@@ -0,0 +1,277 @@
+import bisect
+import ctypes
+import ctypes.util
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from utilities.config import Config
+from utilities.logger import get_logger
+
+# ============================================================
+# Report index
+# ============================================================
+# In-memory catalog of reports/*.html, newest first, kept current from
+# inotify events on Linux and from a directory-mtime scan elsewhere.
+# Queries only touch the entries they return, so listing the latest
+# reports costs the same with ten reports or ten thousand.
+#
+# Directory mtime changes when files are added, removed or renamed but
+# not when an existing report is rewritten in place, so the scan fallback
+# also rescans every RESCAN_INTERVAL seconds.
+
+logger = get_logger("ReportIndex")
+
+REPORT_SUFFIX = ".html"
+RESCAN_INTERVAL = 30.0
+
+# "hcl_test_report_20260121_123920" -> kind "hcl_test_report"
+_KIND = re.compile(r"^(?P<kind>.+?)(?:_\d{8}_\d{6})?$")
+
+# inotify(7) constants
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE \
+    | IN_DELETE_SELF | IN_MOVE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def report_kind(name):
+    """Report family from a file name, without its timestamp suffix"""
+    return _KIND.match(Path(name).stem).group("kind")
+
+
+class InotifyWatcher:
+    """Non-blocking inotify watch on one directory (Linux only)"""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def read(self):
+        """Return pending (mask, name) events without blocking"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                events.append((mask, os.fsdecode(name)))
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class ReportIndex:
+    """Sorted, incrementally maintained catalog of HTML reports"""
+
+    def __init__(self, directory=None, use_inotify=True):
+        self.directory = Path(directory or Config.REPORTS_DIR)
+        self.use_inotify = use_inotify and sys.platform.startswith("linux")
+        self.stats = {"scans": 0, "events": 0, "queries": 0}
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._entries = {}    # name -> metadata dict
+        self._order = []      # sorted (-mtime_ns, name) keys, newest first
+        self._by_kind = {}    # kind -> sorted keys
+        self._dir_mtime = None
+        self._last_scan = 0.0
+
+    @property
+    def mode(self):
+        return "inotify" if self._watcher else "scan"
+
+    # ------------------------------------------------------------
+    # Catalog maintenance
+    # ------------------------------------------------------------
+    @staticmethod
+    def _key(entry):
+        return (-entry["mtime_ns"], entry["name"])
+
+    def _insert(self, entry):
+        key = self._key(entry)
+        self._entries[entry["name"]] = entry
+        bisect.insort(self._order, key)
+        bisect.insort(self._by_kind.setdefault(entry["kind"], []), key)
+
+    def _remove(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return
+        key = self._key(entry)
+        for keys in (self._order, self._by_kind[entry["kind"]]):
+            position = bisect.bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+
+    def _metadata(self, name, stat):
+        return {
+            "name": name,
+            "path": f"/reports/{name}",
+            "kind": report_kind(name),
+            "size": stat.st_size,
+            "size_kb": round(stat.st_size / 1024, 1),
+            "mtime_ns": stat.st_mtime_ns,
+            "created": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M"),
+        }
+
+    def _update(self, name):
+        """Re-stat one report and move it to its new position"""
+        if not name.endswith(REPORT_SUFFIX):
+            return
+        try:
+            stat = os.stat(self.directory / name)
+        except FileNotFoundError:
+            self._remove(name)
+            return
+        current = self._entries.get(name)
+        if current and current["mtime_ns"] == stat.st_mtime_ns and current["size"] == stat.st_size:
+            return
+        self._remove(name)
+        self._insert(self._metadata(name, stat))
+
+    def _scan(self):
+        """Rebuild the catalog from a directory listing"""
+        self.stats["scans"] += 1
+        self._entries.clear()
+        self._order.clear()
+        self._by_kind.clear()
+        try:
+            with os.scandir(self.directory) as listing:
+                for entry in listing:
+                    if entry.name.endswith(REPORT_SUFFIX) and entry.is_file():
+                        self._insert(self._metadata(entry.name, entry.stat()))
+        except FileNotFoundError:
+            pass
+        self._last_scan = time.monotonic()
+
+    def _start_watcher(self):
+        if not self.use_inotify or self._watcher is not None:
+            return
+        try:
+            self._watcher = InotifyWatcher(self.directory)
+        except (OSError, AttributeError) as e:
+            # AttributeError: libc without inotify symbols
+            logger.log_info("inotify unavailable for %s (%s); using mtime scan", self.directory, e)
+            self.use_inotify = False
+
+    def _apply_events(self):
+        for mask, name in self._watcher.read():
+            self.stats["events"] += 1
+            if mask & IN_Q_OVERFLOW:
+                self._scan()
+            elif mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                # The directory itself went away: fall back to scanning
+                self._watcher.close()
+                self._watcher = None
+                self._dir_mtime = None
+                self._scan()
+                return
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self._remove(name)
+            elif name:
+                self._update(name)
+
+    def refresh(self):
+        """Bring the catalog up to date; cheap when nothing changed"""
+        with self._lock:
+            if self._watcher is None and self._dir_mtime is None:
+                # First use: watch before scanning so no change is missed
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._start_watcher()
+                self._scan()
+                self._dir_mtime = self._directory_mtime()
+            elif self._watcher is not None:
+                self._apply_events()
+            else:
+                mtime = self._directory_mtime()
+                stale = time.monotonic() - self._last_scan > RESCAN_INTERVAL
+                if mtime != self._dir_mtime or stale:
+                    self._dir_mtime = mtime
+                    self._scan()
+
+    def _directory_mtime(self):
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def query(self, offset=0, limit=10, kind=None, search=None):
+        """
+        Return one page of reports, newest first
+
+        Args:
+            offset: number of matching reports to skip
+            limit: page size
+            kind: report family, e.g. "hcl_test_report"
+            search: case-insensitive substring of the file name
+        """
+        self.refresh()
+        with self._lock:
+            self.stats["queries"] += 1
+            keys = self._by_kind.get(kind, []) if kind else self._order
+
+            if not search:
+                page = [self._entries[name] for _, name in keys[offset:offset + limit]]
+                total = len(keys)
+            else:
+                # Substring search walks the whole catalog to count the
+                # matches, but only builds entries for the requested page
+                search = search.lower()
+                page = []
+                total = 0
+                for _, name in keys:
+                    if search in name.lower():
+                        if offset <= total < offset + limit:
+                            page.append(self._entries[name])
+                        total += 1
+
+            return {
+                "reports": page,
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+                "kinds": {k: len(v) for k, v in self._by_kind.items() if v},
+            }
+
+    def __len__(self):
+        self.refresh()
+        return len(self._order)
+
+    def close(self):
+        with self._lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
@@ -0,0 +1,457 @@
+import json
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from utilities.config import Config
+from utilities.logger import get_logger
+
+# ============================================================
+# Results store
+# ============================================================
+# Every test outcome is written to a local SQLite database so the
+# dashboard can answer history and trend questions:
+#
+#   runs     one row per pytest session (run id shared with xdist workers)
+#   tests    one row per node id, so results store an integer key
+#   results  one row per finished test: outcome, duration, worker,
+#            browser, retry count and artifact paths
+#   page_metrics  one row per page timing recorded by a test
+#                 (utilities/page_metrics.py): page, action, metric, value
+#   test_phases   one row per phase of a test's time (utilities/phase_timing.py):
+#                 phase, seconds
+#
+# RunRecorder receives the runner's collector events (utilities/runner.py)
+# in the xdist controller (or the only process) and inserts results in
+# batches of BATCH_SIZE per transaction. The database runs in WAL mode,
+# so the dashboard can read while a run is writing. Opening a store
+# brings an older database up to SCHEMA_VERSION (see MIGRATIONS) and
+# refuses one written by a newer checkout.
+
+logger = get_logger("ResultsStore")
+
+BATCH_SIZE = 200
+
+# Ordered schema migrations: MIGRATIONS[n - 1] takes a database from
+# version n - 1 to n. The version is kept in PRAGMA user_version; a new
+# file starts at 0 and runs them all. Append new steps, never edit
+# released ones, and keep them safe to repeat (IF NOT EXISTS): two
+# processes opening an old file at the same time may both run a step.
+MIGRATIONS = [
+    # 1: runs, tests and results
+    """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_uid TEXT NOT NULL UNIQUE,
+    started REAL NOT NULL,
+    finished REAL,
+    exit_code INTEGER,
+    browser TEXT,
+    profile TEXT,
+    host TEXT,
+    args TEXT,
+    total INTEGER DEFAULT 0,
+    passed INTEGER DEFAULT 0,
+    failed INTEGER DEFAULT 0,
+    skipped INTEGER DEFAULT 0,
+    errors INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY,
+    nodeid TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    worker TEXT,
+    browser TEXT,
+    retries INTEGER NOT NULL DEFAULT 0,
+    artifacts TEXT,
+    finished REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_test_run ON results(test_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_run_test ON results(run_id, test_id, outcome, duration);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started);
+""",
+    # 2: page timings (utilities/page_metrics.py)
+    """
+CREATE TABLE IF NOT EXISTS page_metrics (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    page TEXT NOT NULL,
+    action TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_page_metrics ON page_metrics(page, action, metric, run_id);
+""",
+    # 3: per-test phase breakdowns (utilities/phase_timing.py)
+    """
+CREATE TABLE IF NOT EXISTS test_phases (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    phase TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_test_phases ON test_phases(run_id, test_id);
+""",
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+class SchemaVersionError(sqlite3.DatabaseError):
+    """The database was written by a newer version of the store"""
+
+
+def schema_version(connection):
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(connection):
+    """Apply the migrations a database is missing; return the number applied"""
+    version = schema_version(connection)
+    if version > SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Results database has schema version {version}; this checkout supports up to {SCHEMA_VERSION}"
+        )
+    for number in range(version + 1, SCHEMA_VERSION + 1):
+        # Each step and its version bump commit together
+        try:
+            connection.executescript(
+                f"BEGIN IMMEDIATE;\n{MIGRATIONS[number - 1]}\nPRAGMA user_version = {number};\nCOMMIT;"
+            )
+        except sqlite3.Error:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        logger.log_info("Results database migrated to schema version %d", number)
+    return SCHEMA_VERSION - version
+
+
+# Outcomes counted in the runs.passed/failed/skipped/errors columns
+OUTCOME_COLUMNS = ("passed", "failed", "skipped", "error")
+FAILING = ("failed", "error")
+
+
+def default_db_path():
+    """Database path from the results_db setting (empty disables the store)"""
+    path = Config.settings().results_db
+    if not path:
+        return None
+    path = Path(path)
+    return path if path.is_absolute() else Config.BASE_DIR / path
+
+
+class ResultsStore:
+    """SQLite-backed history of runs and test results"""
+
+    def __init__(self, path=None):
+        self.path = Path(path or default_db_path())
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            migrate(self.connection())
+
+    def connection(self):
+        """One connection per thread (sqlite3 objects are not shareable)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    # ------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------
+    def start_run(self, run_uid, started=None, browser=None, profile=None, args=None):
+        """Insert (or reuse) the row for a run; return its integer id"""
+        with self._write_lock:
+            connection = self.connection()
+            connection.execute(
+                "INSERT OR IGNORE INTO runs (run_uid, started, browser, profile, host, args) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (run_uid, started or time.time(), browser, profile, socket.gethostname(),
+                 json.dumps(args or [])),
+            )
+            return connection.execute("SELECT id FROM runs WHERE run_uid = ?", (run_uid,)).fetchone()[0]
+
+    def _test_ids(self, connection, nodeids):
+        connection.executemany(
+            "INSERT OR IGNORE INTO tests (nodeid) VALUES (?)", [(n,) for n in set(nodeids)]
+        )
+        ids = {}
+        unique = list(set(nodeids))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in connection.execute(
+                f"SELECT id, nodeid FROM tests WHERE nodeid IN ({placeholders})", chunk
+            ):
+                ids[row["nodeid"]] = row["id"]
+        return ids
+
+    def add_results(self, run_id, rows):
+        """Insert result dicts for a run in one transaction"""
+        if not rows:
+            return
+        with self._write_lock:
+            connection = self.connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                test_ids = self._test_ids(connection, [row["nodeid"] for row in rows])
+                connection.executemany(
+                    "INSERT INTO results (run_id, test_id, outcome, duration, worker, browser, "
+                    "retries, artifacts, finished) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (run_id, test_ids[row["nodeid"]], row["outcome"], row["duration"],
+                         row.get("worker"), row.get("browser"), row.get("retries", 0),
+                         json.dumps(row.get("artifacts") or []), row.get("finished", time.time()))
+                        for row in rows
+                    ],
+                )
+                connection.executemany(
+                    "INSERT INTO page_metrics (run_id, test_id, page, action, metric, value) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (run_id, test_ids[row["nodeid"]], sample["page"], sample["action"], metric, value)
+                        for row in rows
+                        for sample in row.get("metrics") or ()
+                        for metric, value in sample["metrics"].items()
+                    ],
+                )
+                connection.executemany(
+                    "INSERT INTO test_phases (run_id, test_id, phase, seconds) VALUES (?, ?, ?, ?)",
+                    [
+                        (run_id, test_ids[row["nodeid"]], phase, seconds)
+                        for row in rows
+                        for phase, seconds in (row.get("breakdown") or {}).items()
+                    ],
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def finish_run(self, run_id, exit_code, finished=None):
+        """Record the exit code and per-outcome totals of a run"""
+        with self._write_lock:
+            connection = self.connection()
+            counts = dict(connection.execute(
+                "SELECT outcome, COUNT(*) FROM results WHERE run_id = ? GROUP BY outcome", (run_id,)
+            ).fetchall())
+            connection.execute(
+                "UPDATE runs SET finished = ?, exit_code = ?, total = ?, passed = ?, failed = ?, "
+                "skipped = ?, errors = ? WHERE id = ?",
+                (finished or time.time(), exit_code, sum(counts.values()),
+                 *(counts.get(outcome, 0) for outcome in OUTCOME_COLUMNS), run_id),
+            )
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def _rows(self, sql, params=()):
+        return [dict(row) for row in self.connection().execute(sql, params)]
+
+    def _first_run_id(self, runs):
+        """Smallest run id among the latest `runs` runs"""
+        row = self.connection().execute(
+            "SELECT MIN(id) FROM (SELECT id FROM runs ORDER BY id DESC LIMIT ?)", (runs,)
+        ).fetchone()
+        return row[0] or 0
+
+    def recent_runs(self, limit=20):
+        """Latest runs with their totals, newest first"""
+        return self._rows(
+            "SELECT run_uid, started, finished, exit_code, browser, profile, host, "
+            "total, passed, failed, skipped, errors FROM runs ORDER BY id DESC LIMIT ?", (limit,)
+        )
+
+    def test_history(self, nodeid, limit=50):
+        """Latest results of one test, newest first"""
+        return self._rows(
+            "SELECT runs.run_uid, runs.started, results.outcome, results.duration, "
+            "results.worker, results.browser, results.retries, results.artifacts "
+            "FROM results JOIN runs ON runs.id = results.run_id "
+            "WHERE results.test_id = (SELECT id FROM tests WHERE nodeid = ?) "
+            "ORDER BY results.run_id DESC LIMIT ?",
+            (nodeid, limit),
+        )
+
+    def slowest_tests(self, runs=20, limit=10):
+        """Tests with the highest average duration over the latest runs"""
+        return self._rows(
+            "SELECT tests.nodeid, COUNT(*) AS samples, ROUND(AVG(results.duration), 3) AS avg_duration, "
+            "ROUND(MAX(results.duration), 3) AS max_duration "
+            "FROM results JOIN tests ON tests.id = results.test_id "
+            "WHERE results.run_id >= ? AND results.outcome != 'skipped' "
+            "GROUP BY results.test_id ORDER BY avg_duration DESC LIMIT ?",
+            (self._first_run_id(runs), limit),
+        )
+
+    def failure_rates(self, runs=20, limit=20, min_samples=1):
+        """Tests ordered by failure rate over the latest runs"""
+        return self._rows(
+            "SELECT tests.nodeid, COUNT(*) AS samples, "
+            "SUM(results.outcome IN ('failed', 'error')) AS failures, "
+            "ROUND(1.0 * SUM(results.outcome IN ('failed', 'error')) / COUNT(*), 3) AS failure_rate, "
+            "SUM(results.retries) AS retries "
+            "FROM results JOIN tests ON tests.id = results.test_id "
+            "WHERE results.run_id >= ? AND results.outcome != 'skipped' "
+            "GROUP BY results.test_id HAVING samples >= ? AND (failures > 0 OR retries > 0) "
+            "ORDER BY failure_rate DESC, failures DESC LIMIT ?",
+            (self._first_run_id(runs), min_samples, limit),
+        )
+
+    def page_metrics(self, runs=20, page=None):
+        """Average and maximum of every page metric over the latest runs"""
+        return self._rows(
+            "SELECT page, action, metric, COUNT(*) AS samples, ROUND(AVG(value), 3) AS avg_value, "
+            "ROUND(MAX(value), 3) AS max_value FROM page_metrics "
+            "WHERE run_id >= ? AND (? IS NULL OR page = ?) "
+            "GROUP BY page, action, metric ORDER BY page, action, metric",
+            (self._first_run_id(runs), page, page),
+        )
+
+    def page_metric_history(self, page, action, metric, limit=50):
+        """Per-run average of one page metric, newest first"""
+        return self._rows(
+            "SELECT runs.run_uid, runs.started, COUNT(*) AS samples, "
+            "ROUND(AVG(page_metrics.value), 3) AS avg_value, ROUND(MAX(page_metrics.value), 3) AS max_value "
+            "FROM page_metrics JOIN runs ON runs.id = page_metrics.run_id "
+            "WHERE page_metrics.page = ? AND page_metrics.action = ? AND page_metrics.metric = ? "
+            "GROUP BY page_metrics.run_id ORDER BY page_metrics.run_id DESC LIMIT ?",
+            (page, action, metric, limit),
+        )
+
+    def phase_breakdown(self, runs=20, nodeid=None):
+        """Total and average seconds per phase over the latest runs (optionally one test)"""
+        return self._rows(
+            "SELECT phase, COUNT(*) AS samples, ROUND(SUM(seconds), 3) AS total_seconds, "
+            "ROUND(AVG(seconds), 3) AS avg_seconds FROM test_phases "
+            "WHERE run_id >= ? AND (? IS NULL OR test_id = (SELECT id FROM tests WHERE nodeid = ?)) "
+            "GROUP BY phase ORDER BY total_seconds DESC",
+            (self._first_run_id(runs), nodeid, nodeid),
+        )
+
+    def diff_runs(self, base_uid=None, head_uid=None):
+        """Compare two runs (default: the latest two)"""
+        if base_uid is None or head_uid is None:
+            latest = [row["run_uid"] for row in self.recent_runs(2)]
+            if len(latest) < 2:
+                return {"base": None, "head": latest[0] if latest else None, "changes": {}}
+            head_uid, base_uid = latest
+
+        def outcomes(run_uid):
+            return {
+                row["nodeid"]: (row["outcome"], row["duration"])
+                for row in self.connection().execute(
+                    "SELECT tests.nodeid, results.outcome, results.duration "
+                    "FROM results JOIN tests ON tests.id = results.test_id "
+                    "WHERE results.run_id = (SELECT id FROM runs WHERE run_uid = ?)", (run_uid,)
+                )
+            }
+
+        base, head = outcomes(base_uid), outcomes(head_uid)
+        changes = {"new_failures": [], "fixed": [], "added": [], "removed": [], "slower": []}
+        for nodeid, (outcome, duration) in head.items():
+            if nodeid not in base:
+                changes["added"].append(nodeid)
+                continue
+            base_outcome, base_duration = base[nodeid]
+            if outcome in FAILING and base_outcome not in FAILING:
+                changes["new_failures"].append(nodeid)
+            elif base_outcome in FAILING and outcome not in FAILING:
+                changes["fixed"].append(nodeid)
+            if base_duration > 0.1 and duration > base_duration * 1.5:
+                changes["slower"].append({"nodeid": nodeid, "base": base_duration, "head": duration})
+        changes["removed"] = sorted(set(base) - set(head))
+        return {"base": base_uid, "head": head_uid, "changes": changes}
+
+
+class RunRecorder:
+    """Turns collector events into batched ResultsStore writes"""
+
+    def __init__(self, store, run_uid, browser=None, profile=None, batch_size=BATCH_SIZE):
+        self.store = store
+        self.run_uid = run_uid
+        self.browser = browser
+        self.profile = profile
+        self.batch_size = batch_size
+        self.run_id = None
+        self._pending = []
+        self._retries = {}
+
+    def handle(self, event):
+        kind = event["event"]
+        if kind == "session_start":
+            self.run_id = self.store.start_run(
+                self.run_uid, event["ts"], self.browser, self.profile, event["args"]
+            )
+        elif kind == "test":
+            if event["outcome"] == "rerun":
+                # pytest-rerunfailures reports each retry before the final attempt
+                self._retries[event["nodeid"]] = self._retries.get(event["nodeid"], 0) + 1
+                return
+            self._pending.append({
+                "nodeid": event["nodeid"],
+                "outcome": event["outcome"],
+                "duration": event["duration"],
+                "worker": event.get("worker"),
+                "browser": self.browser,
+                "retries": self._retries.pop(event["nodeid"], 0),
+                "artifacts": event.get("artifacts"),
+                "metrics": event.get("metrics"),
+                "breakdown": event.get("breakdown"),
+                "finished": time.time(),
+            })
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+        elif kind == "session_finish":
+            self.flush()
+            if self.run_id is not None:
+                self.store.finish_run(self.run_id, event["exit_code"])
+
+    def flush(self):
+        if self._pending and self.run_id is not None:
+            try:
+                self.store.add_results(self.run_id, self._pending)
+            except sqlite3.Error as e:
+                logger.log_error("Could not store %d results: %s", len(self._pending), e)
+            self._pending = []
+
+
+def register_results_plugin(config, run_id):
+    """Register the store's collector on a pytest config (controller only)"""
+    if hasattr(config, "workerinput"):
+        return None  # xdist worker: the controller records its results
+    path = default_db_path()
+    if path is None:
+        return None
+
+    from utilities.runner import ResultsCollector
+    settings = Config.settings()
+    try:
+        store = ResultsStore(path)
+    except sqlite3.Error as e:
+        logger.log_error("Results store disabled (%s): %s", path, e)
+        return None
+    recorder = RunRecorder(store, run_id, settings.browser, settings.profile)
+    config.pluginmanager.register(ResultsCollector(recorder.handle), "qa_results_store")
+    return recorder
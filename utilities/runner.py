@@ -0,0 +1,620 @@
+import multiprocessing
+import os
+from pathlib import Path
+import signal
+import threading
+import time
+from datetime import datetime
+import pytest
+from utilities.config import Config
+from utilities.events import shutdown_events
+from utilities.logger import get_logger, shutdown_logging
+
+# ============================================================
+# Programmatic test runner
+# ============================================================
+# run_tests.py, run_demo.py and the dashboard run pytest through this
+# module instead of starting `python -m pytest` in a new interpreter.
+#
+#   run_pytest(args)               pytest.main in this process (one-shot CLIs)
+#   WarmRunner().run(args)         each run in a child forked from a warm
+#                                  forkserver that has already imported
+#                                  pytest, the page objects and selenium
+#
+# Both return a RunResult built from the events emitted by the
+# ResultsCollector plugin, and pass every event to an optional on_event
+# callback as it happens:
+#
+#   {"event": "session_start", "args": [...], "pid": 123, "ts": ...}
+#   {"event": "collected", "count": 12}
+#   {"event": "test_start", "nodeid": ..., "ts": ...}
+#   {"event": "test", "nodeid": ..., "worker": "gw0", "outcome": "passed", ...}
+#   {"event": "session_finish", "exit_code": 0, "duration": 4.2}
+#
+# Repeated pytest.main calls in one long-lived process keep test modules
+# and plugin state from the previous run, so the dashboard uses WarmRunner.
+
+logger = get_logger("TestRunner")
+
+# Test type -> (pytest selection args, description)
+SUITES = {
+    "all": (["tests/"], "All Tests (Complete Test Suite)"),
+    "login": (["tests/test_login.py"], "Login Functionality Tests"),
+    "reset": (["tests/test_password_reset.py"], "Password Reset Tests"),
+    "demo": (["tests/test_demo.py"], "Demo Tests (SauceDemo Website)"),
+    "smoke": (["-m", "smoke"], "Smoke Tests"),
+}
+
+# Modules imported once by the forkserver and inherited by every run
+PRELOAD_MODULES = [
+    "pytest",
+    "utilities.runner",
+    "utilities.settings",
+    "utilities.data_reader",
+    "utilities.driver_factory",
+    "pages.base_page",
+    "pages.login_page",
+    "pages.password_reset_page",
+    "selenium.webdriver",
+    "xdist",
+]
+
+ARTIFACT_SUFFIXES = (".png", ".jpg", ".jpeg", ".html", ".log")
+CANCEL_GRACE_SECONDS = 5.0
+MAX_LONGREPR = 4000
+
+
+def build_args(test_type="all", parallel=False, headless=False, browser=None,
+               profile=None, html_report=None, log_file=None, extra=None, report_format=None):
+    """
+    Build pytest arguments for a suite from run_tests.py-style options
+
+    report_format ("html" or "compact", default: the report_format
+    setting) selects how html_report is written; a compact report puts
+    its data next to it as <name>.jsonl.
+    """
+    if test_type not in SUITES:
+        raise ValueError(f"Unknown test type: {test_type}")
+
+    args = ["-v", "--tb=short"]
+    if html_report:
+        report_format = report_format or Config.settings().report_format
+        if report_format == "compact":
+            # Clear pytest.ini addopts so its --html report is not written too
+            args.extend([f"--compact-report={Path(html_report).with_suffix('.jsonl')}", "-o", "addopts="])
+        else:
+            args.extend([f"--html={html_report}", "--self-contained-html"])
+    if log_file:
+        args.extend([f"--log-file={log_file}", "--log-file-level=INFO"])
+
+    # Settings CLI layer (read by tests/conftest.py)
+    if browser:
+        args.extend(["--browser", browser])
+    if headless:
+        args.append("--headless")
+    if profile:
+        args.extend(["--profile", profile])
+    if parallel:
+        args.extend(["-n", "auto"])
+
+    args.extend(extra or [])
+    args.extend(SUITES[test_type][0])
+    return args
+
+
+def describe_suite(test_type):
+    """Return the human-readable description of a suite"""
+    return SUITES[test_type][1]
+
+
+def timestamped_report(prefix):
+    """Return a reports/<prefix>_<timestamp>.html path"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return Config.REPORTS_DIR / f"{prefix}_{timestamp}.html"
+
+
+# ============================================================
+# Results
+# ============================================================
+class CaseResult:
+    """Outcome of one collected test item"""
+
+    __slots__ = ("nodeid", "outcome", "duration", "phases", "longrepr", "artifacts", "metrics", "breakdown")
+
+    def __init__(self, nodeid, outcome, duration, phases=None, longrepr="", artifacts=None, metrics=None,
+                 breakdown=None):
+        self.nodeid = nodeid
+        self.outcome = outcome
+        self.duration = duration
+        self.phases = phases or {}
+        self.longrepr = longrepr
+        self.artifacts = artifacts or []
+        self.metrics = metrics or []
+        self.breakdown = breakdown or {}
+
+    @classmethod
+    def from_event(cls, event):
+        return cls(event["nodeid"], event["outcome"], event["duration"],
+                   event.get("phases"), event.get("longrepr", ""), event.get("artifacts"),
+                   event.get("metrics"), event.get("breakdown"))
+
+    def to_dict(self):
+        return {
+            "nodeid": self.nodeid,
+            "outcome": self.outcome,
+            "duration": self.duration,
+            "phases": self.phases,
+            "longrepr": self.longrepr,
+            "artifacts": self.artifacts,
+            "metrics": self.metrics,
+            "breakdown": self.breakdown,
+        }
+
+
+class RunResult:
+    """Structured result of a pytest run"""
+
+    def __init__(self, args):
+        self.args = list(args)
+        self.exit_code = None
+        self.collected = 0
+        self.tests = []
+        self.started = time.time()
+        self.duration = 0.0
+        self.error = None
+        self.cancelled = False
+        self.artifacts = _run_artifacts(self.args)
+
+    def apply(self, event):
+        """Update the result from one collector event"""
+        kind = event["event"]
+        if kind == "session_start":
+            self.started = event["ts"]
+        elif kind == "collected":
+            self.collected = event["count"]
+        elif kind == "test":
+            self.tests.append(CaseResult.from_event(event))
+        elif kind == "session_finish":
+            self.exit_code = event["exit_code"]
+            self.duration = event["duration"]
+        elif kind == "error":
+            self.error = event["message"]
+
+    @property
+    def counts(self):
+        """Number of tests per outcome"""
+        counts = {}
+        for test in self.tests:
+            counts[test.outcome] = counts.get(test.outcome, 0) + 1
+        return counts
+
+    @property
+    def success(self):
+        return self.exit_code == 0
+
+    def failures(self):
+        return [t for t in self.tests if t.outcome in ("failed", "error")]
+
+    def slowest(self, count=5):
+        return sorted(self.tests, key=lambda t: t.duration, reverse=True)[:count]
+
+    def to_dict(self):
+        return {
+            "args": self.args,
+            "exit_code": self.exit_code,
+            "success": self.success,
+            "collected": self.collected,
+            "counts": self.counts,
+            "started": datetime.fromtimestamp(self.started).isoformat(),
+            "duration": round(self.duration, 3),
+            "error": self.error,
+            "cancelled": self.cancelled,
+            "artifacts": self.artifacts,
+            "tests": [t.to_dict() for t in self.tests],
+        }
+
+
+def _run_artifacts(args):
+    """Report and log files requested on the command line"""
+    artifacts = []
+    for arg in args:
+        for option in ("--html=", "--compact-report=", "--log-file=", "--junitxml=", "--junit-xml="):
+            if arg.startswith(option):
+                artifacts.append(arg[len(option):])
+    return artifacts
+
+
+# ============================================================
+# Collector plugin
+# ============================================================
+class ResultsCollector:
+    """pytest plugin that turns reports into runner events"""
+
+    def __init__(self, emit):
+        self.emit = emit
+        self._phases = {}
+        self._snapshot = None
+        self._distributed = False
+        self._collected = False
+        self._started = time.time()
+
+    @staticmethod
+    def _phase_outcome(report):
+        if hasattr(report, "wasxfail"):
+            return "xfailed" if report.skipped else "xpassed"
+        if report.when != "call" and report.failed:
+            return "error"
+        return report.outcome
+
+    @staticmethod
+    def _artifact_snapshot():
+        try:
+            return {
+                entry.name: entry.stat().st_mtime_ns
+                for entry in os.scandir(Config.REPORTS_DIR)
+                if entry.name.endswith(ARTIFACT_SUFFIXES) and entry.is_file()
+            }
+        except OSError:
+            return {}
+
+    def pytest_sessionstart(self, session):
+        # Under xdist, tests from several workers interleave, so new report
+        # files cannot be attributed to a single test
+        self._distributed = session.config.pluginmanager.has_plugin("dsession")
+        self.emit({
+            "event": "session_start",
+            "args": [str(arg) for arg in session.config.invocation_params.args],
+            "pid": os.getpid(),
+            "ts": time.time(),
+        })
+
+    def pytest_collection_finish(self, session):
+        if not self._distributed:
+            self._collected = True
+            self.emit({"event": "collected", "count": len(session.items)})
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        if not self._collected:
+            self._collected = True
+            self.emit({"event": "collected", "count": len(ids)})
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        if not self._distributed:
+            self._snapshot = self._artifact_snapshot()
+        self.emit({"event": "test_start", "nodeid": nodeid, "ts": time.time()})
+
+    def pytest_runtest_logreport(self, report):
+        phases = self._phases.setdefault(report.nodeid, {})
+        phases[report.when] = {
+            "outcome": self._phase_outcome(report),
+            "duration": round(report.duration, 6),
+            "longrepr": report.longreprtext[:MAX_LONGREPR] if report.failed else "",
+            "artifacts": [value for key, value in report.user_properties if key == "artifact"],
+        }
+        if report.when == "call":
+            # Later phases repeat the item's user properties; samples are attached at call
+            phases["call"]["metrics"] = [sample for key, samples in report.user_properties
+                                         if key == "page_metrics" for sample in samples]
+        if report.when == "teardown":
+            # Attached at teardown by utilities/phase_timing.py
+            phases["teardown"]["breakdown"] = next(
+                (value for key, value in report.user_properties if key == "phase_timing"), {})
+            # xdist reports carry the worker node they ran on
+            node = getattr(report, "node", None)
+            worker = node.gateway.id if node is not None else "main"
+            self.emit(self._test_event(report.nodeid, self._phases.pop(report.nodeid), worker))
+
+    def _test_event(self, nodeid, phases, worker="main"):
+        setup = phases.get("setup", {})
+        call = phases.get("call")
+        teardown = phases.get("teardown", {})
+
+        if setup.get("outcome") != "passed" or call is None:
+            outcome = setup.get("outcome", "error")
+        else:
+            outcome = call["outcome"]
+        if teardown.get("outcome") == "error" and outcome == "passed":
+            outcome = "error"
+
+        artifacts = []
+        metrics = []
+        breakdown = {}
+        longrepr = []
+        for phase in phases.values():
+            artifacts.extend(phase.pop("artifacts"))
+            metrics.extend(phase.pop("metrics", ()))
+            breakdown.update(phase.pop("breakdown", {}))
+            if phase["longrepr"]:
+                longrepr.append(phase["longrepr"])
+            del phase["longrepr"]
+
+        if self._snapshot is not None:
+            after = self._artifact_snapshot()
+            artifacts.extend(
+                str(Config.REPORTS_DIR / name) for name, mtime in after.items()
+                if self._snapshot.get(name) != mtime
+            )
+            self._snapshot = None
+
+        return {
+            "event": "test",
+            "nodeid": nodeid,
+            "worker": worker,
+            "outcome": outcome,
+            "duration": round(sum(p["duration"] for p in phases.values()), 6),
+            "phases": phases,
+            "longrepr": "\n".join(longrepr)[:MAX_LONGREPR],
+            "artifacts": artifacts,
+            "metrics": metrics,
+            "breakdown": breakdown,
+        }
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.emit({
+            "event": "session_finish",
+            "exit_code": int(exitstatus),
+            "duration": time.time() - self._started,
+        })
+
+
+# ============================================================
+# In-process runs
+# ============================================================
+def _run_in_process(args, emit, plugins=None):
+    """pytest.main with the collector; returns the exit code"""
+    return int(pytest.main(list(args), plugins=[ResultsCollector(emit)] + list(plugins or [])))
+
+
+def _apply_env(env):
+    """Set environment variables; return the previous values"""
+    previous = {}
+    for key, value in (env or {}).items():
+        previous[key] = os.environ.get(key)
+        os.environ[key] = str(value)
+    return previous
+
+
+def _restore_env(previous):
+    for key, value in previous.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+
+def run_pytest(args, on_event=None, env=None, plugins=None, cwd=None):
+    """
+    Run pytest in this process and return a RunResult
+
+    Args:
+        args: pytest command-line arguments (without "python -m pytest")
+        on_event: callback called with every collector event
+        env: environment variables set for the duration of the run
+        plugins: extra plugin objects passed to pytest.main
+        cwd: working directory for the run (default: project root)
+    """
+    result = RunResult(args)
+
+    def emit(event):
+        result.apply(event)
+        if on_event:
+            on_event(event)
+
+    previous_env = _apply_env(env)
+    previous_cwd = os.getcwd()
+    os.chdir(cwd or Config.BASE_DIR)
+    try:
+        exit_code = _run_in_process(args, emit, plugins)
+    except Exception as e:
+        emit({"event": "error", "message": f"{type(e).__name__}: {e}"})
+        exit_code = 3  # pytest's INTERNAL_ERROR
+    finally:
+        os.chdir(previous_cwd)
+        _restore_env(previous_env)
+
+    if result.exit_code is None:
+        result.exit_code = exit_code
+    return result
+
+
+# ============================================================
+# Warm forked runs
+# ============================================================
+def _child_main(args, conn, env, cwd, output_file):
+    """Entry point of a forked run: stream events back over the pipe"""
+    # Own process group, so cancelling also stops browsers and xdist workers
+    if hasattr(os, "setsid"):
+        os.setsid()
+    # A new run id per run, unless the caller passes one
+    os.environ.pop("QA_RUN_ID", None)
+    os.environ.update({key: str(value) for key, value in (env or {}).items()})
+    os.chdir(cwd)
+    if output_file:
+        output = open(output_file, "ab", buffering=0)
+        os.dup2(output.fileno(), 1)
+        os.dup2(output.fileno(), 2)
+
+    exit_code = 3
+    try:
+        exit_code = _run_in_process(args, conn.send)
+    except BaseException as e:
+        conn.send({"event": "error", "message": f"{type(e).__name__}: {e}"})
+    finally:
+        # multiprocessing ends the child with os._exit(), which skips atexit:
+        # drain the log and event queues before reporting the exit
+        shutdown_events()
+        shutdown_logging()
+        conn.send({"event": "exit", "exit_code": exit_code})
+        conn.close()
+
+
+# Preload list of the process-wide forkserver, set by the first WarmRunner
+_forkserver_preload = None
+
+
+class WarmRunner:
+    """
+    Run each pytest session in a child of a pre-warmed forkserver
+
+    The forkserver imports PRELOAD_MODULES once; every run then forks from
+    it, so a run pays neither interpreter start-up nor imports, and never
+    leaks module state into the next run. Platforms without forkserver
+    (Windows) start each run in a spawned child instead: it pays the
+    start-up cost but stays isolated and cancellable. Runs never execute
+    in the calling process.
+
+    multiprocessing has one forkserver per process: the first runner to
+    start it decides what is preloaded, and the preload list of any later
+    WarmRunner is ignored (a warning is logged when they differ).
+    """
+
+    def __init__(self, preload=None, cwd=None):
+        self.preload = list(preload if preload is not None else PRELOAD_MODULES)
+        self.cwd = str(cwd or Config.BASE_DIR)
+        self._context = None
+        self._active = {}
+        self._cancelled = set()
+        self._lock = threading.Lock()
+
+    @property
+    def forking(self):
+        return "forkserver" in multiprocessing.get_all_start_methods()
+
+    def start(self):
+        """Start the forkserver and import the preload modules now (spawn: nothing to start)"""
+        if self._context is not None:
+            return
+        if not self.forking:
+            self._context = multiprocessing.get_context("spawn")
+            return
+        global _forkserver_preload
+        started = time.perf_counter()
+        self._context = multiprocessing.get_context("forkserver")
+        if _forkserver_preload is None:
+            self._context.set_forkserver_preload(self.preload)
+            _forkserver_preload = self.preload
+        elif _forkserver_preload != self.preload:
+            logger.log_error("Forkserver already preloads %s; ignoring preload %s",
+                             _forkserver_preload, self.preload)
+        from multiprocessing import forkserver
+        forkserver.ensure_running()
+        logger.log_info("Warm runner ready in %.2fs", time.perf_counter() - started)
+
+    def run(self, args, on_event=None, env=None, output_file=None, run_id=None):
+        """Run pytest in a forked (or spawned) child and return a RunResult"""
+        self.start()
+        result = RunResult(args)
+        with self._lock:
+            if run_id is not None and run_id in self._cancelled:
+                # Cancelled before it started: never fork
+                self._cancelled.discard(run_id)
+                result.cancelled = True
+                result.exit_code = 2  # INTERRUPTED
+                result.error = "Run cancelled"
+                return result
+
+        parent_conn, child_conn = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_child_main,
+            args=(list(args), child_conn, env, self.cwd, str(output_file) if output_file else None),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        run_id = run_id or process.pid
+        with self._lock:
+            self._active[run_id] = process
+            # A cancel that arrived while the child was starting
+            stop_now = run_id in self._cancelled
+        if stop_now:
+            self._stop(process, CANCEL_GRACE_SECONDS)
+
+        exit_code = None
+        try:
+            while True:
+                try:
+                    event = parent_conn.recv()
+                except EOFError:
+                    break
+                if event["event"] == "exit":
+                    exit_code = event["exit_code"]
+                    continue
+                result.apply(event)
+                if on_event:
+                    on_event(event)
+        finally:
+            parent_conn.close()
+            process.join()
+            with self._lock:
+                self._active.pop(run_id, None)
+                result.cancelled = run_id in self._cancelled
+                self._cancelled.discard(run_id)
+
+        if result.exit_code is None:
+            result.exit_code = exit_code if exit_code is not None else 2  # INTERRUPTED
+        if result.cancelled:
+            # Whatever the exit status: killing the group can also cut the
+            # forkserver's status pipe, which reports as exit code 255
+            result.error = "Run cancelled"
+        elif exit_code is None and result.error is None:
+            if process.exitcode is not None and process.exitcode < 0:
+                result.error = f"Run terminated by signal {-process.exitcode}"
+            else:
+                result.error = f"Run process exited with code {process.exitcode}"
+        return result
+
+    def cancel(self, run_id, grace=CANCEL_GRACE_SECONDS):
+        """
+        Stop an active run and every process it started
+
+        Sends SIGTERM to the run's process group (pytest, xdist workers,
+        drivers and browsers), then SIGKILL to whatever is left after the
+        grace period. Returns True if the run was active. A run that has
+        not forked yet is remembered and stopped before it starts; its
+        RunResult reports cancelled.
+        """
+        with self._lock:
+            process = self._active.get(run_id)
+            if process is None:
+                self._cancelled.add(run_id)
+                return False
+            if not process.is_alive():
+                return False
+            self._cancelled.add(run_id)
+        self._stop(process, grace)
+        return True
+
+    def _stop(self, process, grace):
+        _signal_group(process, signal.SIGTERM)
+        threading.Thread(target=self._kill_after, args=(process, grace), daemon=True).start()
+
+    @staticmethod
+    def _kill_after(process, grace):
+        process.join(grace)
+        _signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+
+    def cancel_all(self, grace=CANCEL_GRACE_SECONDS):
+        for run_id in self.active_runs():
+            self.cancel(run_id, grace)
+
+    def active_runs(self):
+        with self._lock:
+            return list(self._active)
+
+
+def _signal_group(process, signum):
+    """Signal a run's process group, or just the process if it has none yet"""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signum)
+            return
+        except (ProcessLookupError, PermissionError):
+            # The child has not called setsid() yet, or the group is gone
+            pass
+    if process.is_alive():
+        try:
+            os.kill(process.pid, signum)
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+# ============================================================
+# Layered settings
+# ============================================================
+# Settings are resolved once per process, on first access, from four
+# layers (later layers win):
+#
+#   1. DEFAULTS below
+#   2. A profile file: test_data/profiles/<QA_PROFILE>.json
+#   3. Environment variables: QA_<KEY>, plus BROWSER / HEADLESS
+#   4. CLI overrides registered with set_cli_overrides()
+#
+# Values are coerced to the type of their default, so "true" from the
+# environment becomes True and "5" becomes 5.
+
+BASE_DIR = Path(__file__).parent.parent
+PROFILES_DIR = BASE_DIR / "test_data" / "profiles"
+PROFILE_ENV_VAR = "QA_PROFILE"
+ENV_PREFIX = "QA_"
+
+DEFAULTS = {
+    # Browser
+    "browser": "chrome",               # chrome, firefox
+    "headless": False,
+    "window_size": "1920,1080",
+    # Application under test
+    "base_url": "https://www.saucedemo.com",
+    # Waits (seconds)
+    "implicit_wait": 10,
+    "explicit_wait": 20,
+    "visibility_wait": 10,
+    "page_load_timeout": 60,
+    "page_load_strategy": "normal",    # normal, eager, none
+    # Browser pooling: 0 starts a fresh browser for every test, N keeps up
+    # to N idle browsers per process (utilities/driver_factory.DriverPool)
+    "driver_pool_size": 0,
+    "driver_tabs": False,              # pooled browsers open a new tab per test
+    # Request blocking
+    "block_images": False,
+    "blocked_urls": [],
+    # Page performance metrics (see utilities/page_metrics.py)
+    "page_metrics": False,             # read Navigation/Paint/CDP timings in BasePage
+    "page_budgets": "test_data/performance_budgets.json",  # "" disables budget checks
+    "phase_timing": False,             # per-test time per phase (utilities/phase_timing.py)
+    # WebDriver command tracing (see utilities/command_trace.py)
+    "command_trace": False,            # record every command sent to the browser driver
+    "command_trace_buffer": 10000,     # commands kept per process for the trace file
+    # Report written by run_tests.py, run_demo.py and the dashboard:
+    # html (self-contained pytest-html) or compact (JSONL + shared viewer)
+    "report_format": "html",
+    # Results history database ("" disables it); relative to the project root
+    "results_db": "reports/results.db",
+    # Artifact store ("" disables it); relative to the project root
+    "artifact_store": "reports/artifacts",
+    "artifact_keep_runs": 20,          # newest runs always kept
+    "artifact_keep_failed_runs": 50,   # failed runs kept while among the newest N
+    "artifact_compact_after": 5,       # runs older than the newest N are packed into zips
+    "artifact_remove_sources": False,  # also delete expired runs' original files under reports/
+    # Dashboard run scheduler
+    "dashboard_max_runs": 1,           # suites executing at the same time
+    "dashboard_max_queued": 10,        # pending runs before requests are refused
+}
+
+# Variables that existing scripts (run_tests.py) already export
+LEGACY_ENV_VARS = {
+    "browser": "BROWSER",
+    "headless": "HEADLESS",
+}
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+FALSE_VALUES = {"0", "false", "no", "off", ""}
+
+
+def coerce(key, value):
+    """Convert a raw value to the type of the setting's default"""
+    default = DEFAULTS[key]
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+        raise ValueError(f"Invalid boolean for setting '{key}': {value!r}")
+    if isinstance(default, int):
+        return int(value)
+    if isinstance(default, float):
+        return float(value)
+    if isinstance(default, list):
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return list(value)
+    return str(value)
+
+
+class Settings:
+    """Resolved, read-only settings with the layer each value came from"""
+
+    def __init__(self, values, sources, profile=None):
+        self._values = values
+        self._sources = sources
+        self.profile = profile
+
+    def __getattr__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            raise AttributeError(f"Unknown setting: {key}") from None
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def source_of(self, key):
+        """Return the layer that provided a setting (default/profile/env/cli)"""
+        return self._sources[key]
+
+    def as_dict(self):
+        """Return a copy of all resolved values"""
+        return dict(self._values)
+
+
+_lock = threading.Lock()
+_settings = None
+_cli_overrides = {}
+
+
+def load_profile(name):
+    """Load a named profile file"""
+    profile_file = PROFILES_DIR / f"{name}.json"
+    if not profile_file.exists():
+        available = sorted(p.stem for p in PROFILES_DIR.glob("*.json"))
+        raise ValueError(f"Unknown profile '{name}'. Available profiles: {available}")
+    with open(profile_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def resolve_settings(profile=None, environ=None, cli_overrides=None):
+    """Resolve all layers into a Settings object (uncached)"""
+    environ = os.environ if environ is None else environ
+    cli_overrides = _cli_overrides if cli_overrides is None else cli_overrides
+
+    values = dict(DEFAULTS)
+    sources = dict.fromkeys(DEFAULTS, "default")
+
+    def apply(layer, updates):
+        for key, value in updates.items():
+            if key not in DEFAULTS:
+                raise ValueError(f"Unknown setting '{key}' in {layer} layer")
+            values[key] = coerce(key, value)
+            sources[key] = layer
+
+    profile = profile or cli_overrides.get("profile") or environ.get(PROFILE_ENV_VAR)
+    if profile:
+        apply("profile", load_profile(profile))
+
+    env_values = {}
+    for key in DEFAULTS:
+        legacy = LEGACY_ENV_VARS.get(key)
+        if legacy and legacy in environ:
+            env_values[key] = environ[legacy]
+        if ENV_PREFIX + key.upper() in environ:
+            env_values[key] = environ[ENV_PREFIX + key.upper()]
+    apply("env", env_values)
+
+    apply("cli", {k: v for k, v in cli_overrides.items() if k != "profile" and v is not None})
+
+    return Settings(values, sources, profile)
+
+
+def get_settings():
+    """Return the settings for this process, resolving them on first use"""
+    global _settings
+    if _settings is None:
+        with _lock:
+            if _settings is None:
+                _settings = resolve_settings()
+    return _settings
+
+
+def set_cli_overrides(**overrides):
+    """Register command-line overrides and drop the cached settings"""
+    global _settings
+    with _lock:
+        _cli_overrides.update({k: v for k, v in overrides.items() if v is not None})
+        _settings = None
+
+
+def reset_settings():
+    """Forget CLI overrides and cached settings (used by tests)"""
+    global _settings
+    with _lock:
+        _cli_overrides.clear()
+        _settings = None
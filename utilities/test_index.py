@@ -0,0 +1,281 @@
+import ast
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from utilities.config import Config
+
+# ============================================================
+# Static test index
+# ============================================================
+# Lists tests by parsing tests/test_*.py with the ast module instead of
+# importing them, so listing never loads pytest plugins, selenium or the
+# page objects. Per-file results are cached in .qa_cache/test_index.json
+# keyed by the file's content hash (with an mtime/size fast path).
+#
+# Parametrize sizes are computed when the argument list is a literal.
+# @data_driven and @combinatorial matrices are resolved at collection
+# time, so they are reported as dynamic.
+
+INDEX_VERSION = 1
+CACHE_FILE = Config.BASE_DIR / ".qa_cache" / "test_index.json"
+TESTS_DIR = Config.BASE_DIR / "tests"
+
+# Match pytest.ini: python_files / python_classes / python_functions
+FILE_PATTERN = re.compile(r"^test_.*\.py$")
+CLASS_PREFIX = "Test"
+FUNCTION_PREFIX = "test_"
+
+# Decorators from utilities that add a marker or parametrization
+HELPER_DECORATORS = {
+    "data_driven": "data_driven",
+    "combinatorial": "parametrize",
+}
+
+
+def _dotted_name(node):
+    """Return 'a.b.c' for Name/Attribute chains, else None"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    return None
+
+
+def _literal_length(node):
+    """Length of a list/tuple literal, or None if not statically known"""
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        if any(isinstance(item, ast.Starred) for item in node.elts):
+            return None
+        return len(node.elts)
+    return None
+
+
+def _parse_decorators(decorators):
+    """Return (markers, parametrize sizes) for a list of decorator nodes"""
+    markers = []
+    sizes = []
+    for decorator in decorators:
+        call = decorator if isinstance(decorator, ast.Call) else None
+        name = _dotted_name(call.func if call else decorator) or ""
+        short = name.rsplit(".", 1)[-1]
+
+        if name.startswith("pytest.mark.") or name.startswith("mark."):
+            if short == "parametrize":
+                argvalues = None
+                if call and len(call.args) >= 2:
+                    argvalues = call.args[1]
+                for keyword in (call.keywords if call else []):
+                    if keyword.arg == "argvalues":
+                        argvalues = keyword.value
+                sizes.append(_literal_length(argvalues) if argvalues is not None else None)
+            markers.append(short)
+        elif short in HELPER_DECORATORS:
+            markers.append(HELPER_DECORATORS[short])
+            sizes.append(None)
+
+    return markers, sizes
+
+
+def _module_markers(tree):
+    """Markers applied through a module-level pytestmark assignment"""
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "pytestmark" for t in node.targets
+        ):
+            values = node.value.elts if isinstance(node.value, (ast.List, ast.Tuple)) else [node.value]
+            return _parse_decorators(values)[0]
+    return []
+
+
+def _test_entry(relpath, class_name, func, inherited_markers, inherited_sizes):
+    markers, sizes = _parse_decorators(func.decorator_list)
+    all_sizes = inherited_sizes + sizes
+    cases = 1
+    dynamic = False
+    for size in all_sizes:
+        if size is None:
+            dynamic = True
+        else:
+            cases *= size
+
+    nodeid = "::".join(part for part in (relpath, class_name, func.name) if part)
+    return {
+        "nodeid": nodeid,
+        "file": relpath,
+        "class": class_name,
+        "name": func.name,
+        "line": func.lineno,
+        "doc": (ast.get_docstring(func) or "").split("\n", 1)[0],
+        "markers": sorted(set(inherited_markers + markers)),
+        "cases": cases,
+        "dynamic": dynamic,
+    }
+
+
+def parse_test_file(path, relpath):
+    """Extract test entries from a test module without importing it"""
+    tree = ast.parse(Path(path).read_bytes(), filename=str(path))
+    module_markers = _module_markers(tree)
+    entries = []
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith(FUNCTION_PREFIX):
+            entries.append(_test_entry(relpath, None, node, module_markers, []))
+        elif isinstance(node, ast.ClassDef) and node.name.startswith(CLASS_PREFIX):
+            # pytest skips test classes that define __init__
+            if any(isinstance(item, ast.FunctionDef) and item.name == "__init__" for item in node.body):
+                continue
+            class_markers, class_sizes = _parse_decorators(node.decorator_list)
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name.startswith(FUNCTION_PREFIX):
+                    entries.append(_test_entry(
+                        relpath, node.name, item, module_markers + class_markers, class_sizes
+                    ))
+
+    return entries
+
+
+# ============================================================
+# Marker expressions (subset of pytest -m syntax)
+# ============================================================
+_TOKEN = re.compile(r"\s*(\(|\)|[A-Za-z_][A-Za-z0-9_]*)")
+
+
+def compile_marker_expression(expression):
+    """Compile 'smoke and not login' style expressions into a predicate"""
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match:
+            raise ValueError(f"Invalid marker expression: {expression!r}")
+        tokens.append(match.group(1))
+        position = match.end()
+
+    python_tokens = []
+    for token in tokens:
+        if token in ("and", "or", "not", "(", ")"):
+            python_tokens.append(token)
+        else:
+            python_tokens.append(f"_m({token!r})")
+    code = compile(" ".join(python_tokens) or "True", "<marker expression>", "eval")
+
+    def matches(markers):
+        return bool(eval(code, {"__builtins__": {}}, {"_m": lambda name: name in markers}))
+
+    return matches
+
+
+class TestIndex:
+    """Cached, import-free index of the test suite"""
+
+    # Not a test class, despite the name
+    __test__ = False
+
+    def __init__(self, tests_dir=TESTS_DIR, cache_file=CACHE_FILE):
+        self.tests_dir = Path(tests_dir)
+        self.cache_file = Path(cache_file)
+        self.stats = {"files": 0, "parsed": 0, "cached": 0}
+        self._entries = None
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("version") != INDEX_VERSION:
+            return {}
+        return cache.get("files", {})
+
+    def _save_cache(self, files):
+        tmp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_text(json.dumps({"version": INDEX_VERSION, "files": files}), encoding="utf-8")
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            tmp_file.unlink(missing_ok=True)
+
+    def build(self):
+        """Scan the tests directory, re-parsing only files whose content changed"""
+        cached_files = self._load_cache()
+        files = {}
+        entries = []
+        changed = False
+        base = self.tests_dir.parent
+
+        for path in sorted(self.tests_dir.rglob("*.py")):
+            if not FILE_PATTERN.match(path.name):
+                continue
+            relpath = path.relative_to(base).as_posix()
+            stat = path.stat()
+            cached = cached_files.get(relpath)
+
+            if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                record = cached
+                self.stats["cached"] += 1
+            else:
+                content = path.read_bytes()
+                digest = hashlib.sha1(content).hexdigest()
+                if cached and cached["sha1"] == digest:
+                    record = dict(cached, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                    self.stats["cached"] += 1
+                else:
+                    record = {
+                        "sha1": digest,
+                        "mtime_ns": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                        "tests": parse_test_file(path, relpath),
+                    }
+                    self.stats["parsed"] += 1
+                changed = True
+
+            files[relpath] = record
+            entries.extend(record["tests"])
+
+        self.stats["files"] = len(files)
+        if changed or set(files) != set(cached_files):
+            self._save_cache(files)
+
+        self._entries = entries
+        return entries
+
+    def tests(self, marker_expression=None, keyword=None):
+        """Return index entries, optionally filtered like pytest -m / -k"""
+        entries = self._entries if self._entries is not None else self.build()
+        if marker_expression:
+            matches = compile_marker_expression(marker_expression)
+            entries = [e for e in entries if matches(e["markers"])]
+        if keyword:
+            keyword = keyword.lower()
+            entries = [e for e in entries if keyword in e["nodeid"].lower()]
+        return entries
+
+    def summary(self, marker_expression=None):
+        """Return counts of test functions and cases, overall and per marker"""
+        entries = self.tests(marker_expression)
+        markers = {}
+        for entry in entries:
+            for marker in entry["markers"]:
+                markers[marker] = markers.get(marker, 0) + entry["cases"]
+        return {
+            "files": len({e["file"] for e in entries}),
+            "functions": len(entries),
+            "cases": sum(e["cases"] for e in entries),
+            "dynamic": sum(1 for e in entries if e["dynamic"]),
+            "markers": markers,
+        }
+
+
+def get_test_index():
+    """Build and return the index for the project's tests directory"""
+    index = TestIndex()
+    index.build()
+    return index